@@ -4,9 +4,21 @@ from contextlib import asynccontextmanager
 import httpx
 from fastapi import FastAPI
 
+from src.constants import POLLING_DRAIN_TIMEOUT_SECONDS, TRUENATIVE_POLLER_ENABLED
+from src.creditcards.poller import truenative_poller
+from src.creditcards.utils import CreditCardUtils
+from src.workers import polling_pool
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.requests_client = httpx.AsyncClient()
+    polling_pool.start()
+    if TRUENATIVE_POLLER_ENABLED:
+        truenative_poller.resume(CreditCardUtils.pending_cards())
+        truenative_poller.start(app.requests_client, CreditCardUtils.deliver_truenative_result)
     yield
+    if TRUENATIVE_POLLER_ENABLED:
+        await truenative_poller.stop()
+    polling_pool.drain(POLLING_DRAIN_TIMEOUT_SECONDS)
     await app.requests_client.aclose()
@@ -15,6 +15,11 @@ DB_HOST = os.environ.get("DB_HOST", "0.0.0.0")
 DB_PORT = os.environ.get("DB_PORT", "13001")
 DB_NAME = os.environ.get("DB_NAME", "db")
 USERS_PATH = os.environ.get("USERS_PATH", "http://localhost:3000")
+# Shared with the users service, enables offline verification of signed access tokens when set
+TOKEN_SIGNING_KEY = os.environ.get("TOKEN_SIGNING_KEY")
+TOKEN_DENYLIST_REFRESH_SECONDS = float(os.environ.get("TOKEN_DENYLIST_REFRESH_SECONDS", 30))
+TOKEN_DENYLIST_MAX_STALENESS = float(os.environ.get("TOKEN_DENYLIST_MAX_STALENESS", 120))
+USERS_SERVICE_TOKEN = os.environ.get("USERS_SERVICE_TOKEN")
 TRUENATIVE_PATH = os.environ.get("TRUENATIVE_PATH", "http://localhost:3000")
 SECRET_TOKEN = os.environ.get("SECRET_TOKEN", "secrettoken")
 SECRET_FAAS_TOKEN = os.environ.get("SECRET_FAAS_TOKEN", "secret_faas_token")
@@ -23,6 +28,20 @@ POLLING_PATH = os.environ.get("POLLING_PATH",
 EMAIL_PATH = os.environ.get("EMAIL_PATH",
                               "https://us-central1-miso-grupo-17.cloudfunctions.net/send_email_notification")
 
+POLLING_WORKERS = int(os.environ.get("POLLING_WORKERS", 4))
+POLLING_QUEUE_SIZE = int(os.environ.get("POLLING_QUEUE_SIZE", 1000))
+POLLING_MAX_RETRIES = int(os.environ.get("POLLING_MAX_RETRIES", 3))
+POLLING_RETRY_BACKOFF_SECONDS = float(os.environ.get("POLLING_RETRY_BACKOFF_SECONDS", 1))
+POLLING_DRAIN_TIMEOUT_SECONDS = float(os.environ.get("POLLING_DRAIN_TIMEOUT_SECONDS", 30))
+
+# When enabled, card verifications are followed in-process instead of by the polling cloud function
+TRUENATIVE_POLLER_ENABLED = os.environ.get("TRUENATIVE_POLLER_ENABLED", "true").lower() == "true"
+TRUENATIVE_POLLER_CONCURRENCY = int(os.environ.get("TRUENATIVE_POLLER_CONCURRENCY", 20))
+TRUENATIVE_POLLER_INITIAL_DELAY_SECONDS = float(os.environ.get("TRUENATIVE_POLLER_INITIAL_DELAY_SECONDS", 2))
+TRUENATIVE_POLLER_MAX_DELAY_SECONDS = float(os.environ.get("TRUENATIVE_POLLER_MAX_DELAY_SECONDS", 60))
+TRUENATIVE_POLLER_MAX_ATTEMPTS = int(os.environ.get("TRUENATIVE_POLLER_MAX_ATTEMPTS", 20))
+TRUENATIVE_POLLER_TICK_SECONDS = float(os.environ.get("TRUENATIVE_POLLER_TICK_SECONDS", 0.5))
+
 
 def datetime_to_str(date: datetime) -> str:
     """Returns a datetime as string in the correct ISO format"""
@@ -0,0 +1,152 @@
+""" In-process poller that follows registered cards until TrueNative finishes verifying them """
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+import httpx
+
+from src.constants import TRUENATIVE_PATH, SECRET_TOKEN, TRUENATIVE_POLLER_CONCURRENCY, \
+    TRUENATIVE_POLLER_INITIAL_DELAY_SECONDS, TRUENATIVE_POLLER_MAX_DELAY_SECONDS, \
+    TRUENATIVE_POLLER_MAX_ATTEMPTS, TRUENATIVE_POLLER_TICK_SECONDS
+from src.exceptions import CreditCardNotFoundException
+
+
+class PendingCard:
+    """A registered card whose TrueNative verification hasn't finished yet"""
+
+    def __init__(self, ruv: str, recipient_email: str, transaction_identifier: str, next_poll_at: float):
+        self.ruv = ruv
+        self.recipient_email = recipient_email
+        self.transaction_identifier = transaction_identifier
+        self.next_poll_at = next_poll_at
+        self.attempts = 0
+        self.polling = False
+
+
+class TrueNativePoller:
+    """
+    Tracks every pending RUV in a single event loop task. Each card is polled on its own exponential
+    backoff schedule, and no more than `concurrency` TrueNative calls are in flight at once.
+    Finished verifications are handed to the `deliver` callback given to start().
+    """
+
+    def __init__(self, concurrency: int, initial_delay: float, max_delay: float, max_attempts: int, tick: float):
+        self.concurrency = concurrency
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.tick = tick
+        self.pending: dict[str, PendingCard] = {}
+        # track() is called from sync routes running on the threadpool
+        self.lock = threading.Lock()
+        self.polls: set[asyncio.Task] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.client: Optional[httpx.AsyncClient] = None
+        self.deliver: Optional[Callable[[PendingCard, dict], None]] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.polled = 0
+        self.completed = 0
+        self.failed = 0
+
+    def track(self, ruv: str, recipient_email: str, transaction_identifier: str):
+        """Starts following a card registered in TrueNative"""
+        with self.lock:
+            self.pending[ruv] = PendingCard(
+                ruv, recipient_email, transaction_identifier, time.monotonic() + self.initial_delay)
+
+    def resume(self, cards: list[PendingCard]):
+        """Follows again the cards that were pending when the service stopped"""
+        for card in cards:
+            self.track(card.ruv, card.recipient_email, card.transaction_identifier)
+
+    def start(self, client: httpx.AsyncClient, deliver: Callable[[PendingCard, dict], None]):
+        """
+        Starts the polling loop on the running event loop
+        :param client: the HTTP client used to reach TrueNative
+        :param deliver: blocking callback receiving a card and TrueNative's final answer, run on a worker thread
+        """
+        self.client = client
+        self.deliver = deliver
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        tasks = [task for task in [self.task, *self.polls] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.task = None
+
+    async def run(self):
+        while True:
+            self.dispatch_due()
+            await asyncio.sleep(self.tick)
+
+    def dispatch_due(self):
+        now = time.monotonic()
+        with self.lock:
+            due = [card for card in self.pending.values() if not card.polling and card.next_poll_at <= now]
+            for card in due:
+                card.polling = True
+        for card in due:
+            task = asyncio.create_task(self.poll(card))
+            self.polls.add(task)
+            task.add_done_callback(self.polls.discard)
+
+    async def poll(self, card: PendingCard):
+        headers = {"Authorization": 'Bearer ' + SECRET_TOKEN}
+        url = TRUENATIVE_PATH.rstrip('/') + f"/native/cards/{card.ruv}"
+        try:
+            async with self.semaphore:
+                response = await self.client.get(url, headers=headers)
+            self.polled += 1
+            if response.status_code == 200:
+                await asyncio.to_thread(self.deliver, card, response.json())
+                self.finish(card)
+                self.completed += 1
+                return
+            if response.status_code != 202:
+                logging.warning(f"TrueNative answered {response.status_code} for RUV {card.ruv}")
+        except CreditCardNotFoundException:
+            # TrueNative can finish before the card row is committed, try again later
+            pass
+        except httpx.HTTPError as e:
+            logging.warning(f"TrueNative poll failed for RUV {card.ruv}: {e}")
+        except Exception as e:
+            logging.exception(f"Delivering the TrueNative result for RUV {card.ruv} failed: {e}")
+        self.reschedule(card)
+
+    def reschedule(self, card: PendingCard):
+        card.attempts += 1
+        if card.attempts >= self.max_attempts:
+            logging.error(f"Gave up polling TrueNative for RUV {card.ruv} after {card.attempts} attempts")
+            self.finish(card)
+            self.failed += 1
+            return
+        card.next_poll_at = time.monotonic() + min(self.initial_delay * 2 ** card.attempts, self.max_delay)
+        card.polling = False
+
+    def finish(self, card: PendingCard):
+        with self.lock:
+            if self.pending.get(card.ruv) is card:
+                del self.pending[card.ruv]
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.pending),
+            "inFlight": len(self.polls),
+            "polled": self.polled,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+
+truenative_poller = TrueNativePoller(
+    concurrency=TRUENATIVE_POLLER_CONCURRENCY,
+    initial_delay=TRUENATIVE_POLLER_INITIAL_DELAY_SECONDS,
+    max_delay=TRUENATIVE_POLLER_MAX_DELAY_SECONDS,
+    max_attempts=TRUENATIVE_POLLER_MAX_ATTEMPTS,
+    tick=TRUENATIVE_POLLER_TICK_SECONDS
+)
@@ -16,6 +16,8 @@ from src.exceptions import UnauthorizedUserException, InvalidRequestException
 from src.models import CreditCard
 from src.schemas import CreditCardListItemSchema
 from src.utils import CommonUtils
+from src.creditcards.poller import truenative_poller
+from src.workers import polling_pool
 
 router = APIRouter()
 
@@ -29,6 +31,14 @@ def ping():
     return Response(content="pong", media_type="application/text", status_code=200)
 
 
+@router.get("/metrics")
+def metrics():
+    """
+    Returns runtime counters of the background workers and the TrueNative poller
+    """
+    return {"pollingPool": polling_pool.stats(), "truenativePoller": truenative_poller.stats()}
+
+
 @router.post("/reset")
 async def reset(
         session: Session = Depends(get_session),
@@ -95,17 +105,8 @@ def update_card_state(
     authenticate_secret_token(request)
     ruv = request.path_params.get("ruv")
     try:
-        updated = CreditCardUtils.update_status(ruv, data, sess)
-        if updated:
-            CreditCardUtils.send_email_notif(
-                data.recipient_email,
-                ruv,
-                data.status
-            )
-            return {"msg": "Credit card successfully updated"}
-        else:
-            raise InvalidRequestException()
-
+        CreditCardUtils.apply_status_update(ruv, data, sess)
+        return {"msg": "Credit card successfully updated"}
     except InvalidRequestException:
         raise HTTPException(status_code=400, detail="Solicitud invalida")
 
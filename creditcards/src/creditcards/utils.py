@@ -1,5 +1,4 @@
 """ Utils for credit cards """
-import threading
 import uuid
 from datetime import datetime
 from typing import List
@@ -10,14 +9,18 @@ from sqlalchemy import select
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import Session
 
-from src.constants import USERS_PATH, SECRET_TOKEN, TRUENATIVE_PATH, POLLING_PATH, SECRET_FAAS_TOKEN, EMAIL_PATH
+from src import database
+from src.constants import USERS_PATH, SECRET_TOKEN, TRUENATIVE_PATH, POLLING_PATH, SECRET_FAAS_TOKEN, EMAIL_PATH, \
+    TRUENATIVE_POLLER_ENABLED
+from src.creditcards.poller import truenative_poller, PendingCard
 from src.creditcards.schemas import CreateCCRequestSchema, TrueNativeRegisterCardResponseSchema, \
     UpdateCCStatusRequestSchema
 from src.exceptions import UnauthorizedUserException, ExpiredCreditCardException, \
-    UnexpectedResponseCodeException, CreditCardNotFoundException
+    UnexpectedResponseCodeException, CreditCardNotFoundException, InvalidRequestException
 from src.models import CreditCard
 from src.schemas import StatusEnum, CreditCardListItemSchema, IssuerEnum
 from src.utils import CommonUtils
+from src.workers import polling_pool
 
 
 class CreditCardUtils:
@@ -38,11 +41,6 @@ class CreditCardUtils:
             data,
             transaction_identifier)
 
-        # Create thread so function doesn't wait for polling CF to finish
-        threading.Thread(
-            target=CreditCardUtils.initiate_polling_call,
-            args=(registration_response.RUV, user_email, transaction_identifier)).start()
-
         CommonUtils.check_card_token_exists(registration_response.token, session)
         credit_card = CommonUtils.create_card(
             registration_response.token,
@@ -52,8 +50,19 @@ class CreditCardUtils:
             registration_response.issuer,
             StatusEnum.POR_VERIFICAR,
             registration_response.createdAt,
-            session
+            session,
+            user_email,
+            transaction_identifier
         )
+
+        # Only cards whose row is committed are followed, a rejected card is never polled
+        if TRUENATIVE_POLLER_ENABLED:
+            truenative_poller.track(registration_response.RUV, user_email, transaction_identifier)
+        else:
+            # Queued on the background pool so the response doesn't wait for the polling CF call
+            polling_pool.submit(
+                CreditCardUtils.initiate_polling_call,
+                registration_response.RUV, user_email, transaction_identifier)
         return credit_card.id, credit_card.createdAt
 
     @staticmethod
@@ -148,6 +157,54 @@ class CreditCardUtils:
         else:
             raise UnauthorizedUserException()
 
+    @classmethod
+    def apply_status_update(cls, ruv: str, data: UpdateCCStatusRequestSchema, sess: Session):
+        """
+        Stores the status TrueNative settled on and notifies the card owner by email
+        """
+        updated = cls.update_status(ruv, data, sess)
+        if not updated:
+            raise InvalidRequestException()
+        cls.send_email_notif(data.recipient_email, ruv, data.status)
+
+    @classmethod
+    def deliver_truenative_result(cls, card: PendingCard, result: dict):
+        """
+        Applies the final answer of TrueNative for a card followed by the in-process poller
+        """
+        data = UpdateCCStatusRequestSchema(
+            createdAt=result.get("createdAt"),
+            transactionIdentifier=card.transaction_identifier,
+            recipient_email=card.recipient_email,
+            status=StatusEnum(result["status"])
+        )
+        sess = database.SessionLocal()
+        try:
+            # Every replica resumes the pending cards at startup, the first one to deliver settles the card
+            status = sess.execute(select(CreditCard.status).where(CreditCard.ruv == card.ruv)).scalar_one_or_none()
+            if status is not None and status != StatusEnum.POR_VERIFICAR.value:
+                return
+            cls.apply_status_update(card.ruv, data, sess)
+        finally:
+            sess.close()
+
+    @classmethod
+    def pending_cards(cls) -> List[PendingCard]:
+        """
+        Cards still waiting on TrueNative, to resume polling them after a restart
+        """
+        sess = database.SessionLocal()
+        try:
+            rows = sess.execute(
+                select(CreditCard.ruv, CreditCard.recipientEmail, CreditCard.transactionIdentifier)
+                .where(CreditCard.status == StatusEnum.POR_VERIFICAR.value,
+                       CreditCard.recipientEmail.is_not(None),
+                       CreditCard.transactionIdentifier.is_not(None))
+            ).all()
+        finally:
+            sess.close()
+        return [PendingCard(row.ruv, row.recipientEmail, row.transactionIdentifier, 0) for row in rows]
+
     @classmethod
     def update_status(cls, ruv: str, data: UpdateCCStatusRequestSchema, sess):
         """
@@ -22,6 +22,12 @@ class UnexpectedResponseCodeException(ResponseException):
     msg = "The expected response status_code was not received."
 
 
+class BackgroundQueueFullException(ResponseException):
+    """The background work queue is full, or the service is shutting down"""
+    status_code = 503
+    msg = "The service is busy, try again later"
+
+
 class UniqueConstraintViolatedException(ResponseException):
     """A unique constraint has been violated"""
     status_code = 500
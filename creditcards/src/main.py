@@ -10,7 +10,7 @@ from src.creditcards.router import router as creditcards_router
 from src.database import engine
 from src.exceptions import ResponseException
 
-models.Base.metadata.create_all(bind=engine)
+models.create_schema(engine)
 
 app = FastAPI(lifespan=lifespan)
 
@@ -1,6 +1,6 @@
 """ SQLAlchemy models for all global entities """
 
-from sqlalchemy import Column, DateTime, UUID, String
+from sqlalchemy import Column, DateTime, UUID, String, text
 
 from src.database import Base
 
@@ -16,6 +16,20 @@ class CreditCard(Base):
     ruv = Column(String, nullable=False)
     issuer = Column(String, nullable=False)
     status = Column(String, nullable=False)
+    # Kept while the card is POR_VERIFICAR so the TrueNative poller can resume it after a restart
+    recipientEmail = Column(String, nullable=True)
+    transactionIdentifier = Column(String, nullable=True)
 
     createdAt = Column(DateTime, nullable=False)
     updatedAt = Column(DateTime, nullable=False)
+
+
+def create_schema(engine):
+    """
+    Creates the tables, and adds to an existing CreditCard table the columns introduced after it was created,
+    which create_all leaves out
+    """
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text('ALTER TABLE "CreditCard" ADD COLUMN IF NOT EXISTS "recipientEmail" VARCHAR'))
+        connection.execute(text('ALTER TABLE "CreditCard" ADD COLUMN IF NOT EXISTS "transactionIdentifier" VARCHAR'))
@@ -1,6 +1,7 @@
 """ Utils"""
 import uuid
 from datetime import datetime
+from typing import Optional
 
 import requests
 from pydantic import UUID4
@@ -12,6 +13,7 @@ from src.constants import USERS_PATH
 from src.exceptions import UnauthorizedUserException, UniqueConstraintViolatedException, CreditCardTokenExistsException
 from src.models import CreditCard
 from src.schemas import IssuerEnum, StatusEnum
+from src.signed_token import signed_tokens, InvalidSignedToken
 
 
 class CommonUtils:
@@ -25,7 +27,9 @@ class CommonUtils:
             issuer: IssuerEnum,
             status: StatusEnum,
             created_at: datetime,
-            session: Session
+            session: Session,
+            recipient_email: Optional[str] = None,
+            transaction_identifier: Optional[str] = None
     ) -> CreditCard:
         """Insert new credit card into the table"""
         new_cc = None
@@ -40,6 +44,8 @@ class CommonUtils:
                 status=status.value,
                 createdAt=created_at,
                 updatedAt=created_at,
+                recipientEmail=recipient_email,
+                transactionIdentifier=transaction_identifier
             )
 
             session.add(new_cc)
@@ -65,6 +71,12 @@ class CommonUtils:
 
     @staticmethod
     def authenticate_user(bearer_token: str) -> tuple[str, str]:
+        if signed_tokens.applies(bearer_token):
+            try:
+                user_data = signed_tokens.verify(bearer_token)
+            except InvalidSignedToken:
+                raise UnauthorizedUserException()
+            return user_data["id"], user_data["email"]
         headers = {"Authorization": 'Bearer ' + bearer_token}
         url = USERS_PATH.rstrip('/') + "/users/me"
         print(url)
@@ -0,0 +1,135 @@
+""" Bounded pool of background workers for blocking calls made after a request has been answered """
+import logging
+import queue
+import threading
+import time
+from typing import Callable
+
+from src.constants import POLLING_WORKERS, POLLING_QUEUE_SIZE, POLLING_MAX_RETRIES, POLLING_RETRY_BACKOFF_SECONDS
+from src.exceptions import UnexpectedResponseCodeException, BackgroundQueueFullException
+
+
+class BackgroundWorkerPool:
+    """
+    Runs submitted tasks on a fixed number of threads fed by a bounded queue.
+    Tasks failing with UnexpectedResponseCodeException are retried with exponential backoff,
+    any other failure is logged instead of being lost with its thread.
+    """
+
+    def __init__(self, workers: int, max_queue: int, max_retries: int, retry_backoff: float):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.tasks: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.threads: list[threading.Thread] = []
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self):
+        self.stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self.work, name=f"background-worker-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, fn: Callable, *args):
+        """
+        Queues fn(*args) to run in the background
+        Raises BackgroundQueueFullException when the queue is at capacity or the pool is shutting down
+        """
+        if self.stopping.is_set():
+            raise BackgroundQueueFullException()
+        try:
+            self.tasks.put_nowait((fn, args, time.monotonic()))
+        except queue.Full:
+            raise BackgroundQueueFullException()
+        with self.lock:
+            self.submitted += 1
+
+    def work(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                self.tasks.task_done()
+                return
+            fn, args, enqueued_at = task
+            try:
+                self.run(fn, args)
+            finally:
+                self.record_latency(time.monotonic() - enqueued_at)
+                self.tasks.task_done()
+
+    def run(self, fn: Callable, args: tuple):
+        attempt = 0
+        while True:
+            try:
+                fn(*args)
+                with self.lock:
+                    self.succeeded += 1
+                return
+            except UnexpectedResponseCodeException as e:
+                if attempt >= self.max_retries:
+                    logging.error(f"Background task {fn.__name__} failed after {attempt + 1} attempts: {e.detail}")
+                    with self.lock:
+                        self.failed += 1
+                    return
+                with self.lock:
+                    self.retried += 1
+                # Waiting on the event lets a drain cut the backoff short instead of holding up shutdown
+                self.stopping.wait(self.retry_backoff * 2 ** attempt)
+                attempt += 1
+            except Exception as e:
+                logging.exception(f"Background task {fn.__name__} failed: {e}")
+                with self.lock:
+                    self.failed += 1
+                return
+
+    def record_latency(self, latency: float):
+        with self.lock:
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def drain(self, timeout: float):
+        """
+        Stops accepting tasks and waits up to timeout seconds for the queued ones to finish
+        """
+        self.stopping.set()
+        deadline = time.monotonic() + timeout
+        for _ in self.threads:
+            try:
+                self.tasks.put(None, timeout=max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                break
+        for thread in self.threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        if self.threads:
+            logging.warning(f"{self.tasks.qsize()} background tasks were still pending after draining")
+
+    def stats(self) -> dict:
+        with self.lock:
+            finished = self.succeeded + self.failed
+            return {
+                "workers": self.workers,
+                "queueDepth": self.tasks.qsize(),
+                "submitted": self.submitted,
+                "succeeded": self.succeeded,
+                "retried": self.retried,
+                "failed": self.failed,
+                "avgLatencyMs": round(self.total_latency / finished * 1000, 1) if finished else 0.0,
+                "maxLatencyMs": round(self.max_latency * 1000, 1)
+            }
+
+
+polling_pool = BackgroundWorkerPool(
+    workers=POLLING_WORKERS,
+    max_queue=POLLING_QUEUE_SIZE,
+    max_retries=POLLING_MAX_RETRIES,
+    retry_backoff=POLLING_RETRY_BACKOFF_SECONDS
+)
@@ -27,7 +27,8 @@ def session(monkeypatch) -> Generator:
         SQLAlchemy session to the test database
     """
     from src import database
-    from src.database import Base, SQLALCHEMY_DATABASE_URL
+    from src.database import SQLALCHEMY_DATABASE_URL
+    from src.models import create_schema
 
     engine = create_engine(
         SQLALCHEMY_DATABASE_URL,
@@ -37,7 +38,7 @@ def session(monkeypatch) -> Generator:
 
     monkeypatch.setattr(database, "SessionLocal", session_local)
 
-    Base.metadata.create_all(bind=engine)
+    create_schema(engine)
     sess = session_local(expire_on_commit=False)
     # begin a non-ORM transaction
     sess.begin()
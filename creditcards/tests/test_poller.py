@@ -0,0 +1,173 @@
+import asyncio
+import datetime
+import uuid
+
+import httpx
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from typing import Optional
+
+import pytest
+
+from src.creditcards import utils as creditcards_utils
+from src.creditcards.poller import TrueNativePoller, PendingCard
+from src.creditcards.schemas import CreateCCRequestSchema, TrueNativeRegisterCardResponseSchema
+from src.creditcards.utils import CreditCardUtils
+from src.exceptions import CreditCardTokenExistsException
+from src.models import CreditCard
+
+
+class TrueNativeStandIn:
+    """Local TrueNative that keeps each card pending for a number of polls before approving it"""
+
+    def __init__(self, polls_before_done: int, status_code: int = 200, delay: float = 0):
+        self.polls_before_done = polls_before_done
+        self.status_code = status_code
+        self.delay = delay
+        self.polls: dict[str, int] = {}
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        ruv = request.url.path.split("/")[-1]
+        self.polls[ruv] = self.polls.get(ruv, 0) + 1
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        await asyncio.sleep(self.delay)
+        self.concurrent -= 1
+        if self.polls[ruv] <= self.polls_before_done:
+            return httpx.Response(202)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code)
+        return httpx.Response(200, json={"RUV": ruv, "status": "APROBADA", "createdAt": "2023-10-01T00:00:00"})
+
+
+def run_poller(stand_in: TrueNativeStandIn, cards: int, concurrency: int = 5, max_attempts: int = 10) -> tuple:
+    poller = TrueNativePoller(concurrency=concurrency, initial_delay=0, max_delay=0.01,
+                              max_attempts=max_attempts, tick=0.001)
+    delivered = []
+
+    def deliver(card: PendingCard, result: dict):
+        delivered.append((card.ruv, result["status"]))
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(stand_in.handle))
+        for i in range(cards):
+            poller.track(f"ruv-{i}", "test@gmail.com", str(uuid.uuid4()))
+        poller.start(client, deliver)
+        for _ in range(2000):
+            if not poller.pending:
+                break
+            await asyncio.sleep(0.005)
+        await poller.stop()
+        await client.aclose()
+
+    asyncio.run(run())
+    return poller, delivered
+
+
+def test_pending_cards_are_delivered_once_verified():
+    stand_in = TrueNativeStandIn(polls_before_done=2)
+    poller, delivered = run_poller(stand_in, cards=10)
+
+    assert sorted(delivered) == sorted((f"ruv-{i}", "APROBADA") for i in range(10))
+    assert all(polls == 3 for polls in stand_in.polls.values())
+    assert poller.stats()["completed"] == 10
+    assert poller.stats()["pending"] == 0
+
+
+def test_concurrency_is_capped():
+    stand_in = TrueNativeStandIn(polls_before_done=0, delay=0.01)
+    _, delivered = run_poller(stand_in, cards=20, concurrency=3)
+
+    assert len(delivered) == 20
+    assert stand_in.max_concurrent <= 3
+
+
+def test_cards_are_dropped_after_max_attempts():
+    stand_in = TrueNativeStandIn(polls_before_done=0, status_code=500)
+    poller, delivered = run_poller(stand_in, cards=2, max_attempts=3)
+
+    assert delivered == []
+    assert all(polls == 3 for polls in stand_in.polls.values())
+    assert poller.stats()["failed"] == 2
+
+
+def test_deliver_truenative_result_updates_card(session: Session, monkeypatch):
+    session.execute(delete(CreditCard).where(CreditCard.ruv == "ruv-deliver"))
+    session.add(CreditCard(
+        id=uuid.uuid4(), token="token-deliver", userId=uuid.uuid4(), lastFourDigits="4444", ruv="ruv-deliver",
+        issuer="VISA", status="POR_VERIFICAR", createdAt=datetime.datetime.now(), updatedAt=datetime.datetime.now()
+    ))
+    session.commit()
+    emails = []
+    monkeypatch.setattr(CreditCardUtils, "send_email_notif", lambda *args: emails.append(args))
+
+    card = PendingCard("ruv-deliver", "test@gmail.com", str(uuid.uuid4()), 0)
+    CreditCardUtils.deliver_truenative_result(card, {"status": "APROBADA", "createdAt": "2023-10-01T00:00:00"})
+
+    session.expire_all()
+    updated = session.query(CreditCard).filter(CreditCard.ruv == "ruv-deliver").one()
+    assert updated.status == "APROBADA"
+    assert len(emails) == 1
+    session.delete(updated)
+    session.commit()
+
+
+def add_card(session: Session, ruv: str, status: str = "POR_VERIFICAR", recipient_email: Optional[str] = "test@gmail.com"):
+    session.execute(delete(CreditCard).where(CreditCard.ruv == ruv))
+    session.add(CreditCard(
+        id=uuid.uuid4(), token=f"token-{ruv}", userId=uuid.uuid4(), lastFourDigits="4444", ruv=ruv,
+        issuer="VISA", status=status, createdAt=datetime.datetime.now(), updatedAt=datetime.datetime.now(),
+        recipientEmail=recipient_email, transactionIdentifier=str(uuid.uuid4()) if recipient_email else None
+    ))
+    session.commit()
+
+
+def test_pending_cards_are_resumed_after_restart(session: Session):
+    add_card(session, "ruv-resume")
+    add_card(session, "ruv-settled", status="APROBADA")
+    add_card(session, "ruv-without-email", recipient_email=None)
+
+    poller = TrueNativePoller(concurrency=1, initial_delay=0, max_delay=0, max_attempts=1, tick=1)
+    poller.resume(CreditCardUtils.pending_cards())
+
+    assert "ruv-resume" in poller.pending
+    assert poller.pending["ruv-resume"].recipient_email == "test@gmail.com"
+    assert "ruv-settled" not in poller.pending
+    assert "ruv-without-email" not in poller.pending
+    session.execute(delete(CreditCard).where(CreditCard.ruv.in_(["ruv-resume", "ruv-settled", "ruv-without-email"])))
+    session.commit()
+
+
+def test_deliver_skips_settled_card(session: Session, monkeypatch):
+    add_card(session, "ruv-settled", status="RECHAZADA")
+    emails = []
+    monkeypatch.setattr(CreditCardUtils, "send_email_notif", lambda *args: emails.append(args))
+
+    card = PendingCard("ruv-settled", "test@gmail.com", str(uuid.uuid4()), 0)
+    CreditCardUtils.deliver_truenative_result(card, {"status": "APROBADA", "createdAt": "2023-10-01T00:00:00"})
+
+    session.expire_all()
+    assert session.query(CreditCard).filter(CreditCard.ruv == "ruv-settled").one().status == "RECHAZADA"
+    assert emails == []
+    session.execute(delete(CreditCard).where(CreditCard.ruv == "ruv-settled"))
+    session.commit()
+
+
+def test_rejected_card_is_not_tracked(session: Session, monkeypatch):
+    add_card(session, "ruv-existing")
+    registration = TrueNativeRegisterCardResponseSchema(
+        RUV="ruv-duplicate", token="token-ruv-existing", issuer="VISA",
+        transactionIdentifier=str(uuid.uuid4()), createdAt="Sun, 01 Oct 2023 00:00:00 GMT")
+    monkeypatch.setattr(CreditCardUtils, "register_card_truenative", lambda *args: registration)
+    monkeypatch.setattr(creditcards_utils, "TRUENATIVE_POLLER_ENABLED", True)
+    card = CreateCCRequestSchema(cardNumber="4111111111111111", cvv="123", expirationDate="40/12",
+                                 cardHolderName="Test")
+
+    with pytest.raises(CreditCardTokenExistsException):
+        CreditCardUtils.create_card(card, uuid.uuid4(), "test@gmail.com", session)
+
+    assert "ruv-duplicate" not in creditcards_utils.truenative_poller.pending
+    session.execute(delete(CreditCard).where(CreditCard.ruv == "ruv-existing"))
+    session.commit()
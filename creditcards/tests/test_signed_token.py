@@ -0,0 +1,48 @@
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.exceptions import UnauthorizedUserException
+from src.signed_token import signed_tokens
+from src.utils import CommonUtils
+
+
+@pytest.fixture
+def signing(monkeypatch):
+    monkeypatch.setattr(signed_tokens, "key", b"secret")
+    monkeypatch.setattr(signed_tokens, "start", lambda: None)
+    monkeypatch.setattr(signed_tokens, "refreshed_at", time.monotonic())
+    monkeypatch.setattr(signed_tokens, "revoked", {})
+
+    def users_unavailable(*args, **kwargs):
+        raise AssertionError("Signed tokens must not reach the users service")
+
+    monkeypatch.setattr("src.utils.requests.get", users_unavailable)
+
+
+def test_signed_token_is_verified_offline(signing):
+    user_id = uuid4()
+    token = signed_tokens.issue(user_id, "user@example.com", "VERIFICADO", uuid4(),
+                                datetime.now() + timedelta(hours=1))
+
+    assert CommonUtils.authenticate_user(token) == (str(user_id), "user@example.com")
+
+
+def test_revoked_signed_token_is_rejected(signing, monkeypatch):
+    token_id = uuid4()
+    monkeypatch.setattr(signed_tokens, "revoked", {signed_tokens.token_id(token_id): 0})
+    token = signed_tokens.issue(uuid4(), "user@example.com", "VERIFICADO", token_id,
+                                datetime.now() + timedelta(hours=1))
+
+    with pytest.raises(UnauthorizedUserException):
+        CommonUtils.authenticate_user(token)
+
+
+def test_unverified_user_signed_token_is_rejected(signing):
+    token = signed_tokens.issue(uuid4(), "user@example.com", "POR_VERIFICAR", uuid4(),
+                                datetime.now() + timedelta(hours=1))
+
+    with pytest.raises(UnauthorizedUserException):
+        CommonUtils.authenticate_user(token)
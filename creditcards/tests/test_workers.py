@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from httmock import response
+
+from src.exceptions import UnexpectedResponseCodeException, BackgroundQueueFullException
+from src.workers import BackgroundWorkerPool
+
+
+def unexpected_response():
+    return UnexpectedResponseCodeException(response(500, content={"msg": "error"}))
+
+
+def test_tasks_run_in_background():
+    pool = BackgroundWorkerPool(workers=2, max_queue=10, max_retries=0, retry_backoff=0)
+    pool.start()
+    done = []
+    for i in range(5):
+        pool.submit(done.append, i)
+    pool.drain(5)
+
+    assert sorted(done) == [0, 1, 2, 3, 4]
+    stats = pool.stats()
+    assert stats["submitted"] == 5
+    assert stats["succeeded"] == 5
+    assert stats["queueDepth"] == 0
+
+
+def test_unexpected_response_is_retried():
+    pool = BackgroundWorkerPool(workers=1, max_queue=10, max_retries=3, retry_backoff=0)
+    pool.start()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise unexpected_response()
+
+    pool.submit(flaky)
+    pool.drain(5)
+
+    assert len(attempts) == 3
+    assert pool.stats()["retried"] == 2
+    assert pool.stats()["succeeded"] == 1
+
+
+def test_retries_are_bounded():
+    pool = BackgroundWorkerPool(workers=1, max_queue=10, max_retries=2, retry_backoff=0)
+    pool.start()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise unexpected_response()
+
+    pool.submit(failing)
+    pool.drain(5)
+
+    assert len(attempts) == 3
+    assert pool.stats()["failed"] == 1
+
+
+def test_other_errors_are_not_retried():
+    pool = BackgroundWorkerPool(workers=1, max_queue=10, max_retries=3, retry_backoff=0)
+    pool.start()
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("broken")
+
+    pool.submit(broken)
+    pool.drain(5)
+
+    assert len(attempts) == 1
+    assert pool.stats()["failed"] == 1
+
+
+def test_full_queue_is_rejected():
+    pool = BackgroundWorkerPool(workers=1, max_queue=1, max_retries=0, retry_backoff=0)
+    pool.start()
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    pool.submit(blocking)
+    started.wait(5)
+    pool.submit(blocking)
+    with pytest.raises(BackgroundQueueFullException):
+        pool.submit(blocking)
+
+    release.set()
+    pool.drain(5)
+    with pytest.raises(BackgroundQueueFullException):
+        pool.submit(blocking)
+
+
+def test_metrics(client: TestClient):
+    response = client.get("/credit-cards/metrics")
+    assert response.status_code == 200
+    assert "queueDepth" in response.json()["pollingPool"]
@@ -4,9 +4,18 @@ from contextlib import asynccontextmanager
 import httpx
 from fastapi import FastAPI
 
+from src.constants import HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_TIMEOUT_SECONDS
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.requests_client = httpx.AsyncClient()
+    # Every downstream call shares this client, so connections are pooled and kept alive across requests
+    app.requests_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=HTTP_TIMEOUT_SECONDS
+    )
     yield
     await app.requests_client.aclose()
@@ -10,11 +10,25 @@ TOKEN_LENGTH_BYTES = 128
 DEFAULT_SALT_LENGTH_BYTES = 32
 
 USERS_PATH = os.environ.get("USERS_PATH", "http://localhost:3000")
+# Shared with the users service, enables offline verification of signed access tokens when set
+TOKEN_SIGNING_KEY = os.environ.get("TOKEN_SIGNING_KEY")
+TOKEN_DENYLIST_REFRESH_SECONDS = float(os.environ.get("TOKEN_DENYLIST_REFRESH_SECONDS", 30))
+TOKEN_DENYLIST_MAX_STALENESS = float(os.environ.get("TOKEN_DENYLIST_MAX_STALENESS", 120))
+USERS_SERVICE_TOKEN = os.environ.get("USERS_SERVICE_TOKEN")
 ROUTES_PATH = os.environ.get("ROUTES_PATH", "http://localhost:3001")
 POSTS_PATH = os.environ.get("POSTS_PATH", "http://localhost:3002")
 OFFERS_PATH = os.environ.get("OFFERS_PATH", "http://localhost:3003")
 UTILITY_PATH = os.environ.get("UTILITY_PATH", "http://localhost:3004")
 
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 200))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 50))
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 10))
+
+RF005_ROUTE_TIMEOUT_SECONDS = float(os.environ.get("RF005_ROUTE_TIMEOUT_SECONDS", 3))
+RF005_OFFERS_TIMEOUT_SECONDS = float(os.environ.get("RF005_OFFERS_TIMEOUT_SECONDS", 5))
+# How many of the best scored offers RF005 shows for a post
+RF005_TOP_OFFERS = int(os.environ.get("RF005_TOP_OFFERS", 20))
+
 print("Connection environment variables")
 print({
     "USERS_PATH": USERS_PATH,
@@ -19,6 +19,16 @@ class UnexpectedResponseCodeException(ResponseException):
     msg = "The expected response status_code was not received."
 
 
+class DownstreamTimeoutException(ResponseException):
+    """A downstream service did not answer within the time allowed for its branch"""
+
+    def __init__(self, branch: str):
+        self.detail = {"branch": branch}
+
+    status_code = 504
+    msg = "A downstream service took too long to respond"
+
+
 class FailedCreatedUtilityException(Exception):
     """Creating utility did not succeed"""
 
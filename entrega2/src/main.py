@@ -9,6 +9,8 @@ from src.exceptions import ResponseException
 from src.rf003.router import router as rf003_router
 from src.rf004.router import router as rf004_router
 from src.rf005.router import router as rf005_router
+from src.route_cache import route_cache
+from src.singleflight import singleflight
 
 app = FastAPI(lifespan=lifespan)
 
@@ -17,6 +19,12 @@ app.include_router(rf004_router, prefix="/rf004", tags=["RF004"])
 app.include_router(rf005_router, prefix="/rf005", tags=["RF005"])
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime counters of the orchestration layer"""
+    return {"singleflight": singleflight.stats(), "routeCache": route_cache.stats()}
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(_, exc):
     return JSONResponse(status_code=400, content={
@@ -1,3 +1,4 @@
+import httpx
 from fastapi import APIRouter, HTTPException, Response, Request
 
 from src.exceptions import UnauthorizedUserException, RouteNotFoundException, SuccessfullyDeletedRouteException, \
@@ -12,7 +13,7 @@ router = APIRouter()
 
 
 @router.get("/ping")
-def ping():
+async def ping():
     """
     Returns "pong" whenever the endpoint is contacted.
     Functions as a health check
@@ -21,19 +22,21 @@ def ping():
 
 
 @router.post("/posts")
-def create_post(route_data: CreateRoutePostRequestSchema, request: Request,
-                response: Response) -> CreatePostResponseSchema:
+async def create_post(route_data: CreateRoutePostRequestSchema, request: Request,
+                      response: Response) -> CreatePostResponseSchema:
     """
     Creates a post with the given data.
     """
-    user_id, full_token = authenticate(request)
+    client = request.app.requests_client
+    user_id, full_token = await authenticate(client, request)
     route_created = False
     RF003.validate_same_user_or_dates(route_data.plannedStartDate, route_data.plannedEndDate, route_data.expireAt)
     try:
-        route: RouteSchema = CommonUtils.search_route(route_data.flightId, full_token)
+        route: RouteSchema = await CommonUtils.search_route(client, route_data.flightId, full_token)
         RF003.validate_same_user_or_dates(route.plannedStartDate, route.plannedEndDate, route_data.expireAt)
     except RouteNotFoundException:
-        created_route: CreatedRouteSchema = CommonUtils.create_route(
+        created_route: CreatedRouteSchema = await CommonUtils.create_route(
+            client,
             route_data.flightId,
             route_data.origin.airportCode,
             route_data.origin.country,
@@ -56,10 +59,11 @@ def create_post(route_data: CreateRoutePostRequestSchema, request: Request,
             createdAt=created_route.createdAt)
         route_created = True
 
-    posts = RF003.get_post_filtered(None, route.id, user_id, full_token)
+    posts = await RF003.get_post_filtered(client, None, route.id, user_id, full_token)
     if len(posts) == 0:
         try:
-            post_raw: CreatedPostSchema = CommonUtils.create_post(route.id, route_data.expireAt, full_token)
+            post_raw: CreatedPostSchema = await CommonUtils.create_post(
+                client, route.id, route_data.expireAt, full_token)
             post: PostWithRouteSchema = PostWithRouteSchema(
                 **post_raw.model_dump(),
                 route=CreatedRouteSchema(
@@ -75,14 +79,14 @@ def create_post(route_data: CreateRoutePostRequestSchema, request: Request,
         except ResponseException as e:
             print(e)
             if route_created:
-                RF003.delete_route(route.id, full_token)
+                await RF003.delete_route(client, route.id, full_token)
                 raise SuccessfullyDeletedRouteException()
 
     else:
         RF003.validate_post(posts)
 
 
-def authenticate(request: Request) -> tuple[str, str]:
+async def authenticate(client: httpx.AsyncClient, request: Request) -> tuple[str, str]:
     """
     Checks if authorization token is present and valid, then calls users endpoint to
     verify whether credentials are still authorized
@@ -94,7 +98,7 @@ def authenticate(request: Request) -> tuple[str, str]:
         full_token = request.headers.get('Authorization')
         bearer_token = full_token.split(" ")[1]
         try:
-            user_id = CommonUtils.authenticate_user(bearer_token)
+            user_id = await CommonUtils.authenticate_user(client, bearer_token)
         except UnauthorizedUserException:
             raise HTTPException(status_code=401, detail="Unauthorized. Valid credentials were rejected.")
 
@@ -3,21 +3,24 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-import requests
+import httpx
 
 from src.constants import POSTS_PATH, ROUTES_PATH
 from src.exceptions import RouteStartDateExpiredException, RouteEndDateExpiredException, \
     RouteExpireAtDateExpiredException, InvalidParamsException, UnauthorizedUserException, \
     InvalidCredentialsUserException, PostFoundInRouteException
+from src.route_cache import route_cache
 from src.schemas import PostSchema
 
 
 class RF003:
 
     @staticmethod
-    def get_post_filtered(expire: Optional[str], route_id: str, owner: str, bearer_token: str) -> List[PostSchema]:
+    async def get_post_filtered(client: httpx.AsyncClient, expire: Optional[str], route_id: str, owner: str,
+                                bearer_token: str) -> List[PostSchema]:
         """
         Retrieves a post from the Posts endpoint
+        :param client: the shared HTTP client
         :param expire: if the post expires
         :param route_id: the route's UUID associated with the post
         :param owner: the post's owner UUID
@@ -25,15 +28,15 @@ class RF003:
         :return: a post object
         """
 
-        posts_url = POSTS_PATH.rstrip("/") + "/posts?"
+        posts_url = POSTS_PATH.rstrip("/") + "/posts"
 
+        # httpx sends None values as empty parameters, unlike requests which drops them
         params = {
-            "expire": expire,
-            "route": route_id,
-            "owner": owner,
+            key: str(value) for key, value in (("expire", expire), ("route", route_id), ("owner", owner))
+            if value is not None
         }
 
-        response = requests.get(posts_url, headers={"Authorization": bearer_token}, params=params)
+        response = await client.get(posts_url, headers={"Authorization": bearer_token}, params=params)
         if response.status_code == 404:
             raise InvalidParamsException()
         elif response.status_code == 401:
@@ -48,20 +51,21 @@ class RF003:
         return posts
 
     @staticmethod
-    def delete_route(route_id: UUID, bearer_token: str):
+    async def delete_route(client: httpx.AsyncClient, route_id: UUID, bearer_token: str):
         """
-        Asks post endpoint to delete post
+        Asks route endpoint to delete route, and drops it from the route cache
         """
+        route_cache.invalidate(route_id)
         route_url = ROUTES_PATH.rstrip("/") + f"/routes/{str(route_id)}"
-        requests.delete(route_url, headers={"Authorization": bearer_token})
+        await client.delete(route_url, headers={"Authorization": bearer_token})
 
     @staticmethod
-    def delete_post(post_id: UUID, bearer_token: str):
+    async def delete_post(client: httpx.AsyncClient, post_id: UUID, bearer_token: str):
         """
         Asks post endpoint to delete post
         """
         posts_url = POSTS_PATH.rstrip("/") + f"/posts/{str(post_id)}"
-        requests.delete(posts_url, headers={"Authorization": bearer_token})
+        await client.delete(posts_url, headers={"Authorization": bearer_token})
 
     @staticmethod
     def validate_post(posts):
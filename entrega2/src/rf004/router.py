@@ -1,5 +1,6 @@
 """ /users router """
 
+import httpx
 from fastapi import APIRouter, HTTPException, Response, Request
 
 from src.exceptions import UnauthorizedUserException, FailedCreatedUtilityException, SuccessfullyDeletedOfferException
@@ -13,7 +14,7 @@ router = APIRouter()
 
 
 @router.get("/ping")
-def ping():
+async def ping():
     """
     Returns "pong" whenever the endpoint is contacted.
     Functions as a health check
@@ -22,32 +23,34 @@ def ping():
 
 
 @router.post("/posts/{post_id}/offers")
-def create_offer(
+async def create_offer(
         offer_data: CreateOfferRequestSchema, post_id: str, request: Request, response: Response,
 ) -> CreateOfferResponseSchema:
     """
     Creates an offer with the given data.
     post_id must be linked to a valid post
     """
-    user_id, full_token = authenticate(request)
+    client = request.app.requests_client
+    user_id, full_token = await authenticate(client, request)
 
-    post: PostSchema = CommonUtils.get_post(post_id, user_id, full_token)
+    post: PostSchema = await CommonUtils.get_post(client, post_id, user_id, full_token)
     RF004.validate_same_user_or_expired(post, user_id)
-    route: RouteSchema = CommonUtils.get_route(post.routeId, full_token)
+    route: RouteSchema = await CommonUtils.get_route(client, post.routeId, full_token)
 
-    offer: PostOfferResponseSchema = CommonUtils.create_offer(
-        post.id, offer_data.description, offer_data.size, offer_data.fragile, offer_data.offer, full_token
+    offer: PostOfferResponseSchema = await CommonUtils.create_offer(
+        client, post.id, offer_data.description, offer_data.size, offer_data.fragile, offer_data.offer, full_token
     )
 
     try:
-        RF004.create_utility(CreateUtilityRequestSchema(
+        await RF004.create_utility(client, CreateUtilityRequestSchema(
             offer_id=offer.id,
+            post_id=post.id,
             offer=offer_data.offer,
             size=offer_data.size,
             bag_cost=route.bagCost
         ), full_token)
     except FailedCreatedUtilityException:
-        RF004.delete_offer(offer.id, full_token)
+        await RF004.delete_offer(client, offer.id, full_token)
         raise SuccessfullyDeletedOfferException()
 
     returned_offer = CreatedOfferSchema(
@@ -64,7 +67,7 @@ def create_offer(
     return final_response
 
 
-def authenticate(request: Request) -> tuple[str, str]:
+async def authenticate(client: httpx.AsyncClient, request: Request) -> tuple[str, str]:
     """
     Checks if authorization token is present and valid, then calls users endpoint to
     verify whether credentials are still authorized
@@ -76,7 +79,7 @@ def authenticate(request: Request) -> tuple[str, str]:
         full_token = request.headers.get('Authorization')
         bearer_token = full_token.split(" ")[1]
         try:
-            user_id = CommonUtils.authenticate_user(bearer_token)
+            user_id = await CommonUtils.authenticate_user(client, bearer_token)
         except UnauthorizedUserException:
             raise HTTPException(status_code=401, detail="Unauthorized. Valid credentials were rejected.")
 
@@ -45,6 +45,7 @@ class CreateUtilityRequestSchema(BaseModel):
     Used when creating a utility
     """
     offer_id: uuid.UUID
+    post_id: uuid.UUID
     offer: float
     size: BagSize
     bag_cost: int
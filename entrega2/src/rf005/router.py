@@ -1,18 +1,20 @@
 """ /users router """
 
+import httpx
 from fastapi import APIRouter, HTTPException, Response, Request
 
+from src.constants import RF005_ROUTE_TIMEOUT_SECONDS, RF005_OFFERS_TIMEOUT_SECONDS
 from src.exceptions import UnauthorizedUserException
-from src.rf005.schemas import WrappedRF005ResponseSchema, RF005ResponseSchema, ScoredOfferSchema
-from src.rf005.utils import RF005
-from src.schemas import PostSchema, RouteSchema
+from src.rf005.schemas import WrappedRF005ResponseSchema, RF005ResponseSchema
+from src.rf005.utils import RF005, ServerTiming
+from src.schemas import PostSchema
 from src.utils import CommonUtils
 
 router = APIRouter()
 
 
 @router.get("/ping")
-def ping():
+async def ping():
     """
     Returns "pong" whenever the endpoint is contacted.
     Functions as a health check
@@ -21,22 +23,28 @@ def ping():
 
 
 @router.get("/posts/{post_id}")
-def find_post(
+async def find_post(
         post_id: str, request: Request, response: Response,
 ) -> WrappedRF005ResponseSchema:
     """
-    Returns info about a specific post, its route, and all its offers sorted according to utility
+    Returns info about a specific post, its route, and all its offers sorted according to utility.
+    Once the post is known, the route and the scored offers are fetched concurrently.
     """
-    user_id, full_token = authenticate(request)
+    client = request.app.requests_client
+    timing = ServerTiming()
+    user_id, full_token = await timing.measure("auth", authenticate(client, request))
 
-    post: PostSchema = CommonUtils.get_post(post_id, user_id, full_token)
+    post: PostSchema = await timing.measure("post", CommonUtils.get_post(client, post_id, user_id, full_token))
     RF005.validate_post(post, user_id)
 
-    route: RouteSchema = CommonUtils.get_route(post.routeId, full_token)
+    route, offers = await RF005.gather_branches(
+        timing.measure("route", CommonUtils.get_route(client, post.routeId, full_token),
+                       RF005_ROUTE_TIMEOUT_SECONDS),
+        timing.measure("offers", RF005.get_filtered_offers(client, post.id, full_token),
+                       RF005_OFFERS_TIMEOUT_SECONDS)
+    )
     detailed_route = RF005.get_detailed_route(route)
 
-    offers: list[ScoredOfferSchema] = RF005.get_filtered_offers(post.id, full_token)
-
     post_info = RF005ResponseSchema(
         id=post.id,
         route=detailed_route,
@@ -48,10 +56,11 @@ def find_post(
     )
 
     response.status_code = 200
+    response.headers["Server-Timing"] = timing.header()
     return WrappedRF005ResponseSchema(data=post_info)
 
 
-def authenticate(request: Request) -> tuple[str, str]:
+async def authenticate(client: httpx.AsyncClient, request: Request) -> tuple[str, str]:
     """
     Checks if authorization token is present and valid, then calls users endpoint to
     verify whether credentials are still authorized
@@ -63,7 +72,7 @@ def authenticate(request: Request) -> tuple[str, str]:
         full_token = request.headers.get('Authorization')
         bearer_token = full_token.split(" ")[1]
         try:
-            user_id = CommonUtils.authenticate_user(bearer_token)
+            user_id = await CommonUtils.authenticate_user(client, bearer_token)
         except UnauthorizedUserException:
             raise HTTPException(status_code=401, detail="Unauthorized. Valid credentials were rejected.")
 
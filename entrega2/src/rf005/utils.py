@@ -1,44 +1,140 @@
 """ Utils for RF005 """
-from typing import List
+import asyncio
+import time
+from typing import Awaitable, List, Optional
 from uuid import UUID
 
-import requests
+import httpx
 
-from src.constants import OFFERS_PATH, UTILITY_PATH
-from src.exceptions import UnauthorizedUserException, InvalidCredentialsUserException, PostUserOwnerMismatchException
+from src.constants import OFFERS_PATH, UTILITY_PATH, RF005_TOP_OFFERS
+from src.exceptions import UnauthorizedUserException, InvalidCredentialsUserException, \
+    PostUserOwnerMismatchException, DownstreamTimeoutException, UnexpectedResponseCodeException
 from src.rf005.schemas import ImprovedRouteSchema, Location, ScoredOfferSchema
 from src.schemas import RouteSchema, PostSchema
 
 
+class ServerTiming:
+    """Records how long each branch of an orchestration took, for the Server-Timing response header"""
+
+    def __init__(self):
+        self.entries = []
+
+    async def measure(self, name: str, awaitable: Awaitable, timeout: Optional[float] = None):
+        """
+        Awaits a branch and records its duration under the given name
+        :param name: the metric name reported in the header
+        :param awaitable: the downstream call(s) making up the branch
+        :param timeout: seconds the branch may take before failing with a 504
+        """
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise DownstreamTimeoutException(name)
+        finally:
+            self.entries.append((name, (time.perf_counter() - start) * 1000))
+
+    def header(self) -> str:
+        return ", ".join(f"{name};dur={duration:.1f}" for name, duration in self.entries)
+
+
 class RF005:
 
     @staticmethod
-    def get_filtered_offers(post_id: UUID, bearer_token: str) -> List[ScoredOfferSchema]:
-        offers_url = OFFERS_PATH.rstrip("/") + "/offers"
-        response_filtered = requests.get(
-            offers_url, headers={"Authorization": bearer_token},
-            params={
-                "post": str(post_id)
-            }
+    async def gather_branches(*branches: Awaitable) -> list:
+        """
+        Runs independent branches concurrently, cancelling the rest as soon as one of them fails
+        """
+        tasks = [asyncio.ensure_future(branch) for branch in branches]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    @staticmethod
+    async def get_filtered_offers(client: httpx.AsyncClient, post_id: UUID, bearer_token: str) -> List[ScoredOfferSchema]:
+        """
+        Returns the RF005_TOP_OFFERS offers of a post with the highest utility, in descending order.
+        The utility service ranks them off its (post_id, utility) index, so only those offers are fetched.
+        Utilities stored before they carried a post_id are not in the index, when the post has none
+        there the offers are scored through the previous listing instead.
+        """
+        utilities_url = UTILITY_PATH.rstrip("/") + "/utility/top"
+        response_top = await client.get(
+            utilities_url, headers={"Authorization": bearer_token},
+            params={"post": str(post_id), "k": RF005_TOP_OFFERS}
         )
-        if response_filtered.status_code == 401:
-            raise UnauthorizedUserException()
-        elif response_filtered.status_code == 403:
-            raise InvalidCredentialsUserException()
+        if response_top.status_code != 200:
+            raise UnexpectedResponseCodeException(response_top)
+        top_utilities = response_top.json()
+        if len(top_utilities) == 0:
+            return await RF005.get_legacy_filtered_offers(client, post_id, bearer_token)
 
-        response_body = response_filtered.json()
-        response_set = {res['id']: res for res in response_body}
+        offers = await RF005.get_offers(
+            client, bearer_token,
+            {"post": str(post_id), "ids": ",".join(utility["offer_id"] for utility in top_utilities)}
+        )
+        return RF005.score_offers(offers, top_utilities)
+
+    @staticmethod
+    async def get_legacy_filtered_offers(client: httpx.AsyncClient, post_id: UUID, bearer_token: str) -> List[ScoredOfferSchema]:
+        """
+        Scores every offer of a post through /utility/list, which looks the utilities up by offer id
+        """
+        offers = await RF005.get_offers(client, bearer_token, {"post": str(post_id)})
+        if len(offers) == 0:
+            return []
 
         utilities_url = UTILITY_PATH.rstrip("/") + "/utility/list"
-        response_sorted = requests.post(
+        response_sorted = await client.post(
             utilities_url, headers={"Authorization": bearer_token},
-            json=list(response_set.keys())
+            json=[offer["id"] for offer in offers]
         )
+        if response_sorted.status_code != 200:
+            raise UnexpectedResponseCodeException(response_sorted)
+        return RF005.score_offers(offers, response_sorted.json())
+
+    @staticmethod
+    async def get_offers(client: httpx.AsyncClient, bearer_token: str, params: dict) -> List[dict]:
+        """
+        Fetches every offer matching the given filters
+        """
+        offers_url = OFFERS_PATH.rstrip("/") + "/offers"
+        response_body = []
+        # The offers list is keyset paginated, follow the cursor until the last page
+        while True:
+            response_filtered = await client.get(
+                offers_url, headers={"Authorization": bearer_token},
+                params=params
+            )
+            if response_filtered.status_code == 401:
+                raise UnauthorizedUserException()
+            elif response_filtered.status_code == 403:
+                raise InvalidCredentialsUserException()
+
+            response_body.extend(response_filtered.json())
+            next_cursor = response_filtered.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            params["cursor"] = next_cursor
+        return response_body
+
+    @staticmethod
+    def score_offers(offers: List[dict], utilities: List[dict]) -> List[ScoredOfferSchema]:
+        """
+        Pairs the offers with their utilities, keeping the order of the utilities
+        """
+        response_set = {res['id']: res for res in offers}
 
         filtered_sorted_offers = []
-        for offer in response_sorted.json():
-            scored_offer = response_set[offer["offer_id"]]
-            scored_offer["score"] = offer["utility"]
+        for utility in utilities:
+            # An offer deleted after being scored leaves its utility behind
+            if utility["offer_id"] not in response_set:
+                continue
+            scored_offer = response_set[utility["offer_id"]]
+            scored_offer["score"] = utility["utility"]
             filtered_sorted_offers.append(ScoredOfferSchema.model_validate(scored_offer))
 
         return filtered_sorted_offers
@@ -0,0 +1,77 @@
+""" In-process read-through cache of routes """
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from src.schemas import RouteSchema
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of routes, reachable both by route id and by flightId.
+    Routes barely change once created, so entries live for `ttl` seconds unless the route is deleted first.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.routes: OrderedDict = OrderedDict()
+        self.ids_by_flight: dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, route_id: UUID) -> Optional[RouteSchema]:
+        entry = self.routes.get(str(route_id))
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                self.remove(str(route_id))
+            self.misses += 1
+            return None
+
+        self.routes.move_to_end(str(route_id))
+        self.hits += 1
+        return entry[0]
+
+    def get_by_flight(self, flight_id: str) -> Optional[RouteSchema]:
+        route_id = self.ids_by_flight.get(flight_id)
+        if route_id is None:
+            self.misses += 1
+            return None
+        return self.get(route_id)
+
+    def put(self, route: RouteSchema):
+        if self.max_size <= 0:
+            return
+
+        self.remove(str(route.id))
+        self.routes[str(route.id)] = (route, time.monotonic() + self.ttl)
+        self.ids_by_flight[route.flightId] = str(route.id)
+        while len(self.routes) > self.max_size:
+            self.remove(next(iter(self.routes)))
+
+    def invalidate(self, route_id: UUID):
+        self.remove(str(route_id))
+
+    def remove(self, route_id: str):
+        entry = self.routes.pop(route_id, None)
+        if entry is not None and self.ids_by_flight.get(entry[0].flightId) == route_id:
+            del self.ids_by_flight[entry[0].flightId]
+
+    def clear(self):
+        self.routes.clear()
+        self.ids_by_flight.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.routes),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+route_cache = RouteCache(
+    max_size=int(os.environ.get("ROUTE_CACHE_SIZE", 5000)),
+    ttl=float(os.environ.get("ROUTE_CACHE_TTL", 300))
+)
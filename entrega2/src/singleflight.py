@@ -0,0 +1,49 @@
+""" Coalesces identical downstream calls that are in flight at the same time """
+import asyncio
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Callers asking for the same key while a call for it is still running wait for that call
+    instead of issuing their own, and all of them receive its result (or its exception).
+    """
+
+    def __init__(self):
+        self.in_flight: dict = {}
+        self.calls = 0
+        self.merged = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """
+        Runs fn unless a call for key is already in flight, in which case its result is shared
+        :param key: identifies calls that are interchangeable
+        :param fn: starts the call when nobody else is running it
+        """
+        self.calls += 1
+        task = self.in_flight.get(key)
+        if task is None:
+            # The call runs in its own task so a caller that gets cancelled does not cancel it for the others
+            task = asyncio.ensure_future(fn())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self.forget(key, done))
+        else:
+            self.merged += 1
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable, task: asyncio.Future):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            task.exception()
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "merged": self.merged,
+            "inFlight": len(self.in_flight)
+        }
+
+
+singleflight = SingleFlight()
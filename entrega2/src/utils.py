@@ -1,10 +1,10 @@
 """ Utils"""
 from datetime import datetime
-from typing import List
+from typing import Optional
+from urllib.parse import quote
 from uuid import UUID
 
-import requests
-from pydantic import TypeAdapter
+import httpx
 
 from src.constants import USERS_PATH, POSTS_PATH, ROUTES_PATH, OFFERS_PATH
 from src.exceptions import UnauthorizedUserException, \
@@ -12,22 +12,42 @@ from src.exceptions import UnauthorizedUserException, \
     UnexpectedResponseCodeException, RouteNotFoundException, InvalidParamsException, RouteExpireAtDateExpiredException
 from src.rf003.schemas import CreatedRouteSchema, CreatedPostSchema
 from src.rf004.schemas import PostOfferResponseSchema
+from src.route_cache import route_cache
 from src.schemas import PostSchema, RouteSchema, BagSize
+from src.signed_token import signed_tokens, InvalidSignedToken
+from src.singleflight import singleflight
 
 
 class CommonUtils:
 
     @staticmethod
-    def get_post(post_id: str, user_id: str, bearer_token: str) -> PostSchema:
+    async def coalesced_get(client: httpx.AsyncClient, url: str, bearer_token: str,
+                            params: Optional[dict] = None) -> httpx.Response:
+        """
+        Sends a GET, sharing the response with identical GETs already in flight
+        :param client: the shared HTTP client
+        :param url: the downstream URL
+        :param bearer_token: the bearer token with which the request is authenticated, responses depend on it
+        :param params: the query parameters
+        :return: the downstream response
+        """
+        key = ("GET", url, tuple(sorted((params or {}).items())), bearer_token)
+        return await singleflight.do(
+            key, lambda: client.get(url, headers={"Authorization": bearer_token}, params=params)
+        )
+
+    @staticmethod
+    async def get_post(client: httpx.AsyncClient, post_id: str, user_id: str, bearer_token: str) -> PostSchema:
         """
         Retrieves a post from the Posts endpoint
+        :param client: the shared HTTP client
         :param post_id: the post's UUID
         :param user_id: the uuid of the user
         :param bearer_token: the bearer token with which the request is authenticated
         :return: a post object
         """
         posts_url = POSTS_PATH.rstrip("/") + f"/posts/{post_id}"
-        response = requests.get(posts_url, headers={"Authorization": bearer_token})
+        response = await CommonUtils.coalesced_get(client, posts_url, bearer_token)
         if response.status_code == 404:
             raise PostNotFoundException()
         elif response.status_code == 401:
@@ -39,15 +59,20 @@ class CommonUtils:
         return post
 
     @staticmethod
-    def get_route(route_id: UUID, bearer_token: str) -> RouteSchema:
+    async def get_route(client: httpx.AsyncClient, route_id: UUID, bearer_token: str) -> RouteSchema:
         """
-        Retrieves a route from the Routes endpoint
+        Retrieves a route, from the route cache when possible, or else from the Routes endpoint
+        :param client: the shared HTTP client
         :param route_id: the route's UUID
         :param bearer_token: the bearer token with which the request is authenticated
         :return: a route object
         """
+        route = route_cache.get(route_id)
+        if route is not None:
+            return route
+
         routes_url = ROUTES_PATH.rstrip("/") + f"/routes/{str(route_id)}"
-        response = requests.get(routes_url, headers={"Authorization": bearer_token})
+        response = await CommonUtils.coalesced_get(client, routes_url, bearer_token)
         if response.status_code == 401:
             raise UnauthorizedUserException()
         elif response.status_code == 403:
@@ -56,19 +81,26 @@ class CommonUtils:
             raise RouteNotFoundException();
 
         route = RouteSchema.model_validate(response.json())
+        route_cache.put(route)
 
         return route
 
     @staticmethod
-    def search_route(flight_id: str, bearer_token: str) -> RouteSchema:
+    async def search_route(client: httpx.AsyncClient, flight_id: str, bearer_token: str) -> RouteSchema:
         """
-        Retrieves a route from the Routes endpoint by filtering through the flight ID
+        Retrieves a route by its flight ID, from the route cache when possible, or else from the Routes
+        endpoint's indexed flight lookup
+        :param client: the shared HTTP client
         :param flight_id: the route's flightID
         :param bearer_token: the bearer token with which the request is authenticated
         :return: a route object
         """
-        routes_url = ROUTES_PATH.rstrip("/") + "/routes"
-        response = requests.get(routes_url, headers={"Authorization": bearer_token}, params={"flight": str(flight_id)})
+        route = route_cache.get_by_flight(flight_id)
+        if route is not None:
+            return route
+
+        routes_url = ROUTES_PATH.rstrip("/") + "/routes/by-flight/" + quote(str(flight_id), safe="")
+        response = await CommonUtils.coalesced_get(client, routes_url, bearer_token)
         if response.status_code == 401:
             raise UnauthorizedUserException()
         elif response.status_code == 403:
@@ -76,16 +108,13 @@ class CommonUtils:
         elif response.status_code == 404:
             raise RouteNotFoundException()
 
-        ta = TypeAdapter(List[RouteSchema])
-        routes_list = ta.validate_python(response.json())
-        if len(routes_list) != 1:
-            raise RouteNotFoundException()
-
-        return routes_list[0]
+        route = RouteSchema.model_validate(response.json())
+        route_cache.put(route)
+        return route
 
     @staticmethod
-    def create_offer(post_id: UUID, description: str, size: BagSize, fragile: bool, offer: float,
-                     bearer_token: str) -> PostOfferResponseSchema:
+    async def create_offer(client: httpx.AsyncClient, post_id: UUID, description: str, size: BagSize,
+                           fragile: bool, offer: float, bearer_token: str) -> PostOfferResponseSchema:
         """
         Asks offer endpoint to create new offer
         """
@@ -99,7 +128,7 @@ class CommonUtils:
             "offer": offer
         }
 
-        response = requests.post(offers_url, json=payload, headers={"Authorization": bearer_token})
+        response = await client.post(offers_url, json=payload, headers={"Authorization": bearer_token})
         if response.status_code == 401:
             raise UnauthorizedUserException()
         elif response.status_code == 403:
@@ -114,9 +143,10 @@ class CommonUtils:
         return offer
 
     @staticmethod
-    def create_route(flight_id: str, source_airport_code: str, source_country: str,
-                     destiny_airport_code: str, destiny_country: str, bag_cost: int,
-                     planned_start_date: datetime, planned_end_date: datetime, bearer_token: str) -> CreatedRouteSchema:
+    async def create_route(client: httpx.AsyncClient, flight_id: str, source_airport_code: str,
+                           source_country: str, destiny_airport_code: str, destiny_country: str, bag_cost: int,
+                           planned_start_date: datetime, planned_end_date: datetime,
+                           bearer_token: str) -> CreatedRouteSchema:
         """
         Asks offer endpoint to create new offer
         """
@@ -133,7 +163,7 @@ class CommonUtils:
             "plannedEndDate": str(planned_end_date)
         }
 
-        response = requests.post(routes_url, json=payload, headers={"Authorization": bearer_token})
+        response = await client.post(routes_url, json=payload, headers={"Authorization": bearer_token})
         if response.status_code == 401:
             raise UnauthorizedUserException()
         elif response.status_code == 403:
@@ -152,7 +182,8 @@ class CommonUtils:
         return route
 
     @staticmethod
-    def create_post(route_id: UUID, expire_at: datetime, bearer_token: str) -> CreatedPostSchema:
+    async def create_post(client: httpx.AsyncClient, route_id: UUID, expire_at: datetime,
+                          bearer_token: str) -> CreatedPostSchema:
         """
         Asks offer endpoint to create new offer
         """
@@ -163,7 +194,7 @@ class CommonUtils:
             "expireAt": str(expire_at)
         }
 
-        response = requests.post(posts_url, json=payload, headers={"Authorization": bearer_token})
+        response = await client.post(posts_url, json=payload, headers={"Authorization": bearer_token})
         if response.status_code == 401:
             raise UnauthorizedUserException()
         elif response.status_code == 403:
@@ -185,11 +216,15 @@ class CommonUtils:
         return post
 
     @staticmethod
-    def authenticate_user(bearer_token: str) -> str:
+    async def authenticate_user(client: httpx.AsyncClient, bearer_token: str) -> str:
+        if signed_tokens.applies(bearer_token):
+            try:
+                return signed_tokens.verify(bearer_token)["id"]
+            except InvalidSignedToken:
+                raise UnauthorizedUserException()
         headers = {"Authorization": 'Bearer ' + bearer_token}
         url = USERS_PATH.rstrip('/') + "/users/me"
-        print(url)
-        response = requests.get(url, headers=headers)
+        response = await client.get(url, headers=headers)
         if response.status_code == 200:
             user_data = response.json()
             user_id = user_data["id"]
@@ -19,3 +19,9 @@ def client() -> Generator:
     from src.main import app
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture(autouse=True)
+def clear_route_cache():
+    from src.route_cache import route_cache
+    route_cache.clear()
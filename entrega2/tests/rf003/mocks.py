@@ -24,9 +24,9 @@ def mock_forbidden_auth(url, request):
     return response(403)
 
 
-@urlmatch(method='GET', path=r'/routes')
+@urlmatch(method='GET', path=r'/routes/by-flight/.+')
 def mock_success_get_routes(url, request):
-    return response(200, content=[{
+    return response(200, content={
         "id": "a8ae58c4-1d41-4d3c-a3f8-f941906779b4",
         "flightId": "abcdfghijklm",
         "sourceAirportCode": "KJFK",
@@ -37,12 +37,12 @@ def mock_success_get_routes(url, request):
         "plannedStartDate": "2023-10-13T21:20:50.214Z",
         "plannedEndDate": "2023-10-14T21:20:54.214Z",
         "createdAt": "2023-09-25T21:20:54.214Z"
-    }])
+    })
 
 
-@urlmatch(method='GET', path=r'/routes')
+@urlmatch(method='GET', path=r'/routes/by-flight/.+')
 def mock_success_get_routes_empty_response(url, request):
-    return response(200, content=[])
+    return response(404)
 
 
 @urlmatch(method='GET', path=r'/posts?')
@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from httmock import HTTMock
+from tests.httpx_mock import HTTMock
 from tests.rf003.mocks import mock_success_auth, mock_forbidden_auth, mock_failed_auth, mock_success_get_routes, \
     mock_success_get_posts_empty_response, mock_success_create_post, mock_success_create_route, \
     mock_success_get_routes_empty_response, mock_success_get_posts, mock_failed_create_post
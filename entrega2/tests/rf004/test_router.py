@@ -1,5 +1,5 @@
 from fastapi.testclient import TestClient
-from httmock import HTTMock
+from tests.httpx_mock import HTTMock
 
 from tests.rf004.mocks import mock_success_auth, mock_success_get_post, \
     mock_success_create_utility, mock_success_get_route, mock_success_post_offer, mock_forbidden_auth, mock_failed_auth, \
@@ -1,6 +1,34 @@
 from httmock import response, urlmatch
 
 
+SORTED_UTILITIES = [
+    {
+        "offer_id": "74670a89-9976-4562-813a-6ba48ae962da",
+        "utility": 8980.0,
+        "createdAt": "2023-09-14T08:14:42.116372",
+        "updateAt": "2023-09-14T08:14:42.116372"
+    },
+    {
+        "offer_id": "3fa8eb34-5e79-4daf-aba7-84c007ff0445",
+        "utility": 580.0,
+        "createdAt": "2023-09-14T08:14:48.465019",
+        "updateAt": "2023-09-14T08:14:48.465019"
+    },
+    {
+        "offer_id": "67b34f5b-31a5-4b0e-ae4e-bafac1a09aa9",
+        "utility": 480.0,
+        "createdAt": "2023-09-14T08:14:50.668479",
+        "updateAt": "2023-09-14T08:14:50.668479"
+    },
+    {
+        "offer_id": "868544f6-6c86-489e-b68f-f6e2ec5ca857",
+        "utility": 380.0,
+        "createdAt": "2023-09-14T08:14:42.116372",
+        "updateAt": "2023-09-14T08:14:42.116372"
+    }
+]
+
+
 @urlmatch(path=r'/users/me')
 def mock_success_auth(url, request):
     return response(200, content={
@@ -113,34 +141,19 @@ def mock_failed_get_post_not_found(url, request):
     })
 
 
-@urlmatch(method='POST', path=r'/utility/list/?')
+@urlmatch(method='GET', path=r'/utility/top/?')
 def mock_success_search_utilities(url, request):
-    return response(200, content=[
-        {
-            "offer_id": "74670a89-9976-4562-813a-6ba48ae962da",
-            "utility": 8980.0,
-            "createdAt": "2023-09-14T08:14:42.116372",
-            "updateAt": "2023-09-14T08:14:42.116372"
-        },
-        {
-            "offer_id": "3fa8eb34-5e79-4daf-aba7-84c007ff0445",
-            "utility": 580.0,
-            "createdAt": "2023-09-14T08:14:48.465019",
-            "updateAt": "2023-09-14T08:14:48.465019"
-        },
-        {
-            "offer_id": "67b34f5b-31a5-4b0e-ae4e-bafac1a09aa9",
-            "utility": 480.0,
-            "createdAt": "2023-09-14T08:14:50.668479",
-            "updateAt": "2023-09-14T08:14:50.668479"
-        },
-        {
-            "offer_id": "868544f6-6c86-489e-b68f-f6e2ec5ca857",
-            "utility": 380.0,
-            "createdAt": "2023-09-14T08:14:42.116372",
-            "updateAt": "2023-09-14T08:14:42.116372"
-        }
-    ])
+    return response(200, content=SORTED_UTILITIES)
+
+
+@urlmatch(method='GET', path=r'/utility/top/?')
+def mock_empty_top_utilities(url, request):
+    return response(200, content=[])
+
+
+@urlmatch(method='POST', path=r'/utility/list/?')
+def mock_success_list_utilities(url, request):
+    return response(200, content=SORTED_UTILITIES)
 
 
 @urlmatch(method='POST', path=r'/utility/?')
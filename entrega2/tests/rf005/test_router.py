@@ -1,11 +1,14 @@
+from urllib.parse import parse_qs
+
 from fastapi.testclient import TestClient
-from httmock import HTTMock
+from httmock import urlmatch
+from tests.httpx_mock import HTTMock
 
 from src.schemas import BagSize
 from tests.rf004.mocks import mock_success_auth
 from tests.rf005.mocks import mock_success_search_offers, mock_success_get_route, mock_success_get_post, \
     mock_success_search_utilities, mock_success_get_post_different_owner, mock_failed_get_post_not_found, \
-    mock_failed_auth
+    mock_failed_auth, mock_empty_top_utilities, mock_success_list_utilities
 
 BASE_ROUTE = "/rf005"
 BASE_AUTH_TOKEN = "Bearer 3d91ee00503447c58e1787a90beaa265"
@@ -57,6 +60,119 @@ def test_rf005(
             prev_utility_observed = float(offers_list[i]["score"])
 
 
+def test_rf005_only_fetches_top_offers(
+        client: TestClient
+):
+    """Checks that GET /rf005 asks utility for the top K of the post, and only those offers from offers"""
+    requested = []
+
+    @urlmatch(method='GET', path=r'/offers')
+    def recording_search_offers(url, request):
+        requested.append(parse_qs(url.query))
+        return mock_success_search_offers(url, request)
+
+    @urlmatch(method='GET', path=r'/utility/top/?')
+    def recording_search_utilities(url, request):
+        requested.append(parse_qs(url.query))
+        return mock_success_search_utilities(url, request)
+
+    with HTTMock(
+            mock_success_auth, recording_search_offers, mock_success_get_post,
+            mock_success_get_route, recording_search_utilities
+    ):
+        response = client.get(
+            f"{BASE_ROUTE}/posts/68158796-9594-4b4f-a184-8df97379e912",
+            headers={"Authorization": BASE_AUTH_TOKEN})
+        assert response.status_code == 200
+
+    top_query, offers_query = requested
+    assert top_query["post"] == ["68158796-9594-4b4f-a184-8df97379e912"]
+    assert "k" in top_query
+    assert set(offers_query["ids"][0].split(",")) == {
+        "74670a89-9976-4562-813a-6ba48ae962da", "3fa8eb34-5e79-4daf-aba7-84c007ff0445",
+        "67b34f5b-31a5-4b0e-ae4e-bafac1a09aa9", "868544f6-6c86-489e-b68f-f6e2ec5ca857"
+    }
+
+
+def test_rf005_falls_back_without_top_utilities(
+        client: TestClient
+):
+    """Checks that GET /rf005 scores the offers through the utility list when the post has no utilities
+    in the top K index, as happens for utilities stored before they carried the post id"""
+
+    with HTTMock(
+            mock_success_auth, mock_success_search_offers, mock_success_get_post,
+            mock_success_get_route, mock_empty_top_utilities, mock_success_list_utilities
+    ):
+        response = client.get(
+            f"{BASE_ROUTE}/posts/68158796-9594-4b4f-a184-8df97379e912",
+            headers={"Authorization": BASE_AUTH_TOKEN})
+        assert response.status_code == 200
+
+        scores = [float(offer["score"]) for offer in response.json()["data"]["offers"]]
+        assert scores == [8980.0, 580.0, 480.0, 380.0]
+
+
+def test_rf005_server_timing(
+        client: TestClient
+):
+    """Checks that GET /rf005 reports how long each branch of the orchestration took"""
+
+    with HTTMock(
+            mock_success_auth, mock_success_search_offers, mock_success_get_post,
+            mock_success_get_route, mock_success_search_utilities
+    ):
+        response = client.get(
+            f"{BASE_ROUTE}/posts/68158796-9594-4b4f-a184-8df97379e912",
+            headers={"Authorization": BASE_AUTH_TOKEN})
+        assert response.status_code == 200
+
+        metrics = [entry.strip().split(";")[0] for entry in response.headers["Server-Timing"].split(",")]
+        assert metrics == ["auth", "post", "route", "offers"] or metrics == ["auth", "post", "offers", "route"]
+
+
+def test_rf005_branch_timeout(
+        client: TestClient, monkeypatch
+):
+    """Checks that GET /rf005 fails with a 504 naming the branch that ran out of time"""
+    monkeypatch.setattr("src.rf005.router.RF005_OFFERS_TIMEOUT_SECONDS", 0)
+
+    with HTTMock(
+            mock_success_auth, mock_success_search_offers, mock_success_get_post,
+            mock_success_get_route, mock_success_search_utilities
+    ):
+        response = client.get(
+            f"{BASE_ROUTE}/posts/68158796-9594-4b4f-a184-8df97379e912",
+            headers={"Authorization": BASE_AUTH_TOKEN})
+        assert response.status_code == 504
+        assert response.json()["detail"] == {"branch": "offers"}
+
+
+def test_rf005_route_is_cached(
+        client: TestClient
+):
+    """Checks that GET /rf005 only asks the routes service once for the same route"""
+
+    with HTTMock(
+            mock_success_auth, mock_success_search_offers, mock_success_get_post,
+            mock_success_get_route, mock_success_search_utilities
+    ):
+        response = client.get(
+            f"{BASE_ROUTE}/posts/68158796-9594-4b4f-a184-8df97379e912",
+            headers={"Authorization": BASE_AUTH_TOKEN})
+        assert response.status_code == 200
+
+    with HTTMock(
+            mock_success_auth, mock_success_search_offers, mock_success_get_post,
+            mock_success_search_utilities
+    ):
+        response = client.get(
+            f"{BASE_ROUTE}/posts/68158796-9594-4b4f-a184-8df97379e912",
+            headers={"Authorization": BASE_AUTH_TOKEN})
+        assert response.status_code == 200
+        assert response.json()["data"]["route"]["flightId"] == "813"
+
+
 def test_rf005_post_not_found(
         client: TestClient
 ):
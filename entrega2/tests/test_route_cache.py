@@ -0,0 +1,65 @@
+from datetime import datetime
+from uuid import uuid4
+
+from src.route_cache import RouteCache
+from src.schemas import RouteSchema
+
+
+def build_route(flight_id: str = "813") -> RouteSchema:
+    return RouteSchema(
+        id=uuid4(),
+        flightId=flight_id,
+        sourceAirportCode="BOG",
+        sourceCountry="Colombia",
+        destinyAirportCode="LGW",
+        destinyCountry="Inglaterra",
+        bagCost=40,
+        plannedStartDate=datetime(2030, 1, 1),
+        plannedEndDate=datetime(2030, 1, 2),
+        createdAt=datetime(2029, 12, 1)
+    )
+
+
+def test_get_by_id_and_flight():
+    cache = RouteCache(max_size=10, ttl=60)
+    route = build_route()
+    cache.put(route)
+
+    assert cache.get(route.id) == route
+    assert cache.get_by_flight("813") == route
+    assert cache.get(uuid4()) is None
+    assert cache.stats() == {"size": 1, "hits": 2, "misses": 1}
+
+
+def test_expired_entries_are_dropped():
+    cache = RouteCache(max_size=10, ttl=-1)
+    route = build_route()
+    cache.put(route)
+
+    assert cache.get(route.id) is None
+    assert cache.get_by_flight("813") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = RouteCache(max_size=2, ttl=60)
+    first, second, third = build_route("1"), build_route("2"), build_route("3")
+    cache.put(first)
+    cache.put(second)
+    cache.get(first.id)
+    cache.put(third)
+
+    assert cache.get(first.id) == first
+    assert cache.get(second.id) is None
+    assert cache.get_by_flight("2") is None
+    assert cache.get_by_flight("3") == third
+
+
+def test_invalidate():
+    cache = RouteCache(max_size=10, ttl=60)
+    route = build_route()
+    cache.put(route)
+    cache.invalidate(route.id)
+
+    assert cache.get(route.id) is None
+    assert cache.get_by_flight("813") is None
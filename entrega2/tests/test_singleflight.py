@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.singleflight import SingleFlight
+
+
+def test_concurrent_calls_are_merged():
+    """Checks that identical calls in flight at the same time share a single upstream call"""
+    flight = SingleFlight()
+    upstream_calls = []
+
+    async def fetch():
+        upstream_calls.append(1)
+        await asyncio.sleep(0.01)
+        return "post"
+
+    async def run():
+        return await asyncio.gather(*[flight.do(("GET", "/posts/1", "token"), fetch) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["post"] * 5
+    assert len(upstream_calls) == 1
+    assert flight.stats() == {"calls": 5, "merged": 4, "inFlight": 0}
+
+
+def test_different_keys_are_not_merged():
+    """Checks that calls for different URLs or tokens each reach upstream"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "post"
+
+    async def run():
+        return await asyncio.gather(
+            flight.do(("GET", "/posts/1", "token"), fetch),
+            flight.do(("GET", "/posts/1", "other token"), fetch),
+            flight.do(("GET", "/posts/2", "token"), fetch)
+        )
+
+    asyncio.run(run())
+    assert flight.stats()["merged"] == 0
+
+
+def test_errors_are_shared():
+    """Checks that every merged caller sees the upstream failure"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def run():
+        return await asyncio.gather(
+            *[flight.do("key", fetch) for _ in range(3)], return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    """Checks that the shared call keeps running when the caller that started it gives up"""
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "post"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        second = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "post"
+
+
+def test_metrics(client: TestClient):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert set(response.json()["singleflight"]) == {"calls", "merged", "inFlight"}
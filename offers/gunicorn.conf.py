@@ -0,0 +1,24 @@
+# Production server settings, every value can be overridden from the environment
+import multiprocessing
+import os
+
+bind = os.environ.get('WEB_BIND', '0.0.0.0:3000')
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Keep at most DB_POOL_SIZE + DB_MAX_OVERFLOW, a thread waiting on the pool holds its request
+threads = int(os.environ.get('WEB_THREADS', 4))
+# Import the app once in the master, the workers are forked with it already loaded
+preload_app = True
+# Recycle workers gracefully after a number of requests, the jitter keeps them from restarting together
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 100))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    from src.session import engine
+    # Connections the master opened while preloading belong to it, each worker opens its own
+    engine.dispose(close=False)
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from .signed_token import signed_tokens, InvalidSignedToken
+import threading
+import requests
+import time
+import os
+
+
+class AuthClient():
+    """
+    Client for the users service /users/me endpoint shared by every request.
+    It keeps a pool of keep-alive connections instead of opening one per
+    request, bounds every call with connect/read timeouts, and remembers
+    successful lookups for a few seconds so bursts with the same token only
+    reach the users service once.
+    """
+
+    def __init__(self, pool_size, connect_timeout, read_timeout, cache_ttl, cache_size):
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def me(self, token):
+        """Returns the status code of /users/me and the user when it is 200"""
+        bearer = token.split(' ')[-1] if token != None else None
+        if signed_tokens.applies(bearer):
+            try:
+                return 200, signed_tokens.verify(bearer)
+            except InvalidSignedToken:
+                return 401, None
+
+        user = self.cached(token)
+        if user != None:
+            return 200, user
+
+        host = os.environ['USERS_PATH']
+        headers = {}
+        if token != None:
+            headers['Authorization'] = token
+
+        response = self.http.get(
+            f'{host}/users/me',
+            headers=headers,
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            return response.status_code, None
+
+        user = response.json() if response.content else {}
+        self.store(token, user)
+        return 200, user
+
+    def cached(self, token):
+        if token == None or self.cache_ttl <= 0:
+            return None
+        with self.lock:
+            entry = self.cache.get(token)
+            if entry == None:
+                return None
+            if entry[1] < time.monotonic():
+                del self.cache[token]
+                return None
+            return entry[0]
+
+    def store(self, token, user):
+        if token == None or self.cache_ttl <= 0:
+            return
+        with self.lock:
+            self.cache[token] = (user, time.monotonic() + self.cache_ttl)
+            self.cache.move_to_end(token)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+
+
+auth_client = AuthClient(
+    pool_size=int(os.environ.get('AUTH_POOL_SIZE', 20)),
+    connect_timeout=float(os.environ.get('AUTH_CONNECT_TIMEOUT', 2)),
+    read_timeout=float(os.environ.get('AUTH_READ_TIMEOUT', 5)),
+    cache_ttl=float(os.environ.get('AUTH_CACHE_TTL', 5)),
+    cache_size=int(os.environ.get('AUTH_CACHE_SIZE', 10000))
+)
@@ -2,9 +2,12 @@ from flask import Flask, jsonify, request, Blueprint
 from ..commands.create_offer import CreateOffer
 from ..commands.get_offer import GetOffer
 from ..commands.get_offers import GetOffers
+from ..commands.get_offer_summary import GetOfferSummary
 from ..commands.delete_offer import DeleteOffer
 from ..commands.authenticate import Authenticate
 from ..commands.reset import Reset
+from ..session import pool_stats
+from ..signed_token import signed_tokens
 
 offers_blueprint = Blueprint('offers', __name__)
 
@@ -19,8 +22,16 @@ def create():
 @offers_blueprint.route('/offers', methods=['GET'])
 def index():
     auth_info = Authenticate(auth_token()).execute()
-    offers = GetOffers(request.args.to_dict(), auth_info['id']).execute()
-    return jsonify(offers)
+    command = GetOffers(request.args.to_dict(), auth_info['id'])
+    offers = command.execute()
+    return paginated_response(offers, command.next_cursor)
+
+
+@offers_blueprint.route('/offers/summary', methods=['GET'])
+def summary():
+    Authenticate(auth_token()).execute()
+    summary = GetOfferSummary(request.args.to_dict()).execute()
+    return jsonify(summary)
 
 
 @offers_blueprint.route('/offers/<id>', methods=['GET'])
@@ -42,6 +53,15 @@ def ping():
     return 'pong'
 
 
+@offers_blueprint.route('/offers/metrics', methods=['GET'])
+def metrics():
+    Authenticate(auth_token()).execute()
+    return jsonify({
+        'dbPool': pool_stats(),
+        'signedTokens': signed_tokens.stats()
+    })
+
+
 @offers_blueprint.route('/offers/reset', methods=['POST'])
 def reset():
     Reset().execute()
@@ -54,3 +74,10 @@ def auth_token():
     else:
         authorization = None
     return authorization
+
+
+def paginated_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor != None:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
@@ -0,0 +1,34 @@
+from .base_command import BaseCommannd
+from ..models.offer import Offer, OfferSummarySchema
+from ..session import Session
+from ..errors.errors import InvalidParam, IncompleteParams
+from sqlalchemy import func
+import uuid
+
+
+class GetOfferSummary(BaseCommannd):
+    def __init__(self, data):
+        if 'post' not in data:
+            raise IncompleteParams()
+        if not self.is_uuid(data['post']):
+            raise InvalidParam()
+        self.postId = uuid.UUID(data['post'])
+
+    def execute(self):
+        session = Session()
+        # Aggregated by the database over the post's index range, no offer rows are loaded
+        count, min_offer, max_offer, average = session.query(
+            func.count(Offer.id),
+            func.min(Offer.offer),
+            func.max(Offer.offer),
+            func.avg(Offer.offer)
+        ).filter(Offer.postId == self.postId).one()
+        session.close()
+
+        return OfferSummarySchema().dump({
+            'postId': self.postId,
+            'count': count,
+            'min': min_offer,
+            'max': max_offer,
+            'average': float(average) if average != None else None
+        })
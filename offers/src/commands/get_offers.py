@@ -2,6 +2,7 @@ from .base_command import BaseCommannd
 from ..models.offer import Offer, OfferDefailtSchema
 from ..session import Session
 from ..errors.errors import InvalidParam, IncompleteParams
+from .pagination import KeysetPagination
 from datetime import datetime
 import uuid
 
@@ -19,23 +20,39 @@ class GetOffers(BaseCommannd):
         if 'owner' in data:
             if data['owner'] == 'me':
                 self.owner = userId
-            else:
+            elif self.is_uuid(data['owner']):
                 self.owner = data['owner']
+            else:
+                raise InvalidParam()
         else:
             self.owner = None
 
+        if 'ids' in data:
+            self.ids = data['ids'].split(',')
+            if not all(self.is_uuid(id) for id in self.ids):
+                raise InvalidParam()
+        else:
+            self.ids = None
+        self.pagination = KeysetPagination(data)
+
     def execute(self):
         session = Session()
-        offers = session.query(Offer).all()
+        query = session.query(Offer)
 
         if self.postId != None:
-            offers = [offer for offer in offers if offer.postId ==
-                      uuid.UUID(self.postId)]
+            query = query.filter(Offer.postId == uuid.UUID(self.postId))
 
         if self.owner != None:
-            offers = [offer for offer in offers if offer.userId ==
-                      uuid.UUID(self.owner)]
+            query = query.filter(Offer.userId == uuid.UUID(self.owner))
 
-        offers = OfferDefailtSchema(many=True).dump(offers)
+        if self.ids != None:
+            query = query.filter(Offer.id.in_([uuid.UUID(id) for id in self.ids]))
+
+        query = self.pagination.apply(query, Offer)
+        offers = OfferDefailtSchema(many=True).dump(self.pagination.page(query.all()))
         session.close()
         return offers
+
+    @property
+    def next_cursor(self):
+        return self.pagination.next_cursor
@@ -0,0 +1,63 @@
+from ..errors.errors import InvalidParam
+from sqlalchemy import tuple_
+from datetime import datetime
+import base64
+import binascii
+import os
+import uuid
+
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
+
+
+class KeysetPagination():
+    """
+    Cursor based pagination over (key, id), where key is a datetime column
+    and defaults to createdAt. The cursor is an opaque token pointing at the
+    last row of the previous page, so every page is a single range scan on
+    an index ending in (key, id) instead of an OFFSET.
+    """
+
+    def __init__(self, data, key='createdAt'):
+        self.key = key
+        self.limit = self.parse_limit(data['limit'] if 'limit' in data else None)
+        self.cursor = self.decode_cursor(data['cursor'] if 'cursor' in data else None)
+        self.next_cursor = None
+
+    def apply(self, query, model):
+        if self.cursor != None:
+            query = query.filter(
+                tuple_(getattr(model, self.key), model.id) > tuple_(*self.cursor)
+            )
+        # Fetch one extra row to know whether there is a next page
+        return query.order_by(getattr(model, self.key), model.id).limit(self.limit + 1)
+
+    def page(self, rows):
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            self.next_cursor = self.encode_cursor(rows[-1])
+        return rows
+
+    def parse_limit(self, limit):
+        if limit == None:
+            return MAX_PAGE_SIZE
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise InvalidParam()
+        if limit <= 0:
+            raise InvalidParam()
+        return min(limit, MAX_PAGE_SIZE)
+
+    def encode_cursor(self, row):
+        raw = f'{getattr(row, self.key).isoformat()}|{row.id}'
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('utf-8')
+
+    def decode_cursor(self, cursor):
+        if cursor == None or cursor == '':
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('utf-8')).decode('utf-8')
+            key, id = raw.split('|')
+            return datetime.fromisoformat(key), uuid.UUID(id)
+        except (ValueError, binascii.Error, UnicodeDecodeError):
+            raise InvalidParam()
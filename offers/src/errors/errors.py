@@ -34,3 +34,8 @@ class ExternalError(ApiError):
 
     def __init__(self, code):
         self.code = code
+
+
+class ServiceOverloaded(ApiError):
+    code = 503
+    description = "Service is overloaded, please try again later"
@@ -1,5 +1,5 @@
 from marshmallow import Schema, fields
-from sqlalchemy import Column, Integer, Integer, String, Boolean
+from sqlalchemy import Column, Integer, Integer, String, Boolean, Index
 from .model import Model, Base
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
@@ -7,6 +7,12 @@ from sqlalchemy.dialects.postgresql import UUID
 
 class Offer(Model, Base):
     __tablename__ = 'offers'
+    __table_args__ = (
+        Index('ix_offers_createdAt_id', 'createdAt', 'id'),
+        # Offers of a post or of a user are read in keyset order, the indexes serve the filter and the order
+        Index('ix_offers_postId_createdAt_id', 'postId', 'createdAt', 'id'),
+        Index('ix_offers_userId_createdAt_id', 'userId', 'createdAt', 'id'),
+    )
 
     postId = Column(UUID(as_uuid=True), default=uuid.uuid4)
     userId = Column(UUID(as_uuid=True), default=uuid.uuid4)
@@ -55,3 +61,11 @@ class OfferSchema(Schema):
     offer = fields.Number()
     userId = fields.UUID()
     createdAt = fields.DateTime()
+
+
+class OfferSummarySchema(Schema):
+    postId = fields.UUID()
+    count = fields.Int()
+    min = fields.Number(allow_none=True)
+    max = fields.Number(allow_none=True)
+    average = fields.Float(allow_none=True)
@@ -0,0 +1,173 @@
+from datetime import datetime
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+import os
+
+import requests
+
+
+VERSION = 'v1'
+REFRESH_TIMEOUT = (2, 5)
+
+
+def encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class InvalidSignedToken(Exception):
+    pass
+
+
+class SignedTokens():
+    """
+    HMAC-SHA256 signed access tokens issued by the users service. They carry
+    the user id, email, status and expiry, so any service holding the shared
+    key can authenticate a request without calling /users/me.
+
+    Tokens revoked before they expire are listed by /users/tokens/revoked.
+    Each process keeps a copy of that list, refreshed every
+    `refresh_interval` seconds by a background thread. While the copy is
+    older than `max_staleness` seconds the tokens aren't trusted offline
+    and `applies` sends the caller back to /users/me.
+    """
+
+    def __init__(self, key, refresh_interval, max_staleness, service_token=None):
+        self.key = key.encode() if key else None
+        self.service_token = service_token
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.revoked = {}
+        self.refreshed_at = None
+        self.lock = threading.Lock()
+        self.thread = None
+        self.verified = 0
+        self.rejected = 0
+        self.refresh_failures = 0
+
+    @property
+    def enabled(self):
+        return self.key != None
+
+    def issue(self, user_id, email, status, token, expire_at):
+        claims = {
+            'sub': str(user_id),
+            'email': email,
+            'status': status,
+            'jti': self.token_id(token),
+            'exp': int(expire_at.timestamp())
+        }
+        payload = encode(json.dumps(claims, separators=(',', ':')).encode())
+        return f'{VERSION}.{payload}.{self.sign(payload)}'
+
+    def token_id(self, token):
+        """Public id of an opaque token, it doesn't give the token itself away"""
+        return hashlib.sha256(str(token).encode()).hexdigest()
+
+    def is_signed(self, token):
+        return token != None and token.startswith(VERSION + '.') and token.count('.') == 2
+
+    def applies(self, token):
+        """Whether `token` is a signed token this process can currently verify on its own"""
+        if not self.enabled or not self.is_signed(token):
+            return False
+        # Until the first copy of the denylist arrives tokens go through /users/me
+        self.start()
+        with self.lock:
+            return self.refreshed_at != None and time.monotonic() - self.refreshed_at <= self.max_staleness
+
+    def claims(self, token):
+        """Returns the claims of a well signed, unexpired token, whether it was revoked or not"""
+        try:
+            _, payload, signature = token.split('.')
+            if not hmac.compare_digest(signature, self.sign(payload)):
+                raise InvalidSignedToken('Bad signature')
+            claims = json.loads(decode(payload))
+            expired = claims['exp'] < time.time()
+        except (ValueError, TypeError, KeyError) as e:
+            raise InvalidSignedToken(str(e))
+
+        if expired:
+            raise InvalidSignedToken('Expired')
+        return claims
+
+    def verify(self, token):
+        """Returns the user of a valid token as /users/me would, raises InvalidSignedToken otherwise"""
+        try:
+            claims = self.claims(token)
+            with self.lock:
+                if claims['jti'] in self.revoked:
+                    raise InvalidSignedToken('Revoked')
+            if claims['status'] != 'VERIFICADO':
+                raise InvalidSignedToken('User not verified')
+        except InvalidSignedToken:
+            with self.lock:
+                self.rejected += 1
+            raise
+
+        with self.lock:
+            self.verified += 1
+        return {
+            'id': claims['sub'],
+            'email': claims['email'],
+            'status': claims['status'],
+            'expireAt': datetime.fromtimestamp(claims['exp']).isoformat()
+        }
+
+    def sign(self, payload):
+        return encode(hmac.new(self.key, f'{VERSION}.{payload}'.encode(), hashlib.sha256).digest())
+
+    def start(self):
+        with self.lock:
+            if self.thread != None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while True:
+            self.refresh()
+            time.sleep(self.refresh_interval)
+
+    def refresh(self):
+        url = os.environ['USERS_PATH'].rstrip('/') + '/users/tokens/revoked'
+        try:
+            # The denylist is only served to other services
+            response = requests.get(url, headers={'Authorization': f'Bearer {self.service_token}'},
+                                    timeout=REFRESH_TIMEOUT)
+            response.raise_for_status()
+            revoked = {entry['jti']: entry['exp'] for entry in response.json()}
+        except (requests.RequestException, ValueError, KeyError, TypeError):
+            with self.lock:
+                self.refresh_failures += 1
+            return False
+
+        with self.lock:
+            self.revoked = revoked
+            self.refreshed_at = time.monotonic()
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                'enabled': self.enabled,
+                'revoked': len(self.revoked),
+                'verified': self.verified,
+                'rejected': self.rejected,
+                'refreshFailures': self.refresh_failures
+            }
+
+
+signed_tokens = SignedTokens(
+    os.environ.get('TOKEN_SIGNING_KEY'),
+    float(os.environ.get('TOKEN_DENYLIST_REFRESH_SECONDS', 30)),
+    float(os.environ.get('TOKEN_DENYLIST_MAX_STALENESS', 120)),
+    os.environ.get('USERS_SERVICE_TOKEN')
+)
@@ -1,5 +1,5 @@
 from src.commands.create_offer import CreateOffer
-from src.session import Session, engine
+from src.session import Session, MeteredQueuePool, PoolMetrics, engine
 from src.models.model import Base
 from src.models.offer import Offer
 from src.errors.errors import ApiError
@@ -10,6 +10,8 @@ from src.main import app
 from uuid import uuid4
 import json
 from tests.utils.constants import STATIC_FAKE_UUID
+from sqlalchemy import create_engine, exc, text
+import pytest
 
 class TestOffers():
   def setup_method(self):
@@ -315,6 +317,48 @@ class TestOffers():
         )
         assert response.status_code == 400
 
+  def test_get_offer_summary(self):
+    postId = str(uuid4())
+    for offer in [10, 30]:
+      CreateOffer({
+        'postId': postId,
+        'description': 'My description',
+        'size': 'LARGE',
+        'fragile': True,
+        'offer': offer
+      }, self.userId).execute()
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/offers/summary',
+          query_string={
+            'post': postId
+          },
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        response_json = json.loads(response.data)
+        assert response.status_code == 200
+        assert response_json['count'] == 2
+        assert response_json['min'] == 10
+        assert response_json['max'] == 30
+        assert response_json['average'] == 20
+
+  def test_get_offer_summary_invalid_token(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_failed_auth):
+        response = test_client.get(
+          '/offers/summary',
+          query_string={
+            'post': str(uuid4())
+          },
+          headers={
+            'Authorization': f'Bearer Invalid'
+          }
+        )
+        assert response.status_code == 401
+
   def test_delete_route(self):
     data = {
       'postId': str(uuid4()),
@@ -383,6 +427,24 @@ class TestOffers():
 
 
 
+  def test_metrics(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/offers/metrics',
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        assert response.status_code == 200
+        assert 'checkedOut' in json.loads(response.data)['dbPool']
+
+  def test_metrics_without_token(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_forbidden_auth):
+        response = test_client.get('/offers/metrics')
+        assert response.status_code == 403
+
   def test_ping(self):
     with app.test_client() as test_client:
       response = test_client.get(
@@ -398,6 +460,34 @@ class TestOffers():
       )
       assert response.status_code == 200
 
+  def test_request_closes_sessions_left_open(self):
+    with app.app_context():
+      session = Session()
+      session.execute(text('SELECT 1'))
+      assert session.in_transaction()
+
+    assert not session.in_transaction()
+
+  def test_exhausted_pool_counts_timeout(self, monkeypatch):
+    monkeypatch.setattr('src.session.pool_metrics', PoolMetrics())
+    exhausted = create_engine(engine.url, poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    with exhausted.connect():
+      with pytest.raises(exc.TimeoutError):
+        exhausted.connect()
+
+    from src import session
+    assert session.pool_metrics.stats(exhausted.pool)['timeouts'] == 1
+    exhausted.dispose()
+
+  def test_pool_timeout_answers_503(self, monkeypatch):
+    def exhausted_pool(self):
+      raise exc.TimeoutError()
+    monkeypatch.setattr('src.blueprints.offers.Reset.execute', exhausted_pool)
+
+    with app.test_client() as test_client:
+      response = test_client.post('/offers/reset')
+      assert response.status_code == 503
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
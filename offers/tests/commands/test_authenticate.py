@@ -18,4 +18,22 @@ class TestAuthenticate():
         result = Authenticate(str(uuid4())).execute()
         assert False
       except ExternalError:
-        assert True
\ No newline at end of file
+        assert True
+
+  def test_authenticate_is_cached(self):
+    token = str(uuid4())
+    with HTTMock(mock_success_auth):
+      Authenticate(token).execute()
+    with HTTMock(mock_failed_auth):
+      Authenticate(token).execute()
+
+  def test_failed_authenticate_is_not_cached(self):
+    token = str(uuid4())
+    with HTTMock(mock_failed_auth):
+      try:
+        Authenticate(token).execute()
+        assert False
+      except ExternalError:
+        assert True
+    with HTTMock(mock_success_auth):
+      Authenticate(token).execute()
@@ -0,0 +1,62 @@
+from src.commands.create_offer import CreateOffer
+from src.commands.get_offer_summary import GetOfferSummary
+from src.session import Session, engine
+from src.models.model import Base
+from src.errors.errors import InvalidParam, IncompleteParams
+from uuid import uuid4
+from tests.utils.constants import STATIC_FAKE_UUID
+
+class TestGetOfferSummary():
+  def setup_method(self):
+    Base.metadata.create_all(engine)
+    self.session = Session()
+    self.userId = STATIC_FAKE_UUID
+    self.postId = str(uuid4())
+    for offer in [10, 20, 45]:
+      CreateOffer({
+        'postId': self.postId,
+        'description': 'My description',
+        'size': 'LARGE',
+        'fragile': True,
+        'offer': offer
+      }, self.userId).execute()
+    CreateOffer({
+      'postId': str(uuid4()),
+      'description': 'Other post',
+      'size': 'SMALL',
+      'fragile': False,
+      'offer': 1000
+    }, self.userId).execute()
+
+  def test_get_offer_summary(self):
+    summary = GetOfferSummary({ 'post': self.postId }).execute()
+    assert summary['postId'] == self.postId
+    assert summary['count'] == 3
+    assert summary['min'] == 10
+    assert summary['max'] == 45
+    assert summary['average'] == 25
+
+  def test_get_offer_summary_without_offers(self):
+    summary = GetOfferSummary({ 'post': str(uuid4()) }).execute()
+    assert summary['count'] == 0
+    assert summary['min'] == None
+    assert summary['max'] == None
+    assert summary['average'] == None
+
+  def test_get_offer_summary_invalid_post_id(self):
+    try:
+      GetOfferSummary({ 'post': 'invalid' })
+      assert False
+    except InvalidParam:
+      assert True
+
+  def test_get_offer_summary_missing_post(self):
+    try:
+      GetOfferSummary({})
+      assert False
+    except IncompleteParams:
+      assert True
+
+  def teardown_method(self):
+    self.session.close()
+    Base.metadata.drop_all(bind=engine)
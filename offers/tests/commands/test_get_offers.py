@@ -1,7 +1,8 @@
 from src.commands.create_offer import CreateOffer
 from src.commands.get_offers import GetOffers
 from src.session import Session, engine
-from src.models.model import Base
+from src.models.model import Base, create_indexes
+from sqlalchemy import inspect, text
 from src.models.offer import Offer
 from src.errors.errors import InvalidParam, IncompleteParams
 from datetime import datetime, timedelta
@@ -110,6 +111,63 @@ class TestGetOffers():
     except InvalidParam:
       assert True
 
+  def test_get_offers_invalid_owner(self):
+    try:
+      GetOffers({ 'owner': 'invalid' }, self.userId)
+      assert False
+    except InvalidParam:
+      assert True
+
+  def test_get_offers_by_ids(self):
+    other = CreateOffer(dict(self.data), self.userId).execute()
+    CreateOffer(dict(self.data), self.userId).execute()
+
+    offers = GetOffers({ 'ids': f"{self.offer['id']},{other['id']}" }, self.userId).execute()
+    assert sorted(offer['id'] for offer in offers) == sorted([self.offer['id'], other['id']])
+
+  def test_get_offers_invalid_ids(self):
+    try:
+      GetOffers({ 'ids': f"{self.offer['id']},invalid" }, self.userId)
+      assert False
+    except InvalidParam:
+      assert True
+
+  def test_get_offers_paginated(self):
+    for _ in range(2):
+      CreateOffer(dict(self.data), self.userId).execute()
+
+    command = GetOffers({ 'post': self.data['postId'], 'limit': '2' }, self.userId)
+    first_page = command.execute()
+    assert len(first_page) == 2
+    assert command.next_cursor != None
+
+    command = GetOffers({
+      'post': self.data['postId'],
+      'limit': '2',
+      'cursor': command.next_cursor
+    }, self.userId)
+    second_page = command.execute()
+    assert len(second_page) == 1
+    assert command.next_cursor == None
+
+  def test_get_offers_invalid_cursor(self):
+    try:
+      GetOffers({ 'cursor': 'invalid' }, self.userId)
+      assert False
+    except InvalidParam:
+      assert True
+
+  def test_indexes_created_on_existing_table(self):
+    # Tables created before the indexes were declared get them at startup
+    with engine.begin() as connection:
+      connection.execute(text('DROP INDEX "ix_offers_createdAt_id"'))
+      connection.execute(text('DROP INDEX "ix_offers_postId_createdAt_id"'))
+      connection.execute(text('DROP INDEX "ix_offers_userId_createdAt_id"'))
+    create_indexes(engine)
+
+    indexes = [index['name'] for index in inspect(engine).get_indexes('offers')]
+    assert set(['ix_offers_createdAt_id', 'ix_offers_postId_createdAt_id', 'ix_offers_userId_createdAt_id']) <= set(indexes)
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
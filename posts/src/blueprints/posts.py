@@ -5,6 +5,8 @@ from ..commands.get_posts import GetPosts
 from ..commands.authenticate import Authenticate
 from ..commands.delete_post import DeletePost
 from ..commands.reset import Reset
+from ..session import pool_stats
+from ..signed_token import signed_tokens
 
 posts_blueprint = Blueprint('posts', __name__)
 
@@ -19,8 +21,9 @@ def create():
 @posts_blueprint.route('/posts', methods=['GET'])
 def index():
     auth_info = Authenticate(auth_token()).execute()
-    posts = GetPosts(request.args.to_dict(), auth_info['id']).execute()
-    return jsonify(posts)
+    command = GetPosts(request.args.to_dict(), auth_info['id'])
+    posts = command.execute()
+    return paginated_response(posts, command.next_cursor)
 
 
 @posts_blueprint.route('/posts/<id>', methods=['GET'])
@@ -42,6 +45,15 @@ def ping():
     return 'pong'
 
 
+@posts_blueprint.route('/posts/metrics', methods=['GET'])
+def metrics():
+    Authenticate(auth_token()).execute()
+    return jsonify({
+        'dbPool': pool_stats(),
+        'signedTokens': signed_tokens.stats()
+    })
+
+
 @posts_blueprint.route('/posts/reset', methods=['POST'])
 def reset():
     Reset().execute()
@@ -54,3 +66,10 @@ def auth_token():
     else:
         authorization = None
     return authorization
+
+
+def paginated_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor != None:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
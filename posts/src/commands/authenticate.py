@@ -1,8 +1,7 @@
 from .base_command import BaseCommannd
-from ..session import Session
+from ..auth_client import auth_client
 from ..errors.errors import ExternalError
 import requests
-import os
 
 
 class Authenticate(BaseCommannd):
@@ -10,16 +9,12 @@ class Authenticate(BaseCommannd):
         self.token = token
 
     def execute(self):
-        host = os.environ['USERS_PATH']
-        headers = {}
-        if self.token != None:
-            headers['Authorization'] = self.token
+        try:
+            status_code, user = auth_client.me(self.token)
+        except requests.RequestException:
+            raise ExternalError(503)
 
-        response = requests.get(
-            f'{host}/users/me',
-            headers=headers
-        )
-        if response.status_code == 200:
-            return response.json()
+        if status_code == 200:
+            return user
         else:
-            raise ExternalError(response.status_code)
+            raise ExternalError(status_code)
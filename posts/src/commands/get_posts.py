@@ -2,7 +2,8 @@ from .base_command import BaseCommannd
 from ..models.post import Post, PostSchema
 from ..session import Session
 from ..errors.errors import InvalidParams
-from datetime import datetime
+from .pagination import KeysetPagination
+from sqlalchemy import func
 import uuid
 
 
@@ -17,39 +18,40 @@ class GetPosts(BaseCommannd):
                 self.owner = data['owner']
         else:
             self.owner = None
+        self.pagination = KeysetPagination(data)
 
     def execute(self):
+        if self.expire != None and not self.is_boolean_string(self.expire):
+            raise InvalidParams()
+
         session = Session()
-        posts = session.query(Post).all()
+        query = session.query(Post)
 
         if self.owner != None:
-            posts = [post for post in posts if post.userId ==
-                     uuid.UUID(self.owner)]
+            query = query.filter(Post.userId == uuid.UUID(self.owner))
 
         if self.route != None:
-            posts = [post for post in posts if post.routeId ==
-                     uuid.UUID(self.route)]
+            query = query.filter(Post.routeId == uuid.UUID(self.route))
 
         if self.expire != None:
-            if not self.is_boolean_string(self.expire):
-                session.close()
-                raise InvalidParams()
-
             if self.string_to_boolean(self.expire):
-                posts = [post for post in posts if self.date_in_the_past(
-                    post.expireAt.date())]
+                query = query.filter(Post.expireAt < self.start_of_current_utc_day())
             else:
-                posts = [post for post in posts if not self.date_in_the_past(
-                    post.expireAt.date())]
+                query = query.filter(Post.expireAt >= self.start_of_current_utc_day())
 
-        posts = PostSchema(many=True).dump(posts)
+        query = self.pagination.apply(query, Post)
+        posts = PostSchema(many=True).dump(self.pagination.page(query.all()))
         session.close()
 
         return posts
 
-    def date_in_the_past(self, date):
-        current_utc_datetime = datetime.utcnow().date()
-        return date < current_utc_datetime
+    @property
+    def next_cursor(self):
+        return self.pagination.next_cursor
+
+    def start_of_current_utc_day(self):
+        # Comparing against midnight keeps the predicate sargable on expireAt
+        return func.date_trunc('day', func.timezone('UTC', func.now()))
 
     def is_boolean_string(self, s):
         return s.lower() == 'true' or s.lower() == 'false'
@@ -1,6 +1,7 @@
 from datetime import datetime
 from sqlalchemy import Column, String, Integer, DateTime
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.schema import CreateIndex
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -16,3 +17,11 @@ class Model():
     def __init__(self):
         self.createdAt = datetime.now()
         self.updatedAt = datetime.now()
+
+
+def create_indexes(engine):
+    # create_all only builds indexes along with a new table, this adds the ones declared later to existing tables
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
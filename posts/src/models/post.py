@@ -1,5 +1,5 @@
 from marshmallow import Schema, fields
-from sqlalchemy import Column, DateTime, Integer, Integer
+from sqlalchemy import Column, DateTime, Integer, Integer, Index
 from .model import Model, Base
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
@@ -7,6 +7,11 @@ from sqlalchemy.dialects.postgresql import UUID
 
 class Post(Model, Base):
     __tablename__ = 'posts'
+    __table_args__ = (
+        Index('ix_posts_userId_expireAt', 'userId', 'expireAt'),
+        Index('ix_posts_routeId_expireAt', 'routeId', 'expireAt'),
+        Index('ix_posts_createdAt_id', 'createdAt', 'id'),
+    )
 
     routeId = Column(UUID(as_uuid=True), default=uuid.uuid4)
     userId = Column(UUID(as_uuid=True), default=uuid.uuid4)
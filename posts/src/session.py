@@ -1,6 +1,10 @@
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy import create_engine, exc
+from flask import g, has_app_context
 import os
+import threading
+import time
 
 
 class SessionConfig():
@@ -15,7 +19,89 @@ class SessionConfig():
         db_name = os.environ['DB_NAME']
         return f'postgresql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}'
 
+    def engine_options(self):
+        return {
+            'poolclass': MeteredQueuePool,
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            # Fail fast with a 503 rather than piling requests up behind an exhausted pool
+            'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+        }
+
+
+class PoolMetrics():
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, waited, timed_out):
+        with self.lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self, pool):
+        with self.lock:
+            waits = self.checkouts + self.timeouts
+            return {
+                'size': pool.size(),
+                'checkedOut': pool.checkedout(),
+                'overflow': max(pool.overflow(), 0),
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avgWaitMs': self.wait_total * 1000 / waits if waits > 0 else 0,
+                'maxWaitMs': self.wait_max * 1000
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(QueuePool):
+    # Times every checkout, including the wait for a connection to be returned when the pool is exhausted
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record(time.perf_counter() - start, True)
+            raise
+        pool_metrics.record(time.perf_counter() - start, False)
+        return connection
+
+
+class RequestSessions():
+    # Sessions opened while handling a request are closed when its app context ends,
+    # so a command that raises before closing its session doesn't keep the connection
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __call__(self):
+        session = self.factory()
+        if has_app_context():
+            g.setdefault('db_sessions', []).append(session)
+        return session
+
+    def init_app(self, app):
+        app.teardown_appcontext(self.close_all)
+
+    def close_all(self, exception=None):
+        for session in g.pop('db_sessions', []):
+            session.close()
+
 
 session_config = SessionConfig()
-engine = create_engine(session_config.url())
-Session = sessionmaker(bind=engine)
+engine = create_engine(session_config.url(), **session_config.engine_options())
+Session = RequestSessions(sessionmaker(bind=engine))
+
+
+def pool_stats():
+    return pool_metrics.stats(engine.pool)
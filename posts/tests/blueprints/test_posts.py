@@ -1,5 +1,5 @@
 from src.commands.create_post import CreatePost
-from src.session import Session, engine
+from src.session import Session, MeteredQueuePool, PoolMetrics, engine
 from src.models.model import Base
 from src.models.post import Post
 from src.errors.errors import ApiError
@@ -11,6 +11,8 @@ from src.main import app
 import json
 import uuid
 from tests.utils.constants import STATIC_FAKE_UUID
+from sqlalchemy import create_engine, exc, text
+import pytest
 
 class TestPosts():
   def setup_method(self):
@@ -187,6 +189,46 @@ class TestPosts():
         assert 'userId' in response_json[0]
         assert 'expireAt' in response_json[0]
 
+  def test_get_posts_paginated(self):
+    userId = STATIC_FAKE_UUID
+    for _ in range(3):
+      CreatePost({
+        'routeId': str(uuid.uuid4()),
+        'expireAt': (datetime.now() + timedelta(days=2)).isoformat()
+      }, userId).execute()
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/posts',
+          query_string={ 'limit': 2 },
+          headers={ 'Authorization': f'Bearer {uuid4()}' }
+        )
+        first_page = json.loads(response.data)
+        assert response.status_code == 200
+        assert len(first_page) == 2
+        assert 'X-Next-Cursor' in response.headers
+
+        response = test_client.get(
+          '/posts',
+          query_string={ 'limit': 2, 'cursor': response.headers['X-Next-Cursor'] },
+          headers={ 'Authorization': f'Bearer {uuid4()}' }
+        )
+        second_page = json.loads(response.data)
+        assert response.status_code == 200
+        assert len(second_page) == 1
+        assert 'X-Next-Cursor' not in response.headers
+        assert second_page[0]['id'] not in [post['id'] for post in first_page]
+
+  def test_get_posts_invalid_cursor(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/posts',
+          query_string={ 'cursor': 'invalid' },
+          headers={ 'Authorization': f'Bearer {uuid4()}' }
+        )
+        assert response.status_code == 400
+
   def test_get_posts_without_token(self):
     data = {
       'routeId': str(uuid.uuid4()),
@@ -230,6 +272,24 @@ class TestPosts():
         )
         assert response.status_code == 401
 
+  def test_metrics(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/posts/metrics',
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        assert response.status_code == 200
+        assert 'checkedOut' in json.loads(response.data)['dbPool']
+
+  def test_metrics_without_token(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_forbidden_auth):
+        response = test_client.get('/posts/metrics')
+        assert response.status_code == 403
+
   def test_ping(self):
     with app.test_client() as test_client:
       response = test_client.get(
@@ -302,6 +362,34 @@ class TestPosts():
       )
       assert response.status_code == 200
 
+  def test_request_closes_sessions_left_open(self):
+    with app.app_context():
+      session = Session()
+      session.execute(text('SELECT 1'))
+      assert session.in_transaction()
+
+    assert not session.in_transaction()
+
+  def test_exhausted_pool_counts_timeout(self, monkeypatch):
+    monkeypatch.setattr('src.session.pool_metrics', PoolMetrics())
+    exhausted = create_engine(engine.url, poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    with exhausted.connect():
+      with pytest.raises(exc.TimeoutError):
+        exhausted.connect()
+
+    from src import session
+    assert session.pool_metrics.stats(exhausted.pool)['timeouts'] == 1
+    exhausted.dispose()
+
+  def test_pool_timeout_answers_503(self, monkeypatch):
+    def exhausted_pool(self):
+      raise exc.TimeoutError()
+    monkeypatch.setattr('src.blueprints.posts.Reset.execute', exhausted_pool)
+
+    with app.test_client() as test_client:
+      response = test_client.post('/posts/reset')
+      assert response.status_code == 503
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
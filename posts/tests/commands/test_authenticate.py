@@ -3,7 +3,10 @@ from src.session import Session, engine
 from src.models.model import Base
 from httmock import HTTMock
 from src.errors.errors import ExternalError
+from src.signed_token import signed_tokens
+from datetime import datetime, timedelta
 from uuid import uuid4
+import time
 from tests.mocks import mock_failed_auth, mock_success_auth
 
 class TestAuthenticate():
@@ -18,4 +21,46 @@ class TestAuthenticate():
         result = Authenticate(str(uuid4())).execute()
         assert False
       except ExternalError:
-        assert True
\ No newline at end of file
+        assert True
+
+  def test_authenticate_is_cached(self):
+    token = str(uuid4())
+    with HTTMock(mock_success_auth):
+      Authenticate(token).execute()
+    with HTTMock(mock_failed_auth):
+      Authenticate(token).execute()
+
+  def test_failed_authenticate_is_not_cached(self):
+    token = str(uuid4())
+    with HTTMock(mock_failed_auth):
+      try:
+        Authenticate(token).execute()
+        assert False
+      except ExternalError:
+        assert True
+    with HTTMock(mock_success_auth):
+      Authenticate(token).execute()
+
+  def test_authenticate_signed_token_offline(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+    monkeypatch.setattr(signed_tokens, 'start', lambda: None)
+    monkeypatch.setattr(signed_tokens, 'refreshed_at', time.monotonic())
+    user_id = uuid4()
+    token = signed_tokens.issue(user_id, 'user@example.com', 'VERIFICADO', uuid4(), datetime.now() + timedelta(hours=1))
+    with HTTMock(mock_failed_auth):
+      result = Authenticate(token).execute()
+      assert result['id'] == str(user_id)
+
+  def test_authenticate_revoked_signed_token(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+    monkeypatch.setattr(signed_tokens, 'start', lambda: None)
+    monkeypatch.setattr(signed_tokens, 'refreshed_at', time.monotonic())
+    token_id = uuid4()
+    monkeypatch.setattr(signed_tokens, 'revoked', { signed_tokens.token_id(token_id): 0 })
+    token = signed_tokens.issue(uuid4(), 'user@example.com', 'VERIFICADO', token_id, datetime.now() + timedelta(hours=1))
+    with HTTMock(mock_success_auth):
+      try:
+        Authenticate(token).execute()
+        assert False
+      except ExternalError:
+        assert True
@@ -1,7 +1,8 @@
 from src.commands.get_posts import GetPosts
 from src.commands.create_post import CreatePost
 from src.session import Session, engine
-from src.models.model import Base
+from src.models.model import Base, create_indexes
+from sqlalchemy import inspect, text
 from src.models.post import Post
 from src.errors.errors import InvalidParams
 from datetime import datetime, timedelta
@@ -37,6 +38,23 @@ class TestGetPosts():
     posts = GetPosts(data, self.userId).execute()
     assert len(posts) == 1
 
+  def test_get_posts_by_expire_true_with_expired_post(self):
+    expired_post = Post(
+      routeId=uuid.UUID(self.post_data['routeId']),
+      userId=uuid.UUID(self.userId),
+      expireAt=datetime.utcnow() - timedelta(days=1)
+    )
+    self.session.add(expired_post)
+    self.session.commit()
+
+    posts = GetPosts({ 'expire': 'true' }, self.userId).execute()
+    assert len(posts) == 1
+    assert posts[0]['id'] == str(expired_post.id)
+
+    posts = GetPosts({ 'expire': 'false' }, self.userId).execute()
+    assert len(posts) == 1
+    assert posts[0]['id'] == self.post['id']
+
   def test_get_posts_by_expire_invalid(self):
     data = {
       'expire': 'invalid'
@@ -77,6 +95,41 @@ class TestGetPosts():
     posts = GetPosts(data, self.userId).execute()
     assert len(posts) == 1
 
+  def test_get_posts_paginated(self):
+    for _ in range(2):
+      CreatePost({
+        'routeId': str(uuid.uuid4()),
+        'expireAt': (datetime.now() + timedelta(days=2)).isoformat()
+      }, self.userId).execute()
+
+    command = GetPosts({ 'limit': '2' }, self.userId)
+    first_page = command.execute()
+    assert len(first_page) == 2
+    assert command.next_cursor != None
+
+    command = GetPosts({ 'limit': '2', 'cursor': command.next_cursor }, self.userId)
+    second_page = command.execute()
+    assert len(second_page) == 1
+    assert command.next_cursor == None
+
+  def test_get_posts_invalid_limit(self):
+    try:
+      GetPosts({ 'limit': '0' }, self.userId)
+      assert False
+    except InvalidParams:
+      assert True
+
+  def test_indexes_created_on_existing_table(self):
+    # Tables created before the indexes were declared get them at startup
+    with engine.begin() as connection:
+      connection.execute(text('DROP INDEX "ix_posts_userId_expireAt"'))
+      connection.execute(text('DROP INDEX "ix_posts_routeId_expireAt"'))
+      connection.execute(text('DROP INDEX "ix_posts_createdAt_id"'))
+    create_indexes(engine)
+
+    indexes = [index['name'] for index in inspect(engine).get_indexes('posts')]
+    assert set(['ix_posts_userId_expireAt', 'ix_posts_routeId_expireAt', 'ix_posts_createdAt_id']) <= set(indexes)
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
@@ -1,10 +1,14 @@
 from flask import Flask, jsonify, request, Blueprint
 from ..commands.create_route import CreateRoute
 from ..commands.get_routes import GetRoutes
+from ..commands.search_routes import SearchRoutes
 from ..commands.get_route import GetRoute
+from ..commands.get_route_by_flight import GetRouteByFlight
 from ..commands.delete_route import DeleteRoute
 from ..commands.authenticate import Authenticate
 from ..commands.reset import Reset
+from ..session import pool_stats
+from ..signed_token import signed_tokens
 
 routes_blueprint = Blueprint('routes', __name__)
 
@@ -21,8 +25,26 @@ def create():
 def index():
     Authenticate(auth_token()).execute()
 
-    routes = GetRoutes(request.args.to_dict()).execute()
-    return jsonify(routes)
+    command = GetRoutes(request.args.to_dict())
+    routes = command.execute()
+    return paginated_response(routes, command.next_cursor)
+
+
+@routes_blueprint.route('/routes/search', methods=['GET'])
+def search():
+    Authenticate(auth_token()).execute()
+
+    command = SearchRoutes(request.args.to_dict())
+    routes = command.execute()
+    return paginated_response(routes, command.next_cursor)
+
+
+@routes_blueprint.route('/routes/by-flight/<flight_id>', methods=['GET'])
+def show_by_flight(flight_id):
+    Authenticate(auth_token()).execute()
+
+    route = GetRouteByFlight(flight_id).execute()
+    return jsonify(route)
 
 
 @routes_blueprint.route('/routes/<id>', methods=['GET'])
@@ -46,6 +68,15 @@ def ping():
     return 'pong'
 
 
+@routes_blueprint.route('/routes/metrics', methods=['GET'])
+def metrics():
+    Authenticate(auth_token()).execute()
+    return jsonify({
+        'dbPool': pool_stats(),
+        'signedTokens': signed_tokens.stats()
+    })
+
+
 @routes_blueprint.route('/routes/reset', methods=['POST'])
 def reset():
     Reset().execute()
@@ -58,3 +89,10 @@ def auth_token():
     else:
         authorization = None
     return authorization
+
+
+def paginated_response(items, next_cursor):
+    response = jsonify(items)
+    if next_cursor != None:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
@@ -3,6 +3,9 @@ from ..models.route import Route, RouteSchema, CreatedRouteSchema
 from ..session import Session
 from ..errors.errors import IncompleteParams, FlightIdAlreadyExists, InvalidDates
 from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION = '23505'
 
 
 class CreateRoute(BaseCommannd):
@@ -24,12 +27,16 @@ class CreateRoute(BaseCommannd):
             route = Route(**posted_route)
             session = Session()
 
-            if self.flight_id_exists(session):
-                session.close()
-                raise FlightIdAlreadyExists()
-
+            # The unique flightId index settles concurrent creates, no check before inserting
             session.add(route)
-            session.commit()
+            try:
+                session.commit()
+            except IntegrityError as e:
+                session.rollback()
+                session.close()
+                if getattr(e.orig, 'pgcode', None) == UNIQUE_VIOLATION:
+                    raise FlightIdAlreadyExists()
+                raise
 
             new_route = CreatedRouteSchema().dump(route)
             session.close()
@@ -38,13 +45,6 @@ class CreateRoute(BaseCommannd):
         except (TypeError, KeyError):
             raise IncompleteParams()
 
-    def flight_id_exists(self, session):
-        existing_routes = session.query(Route).filter_by(
-            flightId=self.data['flightId']
-        ).all()
-
-        return len(existing_routes) > 0
-    
     def valid_dates(self):
         start_date = self.string_to_date(self.data['plannedStartDate'])
         end_date = self.string_to_date(self.data['plannedEndDate'])
@@ -0,0 +1,21 @@
+from .base_command import BaseCommannd
+from ..models.route import Route, RouteSchema
+from ..session import Session
+from ..errors.errors import RouteNotFoundError
+
+
+class GetRouteByFlight(BaseCommannd):
+    def __init__(self, flight_id):
+        self.flight_id = flight_id
+
+    def execute(self):
+        session = Session()
+        # flightId is unique, a single lookup on its index
+        route = session.query(Route).filter(Route.flightId == self.flight_id).one_or_none()
+        if route == None:
+            session.close()
+            raise RouteNotFoundError()
+
+        route = RouteSchema().dump(route)
+        session.close()
+        return route
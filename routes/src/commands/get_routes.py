@@ -3,19 +3,26 @@ from ..models.route import Route, RouteSchema
 from ..session import Session
 from datetime import datetime, timedelta
 from ..errors.errors import InvalidParams
+from .pagination import KeysetPagination
 
 
 class GetRoutes(BaseCommannd):
     def __init__(self, data):
         self.flight = data['flight'] if 'flight' in data else None
+        self.pagination = KeysetPagination(data)
 
     def execute(self):
         session = Session()
-        routes = session.query(Route).all()
+        query = session.query(Route)
 
         if self.flight != None:
-            routes = [route for route in routes if route.flightId == self.flight]
+            query = query.filter(Route.flightId == self.flight)
 
-        routes = RouteSchema(many=True).dump(routes)
+        query = self.pagination.apply(query, Route)
+        routes = RouteSchema(many=True).dump(self.pagination.page(query.all()))
         session.close()
         return routes
+
+    @property
+    def next_cursor(self):
+        return self.pagination.next_cursor
@@ -0,0 +1,59 @@
+from .base_command import BaseCommannd
+from ..models.route import Route, RouteSchema
+from ..session import Session
+from ..errors.errors import IncompleteParams, InvalidParams
+from .pagination import KeysetPagination
+from datetime import datetime, timezone
+
+
+class SearchRoutes(BaseCommannd):
+    """
+    Routes between two airports departing in [startAfter, startBefore),
+    both ends optional, ordered by departure
+    """
+
+    def __init__(self, data):
+        if not data.get('from') or not data.get('to'):
+            raise IncompleteParams()
+
+        self.source = data['from']
+        self.destiny = data['to']
+        self.start_after = self.parse_date(data.get('startAfter'))
+        self.start_before = self.parse_date(data.get('startBefore'))
+        self.pagination = KeysetPagination(data, key='plannedStartDate')
+
+    def execute(self):
+        session = Session()
+        query = session.query(Route).filter(
+            Route.sourceAirportCode == self.source,
+            Route.destinyAirportCode == self.destiny
+        )
+
+        if self.start_after != None:
+            query = query.filter(Route.plannedStartDate >= self.start_after)
+
+        if self.start_before != None:
+            query = query.filter(Route.plannedStartDate < self.start_before)
+
+        query = self.pagination.apply(query, Route)
+        routes = RouteSchema(many=True).dump(self.pagination.page(query.all()))
+        session.close()
+        return routes
+
+    @property
+    def next_cursor(self):
+        return self.pagination.next_cursor
+
+    def parse_date(self, date_string):
+        if date_string == None or date_string == '':
+            return None
+        # If last character is a Z remove it
+        formatted_date = date_string[:-1] if date_string[-1] == 'Z' else date_string
+        try:
+            date = datetime.fromisoformat(formatted_date)
+        except ValueError:
+            raise InvalidParams()
+        # Planned dates are stored as naive UTC
+        if date.tzinfo != None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        return date
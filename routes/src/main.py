@@ -1,22 +1,35 @@
 from dotenv import load_dotenv, find_dotenv
 loaded = load_dotenv('.env.development')
 
-from .errors.errors import ApiError
+from .errors.errors import ApiError, ServiceOverloaded
 from .blueprints.routes import routes_blueprint
-from .models.model import Base
+from .models.model import Base, create_indexes
 from .session import Session, engine
+from sqlalchemy import exc
 from flask import Flask, jsonify
 
 
-app = Flask(__name__)
-app.register_blueprint(routes_blueprint)
+def create_app():
+    app = Flask(__name__)
+    app.register_blueprint(routes_blueprint)
+    Session.init_app(app)
+    app.register_error_handler(ApiError, handle_exception)
+    app.register_error_handler(exc.TimeoutError, handle_pool_timeout)
 
-Base.metadata.create_all(engine)
+    Base.metadata.create_all(engine)
+    create_indexes(engine)
+    return app
 
 
-@app.errorhandler(ApiError)
 def handle_exception(err):
     response = {
         "msg": err.description
     }
     return jsonify(response), err.code
+
+
+def handle_pool_timeout(err):
+    return handle_exception(ServiceOverloaded())
+
+
+app = create_app()
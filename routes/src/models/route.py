@@ -1,10 +1,17 @@
 from marshmallow import Schema, fields
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Integer, Index
 from .model import Model, Base
 
 
 class Route(Model, Base):
     __tablename__ = 'routes'
+    __table_args__ = (
+        Index('ix_routes_createdAt_id', 'createdAt', 'id'),
+        Index('ix_routes_flightId', 'flightId', unique=True),
+        # Searches fix both airports and scan a departure window in keyset order
+        Index('ix_routes_airports_plannedStartDate_id',
+              'sourceAirportCode', 'destinyAirportCode', 'plannedStartDate', 'id'),
+    )
 
     flightId = Column(String)
     sourceAirportCode = Column(String)
@@ -1,4 +1,4 @@
-from src.session import Session, engine
+from src.session import Session, MeteredQueuePool, PoolMetrics, engine
 from src.models.model import Base
 from src.models.route import Route
 from src.main import app
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from tests.mocks import mock_failed_auth, mock_success_auth, mock_forbidden_auth
 from httmock import HTTMock
 from tests.utils.constants import STATIC_FAKE_UUID
+from sqlalchemy import create_engine, exc, text
+import pytest
 
 class TestRoutes():
   def setup_method(self):
@@ -317,6 +319,81 @@ class TestRoutes():
 
         assert response.status_code == 404
 
+  def test_search_routes(self):
+    data = {
+      'flightId': 'A2',
+      'sourceAirportCode': 'LAX',
+      'sourceCountry': 'USA',
+      'destinyAirportCode': 'BOG',
+      'destinyCountry': 'CO',
+      'bagCost': 100,
+      'plannedStartDate': datetime.utcnow().isoformat(),
+      'plannedEndDate': (datetime.utcnow() + timedelta(days=2)).isoformat()
+    }
+    route = CreateRoute(data).execute()
+
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/routes/search',
+          query_string={
+            'from': 'LAX',
+            'to': 'BOG',
+            'startBefore': (datetime.utcnow() + timedelta(days=1)).isoformat()
+          },
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        response_json = json.loads(response.data)
+        assert response.status_code == 200
+        assert [found['id'] for found in response_json] == [route['id']]
+
+        response = test_client.get(
+          '/routes/search',
+          query_string={
+            'from': 'LAX'
+          },
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        assert response.status_code == 400
+
+  def test_get_route_by_flight(self):
+    data = {
+      'flightId': 'A2',
+      'sourceAirportCode': 'LAX',
+      'sourceCountry': 'USA',
+      'destinyAirportCode': 'BOG',
+      'destinyCountry': 'CO',
+      'bagCost': 100,
+      'plannedStartDate': datetime.utcnow().isoformat(),
+      'plannedEndDate': (datetime.utcnow() + timedelta(days=2)).isoformat()
+    }
+    route = CreateRoute(data).execute()
+
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/routes/by-flight/A2',
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        response_json = json.loads(response.data)
+        assert response.status_code == 200
+        assert response_json['id'] == route['id']
+        assert response_json['flightId'] == 'A2'
+
+        response = test_client.get(
+          '/routes/by-flight/B3',
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        assert response.status_code == 404
+
   def test_delete_route(self):
     data = {
       'flightId': 'A2',
@@ -389,6 +466,24 @@ class TestRoutes():
         )
         assert response.status_code == 403
 
+  def test_metrics(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_success_auth):
+        response = test_client.get(
+          '/routes/metrics',
+          headers={
+            'Authorization': f'Bearer {uuid4()}'
+          }
+        )
+        assert response.status_code == 200
+        assert 'checkedOut' in json.loads(response.data)['dbPool']
+
+  def test_metrics_without_token(self):
+    with app.test_client() as test_client:
+      with HTTMock(mock_forbidden_auth):
+        response = test_client.get('/routes/metrics')
+        assert response.status_code == 403
+
   def test_ping(self):
     with app.test_client() as test_client:
       response = test_client.get(
@@ -404,6 +499,34 @@ class TestRoutes():
       )
       assert response.status_code == 200
 
+  def test_request_closes_sessions_left_open(self):
+    with app.app_context():
+      session = Session()
+      session.execute(text('SELECT 1'))
+      assert session.in_transaction()
+
+    assert not session.in_transaction()
+
+  def test_exhausted_pool_counts_timeout(self, monkeypatch):
+    monkeypatch.setattr('src.session.pool_metrics', PoolMetrics())
+    exhausted = create_engine(engine.url, poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    with exhausted.connect():
+      with pytest.raises(exc.TimeoutError):
+        exhausted.connect()
+
+    from src import session
+    assert session.pool_metrics.stats(exhausted.pool)['timeouts'] == 1
+    exhausted.dispose()
+
+  def test_pool_timeout_answers_503(self, monkeypatch):
+    def exhausted_pool(self):
+      raise exc.TimeoutError()
+    monkeypatch.setattr('src.blueprints.routes.Reset.execute', exhausted_pool)
+
+    with app.test_client() as test_client:
+      response = test_client.post('/routes/reset')
+      assert response.status_code == 503
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
@@ -1,9 +1,10 @@
 from src.commands.create_route import CreateRoute
 from src.session import Session, engine
-from src.models.model import Base
+from src.models.model import Base, create_indexes
 from src.models.route import Route
 from src.errors.errors import IncompleteParams, FlightIdAlreadyExists, InvalidDates
 from datetime import datetime, timedelta
+from sqlalchemy import text
 
 class TestCreateRoute():
   def setup_method(self):
@@ -111,6 +112,30 @@ class TestCreateRoute():
       assert len(self.session.query(Route).all()) == 0
       assert True
 
+  def test_create_route_already_exist_on_table_without_index(self):
+    # Tables created before the unique index get it at startup
+    with engine.begin() as connection:
+      connection.execute(text('DROP INDEX "ix_routes_flightId"'))
+    create_indexes(engine)
+
+    data = {
+      'flightId': 'A2',
+      'sourceAirportCode': 'LAX',
+      'sourceCountry': 'USA',
+      'destinyAirportCode': 'BOG',
+      'destinyCountry': 'CO',
+      'bagCost': 100,
+      'plannedStartDate': datetime.utcnow().isoformat(),
+      'plannedEndDate': (datetime.utcnow() + timedelta(days=2)).isoformat()
+    }
+    CreateRoute(data).execute()
+
+    try:
+      CreateRoute(data).execute()
+      assert False
+    except FlightIdAlreadyExists:
+      assert len(self.session.query(Route).all()) == 1
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
@@ -0,0 +1,43 @@
+from src.commands.get_route_by_flight import GetRouteByFlight
+from src.commands.create_route import CreateRoute
+from src.session import Session, engine
+from src.models.model import Base
+from src.errors.errors import RouteNotFoundError
+from datetime import datetime, timedelta
+
+class TestGetRouteByFlight():
+  def setup_method(self):
+    Base.metadata.create_all(engine)
+    self.session = Session()
+
+    self.data = {
+      'flightId': 'A2',
+      'sourceAirportCode': 'LAX',
+      'sourceCountry': 'USA',
+      'destinyAirportCode': 'BOG',
+      'destinyCountry': 'CO',
+      'bagCost': 100,
+      'plannedStartDate': datetime.utcnow().isoformat(),
+      'plannedEndDate': (datetime.utcnow() + timedelta(days=2)).isoformat()
+    }
+    self.route = CreateRoute(self.data).execute()
+
+  def test_get_route_by_flight(self):
+    route = GetRouteByFlight(self.data['flightId']).execute()
+
+    assert route['id'] == self.route['id']
+    assert route['flightId'] == self.data['flightId']
+    assert route['sourceAirportCode'] == self.data['sourceAirportCode']
+    assert route['destinyAirportCode'] == self.data['destinyAirportCode']
+
+  def test_get_route_by_flight_doesnt_exist(self):
+    try:
+      GetRouteByFlight('B3').execute()
+
+      assert False
+    except RouteNotFoundError:
+      assert True
+
+  def teardown_method(self):
+    self.session.close()
+    Base.metadata.drop_all(bind=engine)
@@ -43,6 +43,27 @@ class TestGetRoutes():
     }).execute()
     assert len(routes) == 0
 
+  def test_get_routes_paginated(self):
+    for flight in ['A3', 'A4']:
+      CreateRoute({ **self.data, 'flightId': flight }).execute()
+
+    command = GetRoutes({ 'limit': '2' })
+    first_page = command.execute()
+    assert len(first_page) == 2
+    assert command.next_cursor != None
+
+    command = GetRoutes({ 'limit': '2', 'cursor': command.next_cursor })
+    second_page = command.execute()
+    assert len(second_page) == 1
+    assert command.next_cursor == None
+
+  def test_get_routes_invalid_limit(self):
+    try:
+      GetRoutes({ 'limit': 'invalid' })
+      assert False
+    except InvalidParams:
+      assert True
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
@@ -0,0 +1,69 @@
+from src.commands.search_routes import SearchRoutes
+from src.commands.create_route import CreateRoute
+from src.session import Session, engine
+from src.models.model import Base
+from src.errors.errors import IncompleteParams, InvalidParams
+from datetime import datetime, timedelta
+
+class TestSearchRoutes():
+  def setup_method(self):
+    Base.metadata.create_all(engine)
+    self.session = Session()
+
+    self.now = datetime.utcnow()
+    self.routes = []
+    for days, flight_id, destiny in [(3, 'A3', 'BOG'), (1, 'A1', 'BOG'), (2, 'A2', 'BOG'), (1, 'B1', 'MDE')]:
+      self.routes.append(CreateRoute({
+        'flightId': flight_id,
+        'sourceAirportCode': 'LAX',
+        'sourceCountry': 'USA',
+        'destinyAirportCode': destiny,
+        'destinyCountry': 'CO',
+        'bagCost': 100,
+        'plannedStartDate': (self.now + timedelta(days=days)).isoformat(),
+        'plannedEndDate': (self.now + timedelta(days=days + 1)).isoformat()
+      }).execute())
+
+  def test_search_routes(self):
+    routes = SearchRoutes({ 'from': 'LAX', 'to': 'BOG' }).execute()
+
+    assert [route['flightId'] for route in routes] == ['A1', 'A2', 'A3']
+
+  def test_search_routes_departure_window(self):
+    routes = SearchRoutes({
+      'from': 'LAX',
+      'to': 'BOG',
+      'startAfter': (self.now + timedelta(days=1, hours=12)).isoformat() + 'Z',
+      'startBefore': (self.now + timedelta(days=3)).isoformat()
+    }).execute()
+
+    assert [route['flightId'] for route in routes] == ['A2']
+
+  def test_search_routes_paginated(self):
+    command = SearchRoutes({ 'from': 'LAX', 'to': 'BOG', 'limit': '2' })
+    first_page = command.execute()
+    assert [route['flightId'] for route in first_page] == ['A1', 'A2']
+    assert command.next_cursor != None
+
+    command = SearchRoutes({ 'from': 'LAX', 'to': 'BOG', 'limit': '2', 'cursor': command.next_cursor })
+    second_page = command.execute()
+    assert [route['flightId'] for route in second_page] == ['A3']
+    assert command.next_cursor == None
+
+  def test_search_routes_missing_airports(self):
+    try:
+      SearchRoutes({ 'from': 'LAX' })
+      assert False
+    except IncompleteParams:
+      assert True
+
+  def test_search_routes_invalid_date(self):
+    try:
+      SearchRoutes({ 'from': 'LAX', 'to': 'BOG', 'startAfter': 'tomorrow' })
+      assert False
+    except InvalidParams:
+      assert True
+
+  def teardown_method(self):
+    self.session.close()
+    Base.metadata.drop_all(bind=engine)
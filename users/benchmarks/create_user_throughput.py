@@ -0,0 +1,113 @@
+"""
+Measures POST /users throughput against a local TrueNative stand-in with
+injected latency, comparing the outbox flow with a blocking call per user
+(the previous behaviour), and how long the dispatcher takes to drain it.
+
+Usage (from the users folder, with the DB_* variables pointing to a
+disposable database):
+
+    pipenv run python -m benchmarks.create_user_throughput --users 200 --latency 0.3
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+import argparse
+import json
+import os
+import threading
+import time
+
+
+def start_true_native(latency):
+    class TrueNativeHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency)
+            body = json.dumps({'RUV': str(uuid4()), 'createdAt': time.time()}).encode()
+            self.send_response(201)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TrueNativeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def create_users(count, concurrency, inline_dispatcher=None):
+    from src.commands.create_user import CreateUser
+
+    def create(i):
+        suffix = uuid4().hex
+        CreateUser({
+            'username': f'bench-{suffix}',
+            'email': f'bench-{suffix}@example.com',
+            'password': 'bench',
+            'dni': str(i),
+            'fullName': 'Bench User',
+            'phoneNumber': '3000000000'
+        }).execute()
+        if inline_dispatcher != None:
+            # Blocking delivery on the request path, like the previous implementation
+            inline_dispatcher.send({'userIdentifier': suffix})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(create, range(count)))
+    return time.perf_counter() - start
+
+
+def drain(dispatcher):
+    from src.models.verification_outbox import VerificationOutbox
+    from src.session import Session
+
+    start = time.perf_counter()
+    while True:
+        dispatcher.dispatch_batch()
+        session = Session()
+        pending = session.query(VerificationOutbox).filter_by(
+            status=VerificationOutbox.STATUS['PENDING']).count()
+        session.close()
+        if pending == 0:
+            return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--batch-size', type=int, default=20)
+    args = parser.parse_args()
+
+    server = start_true_native(args.latency)
+    os.environ['NATIVE_PATH'] = f'http://127.0.0.1:{server.server_port}'
+    os.environ.setdefault('SECRET_TOKEN', 'bench')
+    os.environ.setdefault('USERS_PATH', 'http://localhost:3000')
+
+    from src.commands.reset import Reset
+    from src.verification_dispatcher import VerificationDispatcher
+
+    dispatcher = VerificationDispatcher(
+        batch_size=args.batch_size, poll_interval=0.1, max_attempts=3, base_backoff=1, max_backoff=5)
+
+    Reset().execute()
+    inline = create_users(args.users, args.concurrency, inline_dispatcher=dispatcher)
+    Reset().execute()
+    outbox = create_users(args.users, args.concurrency)
+    drained = drain(dispatcher)
+    Reset().execute()
+    server.shutdown()
+
+    print(f'TrueNative latency: {args.latency * 1000:.0f} ms, users: {args.users}, concurrency: {args.concurrency}')
+    print(f'Blocking call per user: {args.users / inline:8.1f} users/s')
+    print(f'Outbox:                 {args.users / outbox:8.1f} users/s')
+    print(f'Outbox drained in:      {drained:8.2f} s ({args.users / drained:.1f} verifications/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Measures GET /users/me throughput served by the Flask development server
+(the previous entrypoint) and by gunicorn with the settings of
+gunicorn.conf.py, reporting requests per second and per core.
+
+Usage (from the users folder, with the DB_* variables pointing to a
+disposable database):
+
+    pipenv run python -m benchmarks.serving_throughput --workers 2 --threads 4 --requests 5000
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+
+def create_verified_user():
+    from src.models.model import Base
+    from src.models.user import User
+    from src.session import Session, engine
+
+    Base.metadata.create_all(engine)
+    session = Session()
+    user = User('bench', 'bench@example.com', '3000000000', '123', 'Bench User', 'bench')
+    user.status = User.STATUS['VERIFIED']
+    session.add(user)
+    session.commit()
+    token = str(user.token)
+    session.close()
+    return token
+
+
+def serve(command, env, port):
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            requests.get(f'http://127.0.0.1:{port}/users/ping', timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f'{command} did not start')
+
+
+def load(port, token, count, concurrency):
+    local = threading.local()
+    failures = []
+
+    def call(_):
+        if not hasattr(local, 'http'):
+            local.http = requests.Session()
+        try:
+            response = local.http.get(
+                f'http://127.0.0.1:{port}/users/me', headers={'Authorization': f'Bearer {token}'})
+        except requests.RequestException as e:
+            failures.append(e)
+            return
+        if response.status_code != 200:
+            failures.append(response.status_code)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(count)))
+    return time.perf_counter() - start, len(failures)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    from src.commands.reset import Reset
+    Reset().execute()
+    token = create_verified_user()
+
+    env = {**os.environ, 'ENV': 'test', 'FLASK_APP': './src/main.py'}
+    setups = [
+        ('flask run', 1, [sys.executable, '-m', 'flask', 'run', '--port=3101'], 3101),
+        (f'gunicorn {args.workers}x{args.threads}', args.workers, [
+            sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--bind', '127.0.0.1:3102',
+            '--workers', str(args.workers), '--threads', str(args.threads),
+            'src.main:app'
+        ], 3102)
+    ]
+
+    print(f'{args.requests} requests, {args.concurrency} concurrent clients, {os.cpu_count()} cores')
+    print(f'{"":>16} {"req/s":>8} {"req/s/core":>11} {"errors":>7}')
+    for name, processes, command, port in setups:
+        server = serve(command, env, port)
+        try:
+            load(port, token, args.concurrency * 10, args.concurrency)
+            elapsed, failures = load(port, token, args.requests, args.concurrency)
+        finally:
+            server.terminate()
+            server.wait()
+        # A single process can't use more than one core for Python code
+        cores = min(processes, os.cpu_count())
+        print(f'{name:>16} {args.requests / elapsed:>8.0f} {args.requests / elapsed / cores:>11.0f} {failures:>7}')
+
+    Reset().execute()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# Production server settings, every value can be overridden from the environment
+import multiprocessing
+import os
+
+bind = os.environ.get('WEB_BIND', '0.0.0.0:3000')
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Keep at most DB_POOL_SIZE + DB_MAX_OVERFLOW, a thread waiting on the pool holds its request
+threads = int(os.environ.get('WEB_THREADS', 4))
+# Import the app once in the master, the workers are forked with it already loaded
+preload_app = True
+# Recycle workers gracefully after a number of requests, the jitter keeps them from restarting together
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 100))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+accesslog = '-'
+
+# The password hashing pool, its admission bound and the token cache live in each worker process.
+# The defaults of a single process would be multiplied by the number of workers, so they are split here.
+cores = multiprocessing.cpu_count()
+# With a worker per core or more, bcrypt runs inline and the workers themselves spread it over the cores
+hashing_workers = int(os.environ.get('HASHING_WORKERS', cores // workers if workers < cores else 0))
+hashing_max_pending = int(os.environ.get('HASHING_MAX_PENDING', max(cores * 8 // workers, 1)))
+# A token cache invalidation only reaches the worker that served the update or login,
+# the others keep the stale user until the entry expires
+token_cache_ttl = int(os.environ.get('TOKEN_CACHE_TTL', 5))
+raw_env = [
+    'DISPATCHER_POST_FORK=true',
+    f'HASHING_WORKERS={hashing_workers}',
+    f'HASHING_MAX_PENDING={hashing_max_pending}',
+    f'TOKEN_CACHE_TTL={token_cache_ttl}'
+]
+
+
+def post_fork(server, worker):
+    from src.session import engine
+    from src.verification_dispatcher import verification_dispatcher
+    # Connections the master opened while preloading belong to it, each worker opens its own
+    engine.dispose(close=False)
+    # Threads don't survive the fork, SKIP LOCKED lets every worker run a dispatcher
+    verification_dispatcher.start()
+
+
+def worker_exit(server, worker):
+    from src.verification_dispatcher import verification_dispatcher
+    verification_dispatcher.stop()
@@ -2,9 +2,16 @@ from flask import Flask, jsonify, request, Blueprint
 from ..commands.create_user import CreateUser
 from ..commands.generate_token import GenerateToken
 from ..commands.get_user import GetUser
+from ..commands.get_users import GetUsers
 from ..commands.reset import Reset
 from ..commands.verify import VerifyUser
 from ..commands.update_user import UpdateUser
+from ..token_cache import token_cache
+from ..hashing import password_hasher
+from ..verification_dispatcher import verification_dispatcher
+from ..session import pool_stats
+from ..commands.get_revoked_tokens import GetRevokedTokens
+from ..service_token import check_service_token
 
 users_blueprint = Blueprint('users', __name__)
 
@@ -36,11 +43,33 @@ def show():
     return jsonify(user)
 
 
+@users_blueprint.route('/users/batch', methods=['POST'])
+def batch():
+    users = GetUsers(request.get_json(silent=True), auth_token()).execute()
+    return jsonify(users)
+
+
 @users_blueprint.route('/users/ping', methods=['GET'])
 def ping():
     return 'pong'
 
 
+@users_blueprint.route('/users/metrics', methods=['GET'])
+def metrics():
+    check_service_token(auth_token())
+    return jsonify({
+        'tokenCache': token_cache.stats(),
+        'passwordHashing': password_hasher.stats(),
+        'verificationOutbox': verification_dispatcher.stats(),
+        'dbPool': pool_stats()
+    })
+
+
+@users_blueprint.route('/users/tokens/revoked', methods=['GET'])
+def revoked_tokens():
+    return jsonify(GetRevokedTokens(auth_token()).execute())
+
+
 @users_blueprint.route('/users/reset', methods=['POST'])
 def reset():
     Reset().execute()
@@ -1,12 +1,15 @@
 import os
-
-import requests
+import uuid
 
 from .base_command import BaseCommannd
 from ..models.user import User, UserSchema, CreatedUserJsonSchema
+from ..models.verification_outbox import VerificationOutbox
 from ..session import Session
 from ..errors.errors import IncompleteParams, UserAlreadyExists
-from sqlalchemy import or_
+from sqlalchemy import or_, exists
+from sqlalchemy.exc import IntegrityError
+
+UNIQUE_VIOLATION = '23505'
 
 
 class CreateUser(BaseCommannd):
@@ -20,17 +23,26 @@ class CreateUser(BaseCommannd):
                       'dni', 'fullName', 'password')
             ).load(self.data)
             user = User(**posted_user)
+            user.id = uuid.uuid4()
             session = Session()
 
-            if self.username_exist(session, self.data['username']) or self.email_exist(session, self.data['email']):
+            if self.user_exist(session, self.data['username'], self.data['email']):
                 session.close()
                 raise UserAlreadyExists()
 
-            response = self.true_native_request(user)
-            user.RUV = response.RUV
-
+            # The TrueNative verification is delivered by the VerificationDispatcher
+            # once the user and its outbox message are committed together
             session.add(user)
-            session.commit()
+            session.add(VerificationOutbox(user.id, self.verification_request(user)))
+            try:
+                session.commit()
+            except IntegrityError as e:
+                session.rollback()
+                session.close()
+                # A concurrent signup took the username or email after the check
+                if getattr(e.orig, 'pgcode', None) == UNIQUE_VIOLATION:
+                    raise UserAlreadyExists()
+                raise
 
             new_user = CreatedUserJsonSchema().dump(user)
             session.close()
@@ -39,41 +51,23 @@ class CreateUser(BaseCommannd):
         except TypeError:
             raise IncompleteParams()
 
-    def username_exist(self, session, username):
-        return len(session.query(User).filter_by(username=username).all()) > 0
-
-    def email_exist(self, session, email):
-        return len(session.query(User).filter_by(email=email).all()) > 0
+    def user_exist(self, session, username, email):
+        return session.query(
+            exists().where(or_(User.username == username, User.email == email))
+        ).scalar()
 
-    def true_native_request(self, user):
-        secret_token = os.environ['SECRET_TOKEN']
-        native_Path = os.environ['NATIVE_PATH']
+    def verification_request(self, user):
         user_Path = os.environ['USERS_PATH']
-        transaction_identifier = user.id
-        user_webhook = user_Path+"/hook_users/"+user.id
+        user_webhook = user_Path + "/hook_users/" + str(user.id)
 
-        url = native_Path+"/native/verify"
-        headers = {
-            'Authorization': f'Bearer {secret_token}',
-            'Content-Type': 'application/json',
-        }
-        request_body = {
+        return {
             "user": {
                 "email": user.email,
                 "dni": user.dni,
                 "fullName": user.fullName,
                 "phone": user.phoneNumber
             },
-            "transactionIdentifier": transaction_identifier,
-            "userIdentifier": user.id,
+            "transactionIdentifier": str(user.id),
+            "userIdentifier": str(user.id),
             "userWebhook": user_webhook
         }
-        response = requests.post(url, headers=headers, json=request_body)
-
-        if response.status_code == 201:
-            return response.json()
-        else:
-            # Handle other response codes as needed
-            raise Exception("Unexpected response: " + response.text)
-
-
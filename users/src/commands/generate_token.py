@@ -1,8 +1,10 @@
 from .base_command import BaseCommannd
 from ..models.user import User, GeneratedTokenUserJsonSchema
+from ..models.revoked_token import RevokedToken
 from ..session import Session
 from ..errors.errors import Unauthorized, IncompleteParams, UserNotFoundError, UserNotVerifiedError
-import bcrypt
+from ..hashing import password_hasher
+from ..signed_token import signed_tokens
 
 
 class GenerateToken(BaseCommannd):
@@ -27,20 +29,24 @@ class GenerateToken(BaseCommannd):
             raise UserNotFoundError()
 
         if user.status == 'POR_VERIFICAR':
+            session.close()
             return UserNotVerifiedError()
         elif user.status == 'NO_VERIFICADO':
+            session.close()
             return Unauthorized()
 
+        if signed_tokens.enabled:
+            # The previous signed token stays valid offline until it expires unless it is denylisted
+            RevokedToken.revoke(session, user)
         user.set_token()
         session.commit()
 
-        user = GeneratedTokenUserJsonSchema().dump(user)
+        generated = GeneratedTokenUserJsonSchema().dump(user)
+        if signed_tokens.enabled:
+            generated['token'] = signed_tokens.issue(user.id, user.email, user.status, user.token, user.expireAt)
         session.close()
 
-        return user
+        return generated
 
     def valid_password(self, salt, password, other_password):
-        incoming_password = bcrypt.hashpw(
-            other_password.encode('utf-8'), salt.encode('utf-8')
-        ).decode()
-        return incoming_password == password
+        return password_hasher.matches(other_password, salt, password)
@@ -0,0 +1,19 @@
+from .base_command import BaseCommannd
+from ..models.revoked_token import RevokedToken
+from ..session import Session
+from ..service_token import check_service_token
+from ..signed_token import signed_tokens
+
+
+class GetRevokedTokens(BaseCommannd):
+    def __init__(self, token=None):
+        check_service_token(token)
+
+    def execute(self):
+        session = Session()
+        revoked = [
+            {'jti': signed_tokens.token_id(token.tokenId), 'exp': int(token.expireAt.timestamp())}
+            for token in RevokedToken.active(session)
+        ]
+        session.close()
+        return revoked
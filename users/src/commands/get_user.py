@@ -1,6 +1,8 @@
 from .base_command import BaseCommannd
 from ..models.user import User, UserJsonSchema
 from ..session import Session
+from ..token_cache import token_cache
+from ..signed_token import signed_tokens, InvalidSignedToken
 from ..errors.errors import Unauthorized, NotToken, UserNotVerifiedError
 from datetime import datetime
 
@@ -10,28 +12,58 @@ class GetUser(BaseCommannd):
         if token == None or token == "":
             raise NotToken()
         else:
+            self.claims = None
             self.token = self.parse_token(token)
 
     def execute(self):
+        if self.claims != None:
+            return self.signed_user()
+
+        cached_user = token_cache.get(self.token)
+        if cached_user != None:
+            return self.verified(cached_user)
+
         session = Session()
 
-        if len(session.query(User).filter_by(token=self.token).all()) <= 0:
+        user = session.query(User).filter_by(token=self.token).first()
+        if user == None or user.expireAt < datetime.now():
             session.close()
             raise Unauthorized()
 
-        user = session.query(User).filter_by(token=self.token).one()
-        if user.expireAt < datetime.now():
+        expire_at = user.expireAt
+        schema = UserJsonSchema()
+        user = schema.dump(user)
+        session.close()
+
+        token_cache.put(self.token, user, expire_at)
+        return self.verified(user)
+
+    def signed_user(self):
+        session = Session()
+        # Looked up by the user id it carries, it only matches the user's current token
+        user = session.query(User).filter_by(id=self.claims['sub']).first()
+        if user == None or user.token == None or user.expireAt < datetime.now() or \
+                signed_tokens.token_id(user.token) != self.claims['jti']:
             session.close()
             raise Unauthorized()
 
-        if user.status == 'TO_VERIFY' or user.status == 'NOT_VERIFIED':
-            return UserNotVerifiedError()
-
-        schema = UserJsonSchema()
-        user = schema.dump(user)
+        user = UserJsonSchema().dump(user)
         session.close()
+        return self.verified(user)
 
+    def verified(self, user):
+        if user['status'] == 'TO_VERIFY' or user['status'] == 'NOT_VERIFIED':
+            return UserNotVerifiedError()
         return user
 
     def parse_token(self, token):
-        return token.split(' ')[1]
+        token = token.split(' ')[1]
+        if not signed_tokens.is_signed(token):
+            return token
+        if not signed_tokens.enabled:
+            raise Unauthorized()
+        try:
+            self.claims = signed_tokens.claims(token)
+        except InvalidSignedToken:
+            raise Unauthorized()
+        return token
@@ -0,0 +1,40 @@
+from .base_command import BaseCommannd
+from ..models.user import User, UserJsonSchema
+from ..session import Session
+from ..errors.errors import IncompleteParams
+from ..service_token import check_service_token
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import load_only
+from uuid import UUID as UUIDValue
+import os
+
+
+class GetUsers(BaseCommannd):
+    """Looks up the public details of several users at once for other services"""
+
+    def __init__(self, data, token=None):
+        check_service_token(token)
+
+        max_ids = int(os.environ.get('USERS_BATCH_MAX_IDS', 100))
+        if not isinstance(data, dict) or not isinstance(data.get('ids'), list) or len(data['ids']) > max_ids:
+            raise IncompleteParams()
+        try:
+            self.ids = list(dict.fromkeys(UUIDValue(str(id)) for id in data['ids']))
+        except ValueError:
+            raise IncompleteParams()
+
+    def execute(self):
+        if len(self.ids) == 0:
+            return []
+
+        session = Session()
+        # One primary key lookup for the whole batch, ids that don't exist are left out
+        users = session.query(User).options(
+            load_only(User.username, User.email, User.fullName, User.dni, User.phoneNumber, User.status)
+        ).filter(
+            User.id == any_(bindparam('ids', self.ids, type_=ARRAY(UUID(as_uuid=True))))
+        ).all()
+        result = UserJsonSchema(many=True).dump(users)
+        session.close()
+        return result
@@ -1,9 +1,11 @@
 from .base_command import BaseCommannd
 from ..session import Session, engine
 from ..models.model import Base
+from ..token_cache import token_cache
 
 
 class Reset(BaseCommannd):
     def execute(self):
         Base.metadata.drop_all(bind=engine)
         Base.metadata.create_all(engine)
+        token_cache.clear()
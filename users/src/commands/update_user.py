@@ -1,6 +1,9 @@
 from .base_command import BaseCommannd
 from ..models.user import User
+from ..models.revoked_token import RevokedToken
 from ..session import Session
+from ..token_cache import token_cache
+from ..signed_token import signed_tokens
 from ..errors.errors import IncompleteParams, UserNotFoundError
 from sqlalchemy import or_
 
@@ -22,11 +25,17 @@ class UpdateUser(BaseCommannd):
             raise IncompleteParams()
 
         user = session.query(User).filter_by(id=self.id).one()
+        # Signed tokens carry the status, the current one must not outlive a status change.
+        # It is rotated as well so the users service stops accepting it too
+        if signed_tokens.enabled and 'status' in self.data:
+            RevokedToken.revoke(session, user)
+            user.set_token()
         for key, value in self.data.items():
             setattr(user, key, value)
 
         session.commit()
         session.close()
+        token_cache.invalidate_user(self.id)
         return {'msg': 'el usuario ha sido actualizado'}
 
     def user_exists(self, session, id):
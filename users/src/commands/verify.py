@@ -1,6 +1,9 @@
 from .base_command import BaseCommannd
 from ..models.user import User
+from ..models.revoked_token import RevokedToken
 from ..session import Session
+from ..token_cache import token_cache
+from ..signed_token import signed_tokens
 from ..errors.errors import IncompleteParams, UserNotFoundError, EmailSendError
 from datetime import datetime, timedelta
 from sqlalchemy import or_
@@ -22,6 +25,11 @@ class VerifyUser(BaseCommannd):
             raise UserNotFoundError()
 
         user = session.query(User).filter_by(id=self.user_id).one()
+        # Signed tokens carry the status, the current one must not outlive a status change.
+        # It is rotated as well so the users service stops accepting it too
+        if signed_tokens.enabled:
+            RevokedToken.revoke(session, user)
+            user.set_token()
 
         if self.data.get('score') > 60 and self.data.get('RUV') == user.RUV:
             user.status = 'VERIFICADO'
@@ -36,6 +44,7 @@ class VerifyUser(BaseCommannd):
 
         session.commit()
         session.close()
+        token_cache.invalidate_user(self.user_id)
 
     def user_exists(self, session, RUV):
         return len(session.query(User).filter_by(RUV=RUV).all()) > 0
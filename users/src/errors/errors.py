@@ -36,3 +36,8 @@ class UserNotVerifiedError(ApiError):
 class EmailSendError(ApiError):
     code = 500
     description = "Email send error"
+
+
+class ServiceOverloaded(ApiError):
+    code = 503
+    description = "Service is overloaded, please try again later"
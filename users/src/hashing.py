@@ -0,0 +1,86 @@
+from concurrent.futures import ProcessPoolExecutor
+from .errors.errors import ServiceOverloaded
+import threading
+import bcrypt
+import time
+import os
+
+
+def hash_password(password, salt):
+    return bcrypt.hashpw(password, salt)
+
+
+class PasswordHasher():
+    """
+    Runs bcrypt on a pool of worker processes so hashing does not hold the
+    request threads (or the GIL) of the Flask worker. At most `max_pending`
+    hashes may be queued or running at once, further requests are rejected
+    with ServiceOverloaded instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def hash(self, password):
+        salt = bcrypt.gensalt()
+        hashed = self.run(password.encode('utf-8'), salt)
+        return hashed.decode(), salt.decode()
+
+    def matches(self, password, salt, hashed):
+        incoming = self.run(password.encode('utf-8'), salt.encode('utf-8'))
+        return incoming.decode() == hashed
+
+    def run(self, password, salt):
+        with self.lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ServiceOverloaded()
+            self.pending += 1
+
+        start = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                return hash_password(password, salt)
+            return self.get_executor().submit(hash_password, password, salt).result()
+        finally:
+            latency = time.perf_counter() - start
+            with self.lock:
+                self.pending -= 1
+                self.completed += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+    def get_executor(self):
+        # Created lazily so every forked server worker gets its own pool
+        if self.executor == None:
+            with self.lock:
+                if self.executor == None:
+                    self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def stats(self):
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'queueDepth': self.pending,
+                'maxQueueDepth': self.max_pending,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avgLatencyMs': self.total_latency * 1000 / self.completed if self.completed > 0 else 0,
+                'maxLatencyMs': self.max_latency * 1000
+            }
+
+
+hashing_workers = int(os.environ.get('HASHING_WORKERS', os.cpu_count() or 1))
+password_hasher = PasswordHasher(
+    hashing_workers,
+    int(os.environ.get('HASHING_MAX_PENDING', max(hashing_workers, 1) * 8))
+)
@@ -1,22 +1,41 @@
 from dotenv import load_dotenv, find_dotenv
 loaded = load_dotenv('.env.development')
 
-from .errors.errors import ApiError
+from .errors.errors import ApiError, ServiceOverloaded
 from .blueprints.users import users_blueprint
-from .models.model import Base
-from .session import engine
+from .models.model import Base, create_indexes
+from .session import Session, engine
+from sqlalchemy import exc
+from .verification_dispatcher import verification_dispatcher
 from flask import Flask, jsonify
+import os
 
 
-app = Flask(__name__)
-app.register_blueprint(users_blueprint)
+def create_app():
+    app = Flask(__name__)
+    app.register_blueprint(users_blueprint)
+    Session.init_app(app)
+    app.register_error_handler(ApiError, handle_exception)
+    app.register_error_handler(exc.TimeoutError, handle_pool_timeout)
 
-Base.metadata.create_all(engine)
+    Base.metadata.create_all(engine)
+    create_indexes(engine)
+    return app
 
 
-@app.errorhandler(ApiError)
 def handle_exception(err):
     response = {
         "msg": err.description
     }
     return jsonify(response), err.code
+
+
+def handle_pool_timeout(err):
+    return handle_exception(ServiceOverloaded())
+
+
+app = create_app()
+
+# Under gunicorn the dispatcher thread is started in each worker after the fork, see gunicorn.conf.py
+if os.environ.get('ENV') != 'test' and os.environ.get('DISPATCHER_POST_FORK') != 'true':
+    verification_dispatcher.start()
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, Index, exists
+from .model import Model, Base
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class RevokedToken(Model, Base):
+    __tablename__ = 'revoked_tokens'
+    __table_args__ = (
+        Index('ix_revoked_tokens_tokenId', 'tokenId', unique=True),
+        Index('ix_revoked_tokens_expireAt', 'expireAt'),
+    )
+
+    tokenId = Column(UUID(as_uuid=True))
+    expireAt = Column(DateTime)
+
+    def __init__(self, tokenId, expireAt):
+        Model.__init__(self)
+        self.tokenId = tokenId
+        self.expireAt = expireAt
+
+    @classmethod
+    def revoke(cls, session, user):
+        # Only tokens that would still be accepted need to be listed, expired ones are pruned
+        now = datetime.now()
+        session.query(cls).filter(cls.expireAt < now).delete()
+        if user.token == None or user.expireAt == None or user.expireAt <= now:
+            return
+        if not session.query(exists().where(cls.tokenId == user.token)).scalar():
+            session.add(cls(user.token, user.expireAt))
+
+    @classmethod
+    def active(cls, session):
+        return session.query(cls).filter(cls.expireAt >= datetime.now()).all()
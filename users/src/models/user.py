@@ -1,13 +1,21 @@
 from marshmallow import Schema, fields
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index, text
 from .model import Model, Base
-import bcrypt
+from ..token_cache import token_cache
+from ..hashing import password_hasher
 from datetime import datetime, timedelta
 from uuid import uuid4
 
 
 class User(Model, Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_username', 'username', unique=True),
+        Index('ix_users_email', 'email', unique=True),
+        Index('ix_users_token', 'token', unique=True),
+        # RUV stays empty until TrueNative answers, only delivered ones must be unique
+        Index('ix_users_RUV', 'RUV', unique=True, postgresql_where=text('"RUV" <> \'\'')),
+    )
 
     STATUS = {
         'VERIFIED': 'VERIFICADO',
@@ -36,17 +44,14 @@ class User(Model, Base):
         self.dni = dni
         self.fullName = fullName
 
-        password = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-
-        self.password = bcrypt.hashpw(password, salt).decode()
-        self.salt = salt.decode()
+        self.password, self.salt = password_hasher.hash(password)
         self.status = User.STATUS['TO_VERIFY']
         self.set_token()
         self.last_updated = datetime.now()
         self.RUV = ""
 
     def set_token(self):
+        token_cache.invalidate(self.token)
         self.token = uuid4()
         self.expireAt = datetime.now() + timedelta(hours=1)
 
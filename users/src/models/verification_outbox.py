@@ -0,0 +1,33 @@
+from sqlalchemy import Column, String, DateTime, Integer, JSON, Index
+from .model import Model, Base
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class VerificationOutbox(Model, Base):
+    __tablename__ = 'verification_outbox'
+    __table_args__ = (
+        Index('ix_verification_outbox_status_nextAttemptAt', 'status', 'nextAttemptAt'),
+    )
+
+    STATUS = {
+        'PENDING': 'PENDING',
+        'SENT': 'SENT',
+        'FAILED': 'FAILED'
+    }
+
+    userId = Column(UUID(as_uuid=True))
+    payload = Column(JSON)
+    status = Column(String)
+    attempts = Column(Integer)
+    nextAttemptAt = Column(DateTime)
+    lastError = Column(String)
+
+    def __init__(self, userId, payload):
+        Model.__init__(self)
+        self.userId = userId
+        self.payload = payload
+        self.status = VerificationOutbox.STATUS['PENDING']
+        self.attempts = 0
+        self.nextAttemptAt = datetime.now()
+        self.lastError = None
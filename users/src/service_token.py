@@ -0,0 +1,13 @@
+from .errors.errors import NotToken, Unauthorized
+import hmac
+import os
+
+
+def check_service_token(token):
+    """Endpoints meant for other services only accept the bearer token in USERS_SERVICE_TOKEN"""
+    if token == None or token == "":
+        raise NotToken()
+    service_token = os.environ.get('USERS_SERVICE_TOKEN')
+    # Without a configured service token the endpoint stays closed
+    if not service_token or not hmac.compare_digest(token.split(' ')[-1], service_token):
+        raise Unauthorized()
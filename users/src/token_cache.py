@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import threading
+import os
+
+
+class TokenCache():
+    """
+    Bounded LRU cache of token -> serialized user used by GetUser. Entries
+    are dropped once the token expires, or after `ttl` seconds so that
+    changes made by other workers are eventually picked up.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = timedelta(seconds=ttl)
+        self.entries = OrderedDict()
+        self.tokens_by_user = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token):
+        with self.lock:
+            entry = self.entries.get(str(token))
+            if entry == None or entry[1] < datetime.now():
+                if entry != None:
+                    self.remove(str(token))
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(str(token))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token, user, expire_at):
+        if self.max_size <= 0:
+            return
+
+        with self.lock:
+            self.remove(str(token))
+            self.entries[str(token)] = (user, min(expire_at, datetime.now() + self.ttl))
+            self.tokens_by_user.setdefault(str(user['id']), set()).add(str(token))
+            while len(self.entries) > self.max_size:
+                self.remove(next(iter(self.entries)))
+
+    def invalidate(self, token):
+        if token == None:
+            return
+        with self.lock:
+            self.remove(str(token))
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for token in list(self.tokens_by_user.get(str(user_id), [])):
+                self.remove(token)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tokens_by_user.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self.entries),
+                'maxSize': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def remove(self, token):
+        # Caller must hold the lock
+        entry = self.entries.pop(token, None)
+        if entry == None:
+            return
+        user_id = str(entry[0]['id'])
+        tokens = self.tokens_by_user.get(user_id)
+        if tokens != None:
+            tokens.discard(token)
+            if len(tokens) == 0:
+                del self.tokens_by_user[user_id]
+
+
+token_cache = TokenCache(
+    int(os.environ.get('TOKEN_CACHE_SIZE', 10000)),
+    int(os.environ.get('TOKEN_CACHE_TTL', 60))
+)
@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from .models.user import User
+from .models.verification_outbox import VerificationOutbox
+from .session import Session
+import threading
+import requests
+import logging
+import os
+
+
+class VerificationDispatcher():
+    """
+    Delivers the TrueNative verification requests written to the
+    verification_outbox table by CreateUser. Each pass claims a batch of due
+    messages with FOR UPDATE SKIP LOCKED, so several server workers can run
+    a dispatcher without sending the same message twice. Failed deliveries
+    are retried with exponential backoff until max_attempts is reached.
+    """
+
+    def __init__(self, batch_size, poll_interval, max_attempts, base_backoff, max_backoff):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.http = requests.Session()
+        self.executor = ThreadPoolExecutor(max_workers=batch_size)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.sent = 0
+        self.retried = 0
+        self.failed_permanently = 0
+
+    def start(self):
+        if self.thread != None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread != None:
+            self.thread.join()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                dispatched = self.dispatch_batch()
+            except Exception as e:
+                logging.exception(f'Verification dispatcher error: {e}')
+                dispatched = 0
+
+            # Keep draining while there is backlog, otherwise wait for new messages
+            if dispatched < self.batch_size:
+                self.stop_event.wait(self.poll_interval)
+
+    def dispatch_batch(self):
+        session = Session()
+        try:
+            messages = session.query(VerificationOutbox).filter(
+                VerificationOutbox.status == VerificationOutbox.STATUS['PENDING'],
+                VerificationOutbox.nextAttemptAt <= datetime.now()
+            ).order_by(
+                VerificationOutbox.nextAttemptAt
+            ).limit(self.batch_size).with_for_update(skip_locked=True).all()
+
+            results = self.executor.map(self.send, [message.payload for message in messages])
+            for message, (ruv, error) in zip(messages, results):
+                if error == None:
+                    self.delivered(session, message, ruv)
+                else:
+                    self.failed(message, error)
+
+            session.commit()
+            return len(messages)
+        finally:
+            session.close()
+
+    def send(self, payload):
+        secret_token = os.environ['SECRET_TOKEN']
+        native_Path = os.environ['NATIVE_PATH']
+        headers = {
+            'Authorization': f'Bearer {secret_token}',
+            'Content-Type': 'application/json',
+        }
+        try:
+            response = self.http.post(
+                native_Path + "/native/verify",
+                headers=headers,
+                json=payload,
+                timeout=(2, 10)
+            )
+        except requests.RequestException as e:
+            return None, str(e)
+
+        if response.status_code == 201:
+            # A malformed body counts as a failed attempt, raising would roll back the deliveries of the whole batch
+            try:
+                return response.json()['RUV'], None
+            except (ValueError, KeyError, TypeError):
+                return None, f'Unexpected response body: {response.text}'
+        return None, f'Unexpected response {response.status_code}: {response.text}'
+
+    def delivered(self, session, message, ruv):
+        user = session.query(User).filter_by(id=message.userId).first()
+        if user != None:
+            user.RUV = ruv
+        message.status = VerificationOutbox.STATUS['SENT']
+        message.updatedAt = datetime.now()
+        self.sent += 1
+
+    def failed(self, message, error):
+        message.attempts += 1
+        message.lastError = error
+        message.updatedAt = datetime.now()
+        if message.attempts >= self.max_attempts:
+            message.status = VerificationOutbox.STATUS['FAILED']
+            self.failed_permanently += 1
+        else:
+            backoff = min(self.base_backoff * 2 ** (message.attempts - 1), self.max_backoff)
+            message.nextAttemptAt = datetime.now() + timedelta(seconds=backoff)
+            self.retried += 1
+
+    def stats(self):
+        return {
+            'running': self.thread != None and self.thread.is_alive(),
+            'sent': self.sent,
+            'retried': self.retried,
+            'failed': self.failed_permanently
+        }
+
+
+verification_dispatcher = VerificationDispatcher(
+    batch_size=int(os.environ.get('VERIFICATION_BATCH_SIZE', 20)),
+    poll_interval=float(os.environ.get('VERIFICATION_POLL_INTERVAL', 1)),
+    max_attempts=int(os.environ.get('VERIFICATION_MAX_ATTEMPTS', 8)),
+    base_backoff=float(os.environ.get('VERIFICATION_BASE_BACKOFF', 2)),
+    max_backoff=float(os.environ.get('VERIFICATION_MAX_BACKOFF', 300))
+)
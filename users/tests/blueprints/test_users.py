@@ -1,4 +1,4 @@
-from src.session import Session, engine
+from src.session import Session, MeteredQueuePool, PoolMetrics, engine
 from src.models.model import Base
 from src.models.user import User
 from src.main import app
@@ -6,6 +6,8 @@ from src.commands.create_user import CreateUser
 from src.commands.generate_token import GenerateToken
 import json
 from datetime import datetime, timedelta
+from sqlalchemy import create_engine, exc, text
+import pytest
 
 class TestUsers():
   def setup_method(self):
@@ -226,6 +228,43 @@ class TestUsers():
 
       assert response.status_code == 403
 
+  def test_get_users_batch(self, monkeypatch):
+    monkeypatch.setenv('USERS_SERVICE_TOKEN', 'service')
+    user = CreateUser({
+      'username': 'William',
+      'password': '123456',
+      'email': 'william@gmail.com',
+      "dni": "123456",
+      "fullName": "william",
+      "phoneNumber": "300000000"
+    }).execute()
+
+    with app.test_client() as test_client:
+      response = test_client.post(
+        '/users/batch', json={ 'ids': [user['id']] }, headers={ 'Authorization': 'Bearer service' }
+      )
+      assert response.status_code == 200
+      assert [found['id'] for found in response.json] == [user['id']]
+
+      response = test_client.post(
+        '/users/batch', json={ 'ids': [user['id']] }, headers={ 'Authorization': 'Bearer wrong' }
+      )
+      assert response.status_code == 401
+
+  def test_metrics(self, monkeypatch):
+    monkeypatch.setenv('USERS_SERVICE_TOKEN', 'service')
+
+    with app.test_client() as test_client:
+      response = test_client.get('/users/metrics', headers={ 'Authorization': 'Bearer service' })
+      assert response.status_code == 200
+      assert 'checkedOut' in response.json['dbPool']
+
+      response = test_client.get('/users/metrics')
+      assert response.status_code == 403
+
+      response = test_client.get('/users/metrics', headers={ 'Authorization': 'Bearer wrong' })
+      assert response.status_code == 401
+
   def test_ping(self):
     with app.test_client() as test_client:
       response = test_client.get(
@@ -242,6 +281,34 @@ class TestUsers():
       )
       assert response.status_code == 200
 
+  def test_request_closes_sessions_left_open(self):
+    with app.app_context():
+      session = Session()
+      session.execute(text('SELECT 1'))
+      assert session.in_transaction()
+
+    assert not session.in_transaction()
+
+  def test_exhausted_pool_counts_timeout(self, monkeypatch):
+    monkeypatch.setattr('src.session.pool_metrics', PoolMetrics())
+    exhausted = create_engine(engine.url, poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    with exhausted.connect():
+      with pytest.raises(exc.TimeoutError):
+        exhausted.connect()
+
+    from src import session
+    assert session.pool_metrics.stats(exhausted.pool)['timeouts'] == 1
+    exhausted.dispose()
+
+  def test_pool_timeout_answers_503(self, monkeypatch):
+    def exhausted_pool(self):
+      raise exc.TimeoutError()
+    monkeypatch.setattr('src.blueprints.users.Reset.execute', exhausted_pool)
+
+    with app.test_client() as test_client:
+      response = test_client.post('/users/reset')
+      assert response.status_code == 503
+
   def teardown_method(self):
     self.session.close()
     Base.metadata.drop_all(bind=engine)
\ No newline at end of file
@@ -1,9 +1,11 @@
 from src.commands.create_user import CreateUser
 from src.session import Session, engine
-from src.models.model import Base
+from src.models.model import Base, create_indexes
 from src.models.user import User
+from src.models.verification_outbox import VerificationOutbox
 from src.errors.errors import UserAlreadyExists
 from src.errors.errors import IncompleteParams
+from sqlalchemy import text
 
 class TestCreateUser():
   def setup_method(self):
@@ -73,6 +75,50 @@ class TestCreateUser():
       users = self.session.query(User).all()
       assert len(users) == 1
 
+  def test_create_existing_username_after_check(self, monkeypatch):
+    data = {
+        'username': 'william',
+        'email': 'william@gmail.com',
+        'password': '123456',
+        "dni": "123456",
+        "fullName": "william",
+        "phoneNumber": "300000000"
+    }
+    CreateUser(data).execute()
+    # A concurrent signup passing the existence check is stopped by the unique index
+    monkeypatch.setattr(CreateUser, 'user_exist', lambda self, session, username, email: False)
+    try:
+      CreateUser({**data, 'email': 'other_william@gmail.com'}).execute()
+
+      assert False
+    except UserAlreadyExists:
+      users = self.session.query(User).all()
+      assert len(users) == 1
+      assert self.session.query(VerificationOutbox).count() == 1
+
+  def test_create_existing_username_on_table_without_index(self, monkeypatch):
+    # Tables created before the unique indexes get them at startup
+    with engine.begin() as connection:
+      connection.execute(text('DROP INDEX "ix_users_username"'))
+    create_indexes(engine)
+
+    data = {
+        'username': 'william',
+        'email': 'william@gmail.com',
+        'password': '123456',
+        "dni": "123456",
+        "fullName": "william",
+        "phoneNumber": "300000000"
+    }
+    CreateUser(data).execute()
+    monkeypatch.setattr(CreateUser, 'user_exist', lambda self, session, username, email: False)
+    try:
+      CreateUser({**data, 'email': 'other_william@gmail.com'}).execute()
+
+      assert False
+    except UserAlreadyExists:
+      assert self.session.query(User).count() == 1
+
   def test_create_user(self):
     data = {
       'username': 'william',
@@ -89,6 +135,22 @@ class TestCreateUser():
 
     users = self.session.query(User).all()
     assert len(users) == 1
+
+  def test_create_user_enqueues_verification(self):
+    data = {
+      'username': 'william',
+      'email': 'william@gmail.com',
+      'password': '123456',
+      "dni": "123456",
+      "fullName": "william",
+      "phoneNumber": "300000000"
+    }
+    user = CreateUser(data).execute()
+
+    message = self.session.query(VerificationOutbox).one()
+    assert str(message.userId) == user['id']
+    assert message.status == VerificationOutbox.STATUS['PENDING']
+    assert message.payload['userIdentifier'] == user['id']
   
   def teardown_method(self):
     self.session.close()
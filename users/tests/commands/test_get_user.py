@@ -2,6 +2,7 @@ from src.commands.get_user import GetUser
 from src.commands.create_user import CreateUser
 from src.commands.generate_token import GenerateToken
 from src.session import Session, engine
+from src.token_cache import token_cache
 from src.models.model import Base
 from src.models.user import User
 from src.errors.errors import Unauthorized, NotToken
@@ -38,6 +39,37 @@ class TestGetUser():
     assert 'status' in user
 
 
+  def test_get_user_is_cached(self):
+    token = self.verified_user_token()
+    GetUser(f'Bearer {token}').execute()
+    hits = token_cache.stats()['hits']
+
+    user = GetUser(f'Bearer {token}').execute()
+
+    assert 'id' in user
+    assert token_cache.stats()['hits'] == hits + 1
+
+  def test_get_user_after_new_token(self):
+    token = self.verified_user_token()
+    GetUser(f'Bearer {token}').execute()
+
+    user = self.session.query(User).filter_by(token=token).one()
+    user.set_token()
+    self.session.commit()
+
+    try:
+      GetUser(f'Bearer {token}').execute()
+      assert False
+    except Unauthorized:
+      assert True
+
+  def verified_user_token(self):
+    user = User('cached', 'cached@gmail.com', '300000000', '654321', 'cached', '123456')
+    user.status = User.STATUS['VERIFIED']
+    self.session.add(user)
+    self.session.commit()
+    return str(user.token)
+
   def test_get_user_with_expired_token(self):
     queried_user = self.session.query(User).filter_by(id=self.user['id']).one()
     queried_user.expireAt = datetime.now() - timedelta(hours=1)
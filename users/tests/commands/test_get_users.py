@@ -0,0 +1,70 @@
+from src.commands.get_users import GetUsers
+from src.commands.create_user import CreateUser
+from src.session import Session, engine
+from src.models.model import Base
+from src.errors.errors import IncompleteParams, Unauthorized, NotToken
+from uuid import uuid4
+import pytest
+
+class TestGetUsers():
+  def setup_method(self):
+    Base.metadata.create_all(engine)
+    self.session = Session()
+
+    self.users = [
+      CreateUser({
+        'username': f'william{i}',
+        'email': f'william{i}@gmail.com',
+        'password': '123456',
+        "dni": "123456",
+        "fullName": "william",
+        "phoneNumber": "300000000"
+      }).execute()
+      for i in range(3)
+    ]
+
+  @pytest.fixture(autouse=True)
+  def service_token(self, monkeypatch):
+    monkeypatch.setenv('USERS_SERVICE_TOKEN', 'service')
+
+  def test_get_users(self):
+    ids = [self.users[0]['id'], self.users[2]['id'], str(uuid4())]
+    users = GetUsers({ 'ids': ids }, 'Bearer service').execute()
+
+    assert sorted(user['id'] for user in users) == sorted([self.users[0]['id'], self.users[2]['id']])
+    assert all('email' in user and 'password' not in user and 'token' not in user for user in users)
+
+  def test_get_users_repeated_ids(self):
+    ids = [self.users[0]['id'], self.users[0]['id']]
+    users = GetUsers({ 'ids': ids }, 'Bearer service').execute()
+
+    assert len(users) == 1
+
+  def test_get_users_empty(self):
+    assert GetUsers({ 'ids': [] }, 'Bearer service').execute() == []
+
+  def test_get_users_invalid_ids(self):
+    with pytest.raises(IncompleteParams):
+      GetUsers({ 'ids': ['not-an-id'] }, 'Bearer service')
+    with pytest.raises(IncompleteParams):
+      GetUsers({ 'ids': self.users[0]['id'] }, 'Bearer service')
+
+  def test_get_users_too_many_ids(self, monkeypatch):
+    monkeypatch.setenv('USERS_BATCH_MAX_IDS', '2')
+    with pytest.raises(IncompleteParams):
+      GetUsers({ 'ids': [user['id'] for user in self.users] }, 'Bearer service')
+
+  def test_get_users_wrong_service_token(self):
+    with pytest.raises(Unauthorized):
+      GetUsers({ 'ids': [] }, 'Bearer wrong')
+    with pytest.raises(NotToken):
+      GetUsers({ 'ids': [] })
+
+  def test_get_users_without_configured_service_token(self, monkeypatch):
+    monkeypatch.delenv('USERS_SERVICE_TOKEN')
+    with pytest.raises(Unauthorized):
+      GetUsers({ 'ids': [] }, 'Bearer ')
+
+  def teardown_method(self):
+    self.session.close()
+    Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,26 @@
+from src.hashing import PasswordHasher
+from src.errors.errors import ServiceOverloaded
+
+class TestPasswordHasher():
+  def test_hash_and_match(self):
+    hasher = PasswordHasher(1, 2)
+    hashed, salt = hasher.hash('123456')
+
+    assert hasher.matches('123456', salt, hashed)
+    assert not hasher.matches('654321', salt, hashed)
+    assert hasher.stats()['completed'] == 3
+    assert hasher.stats()['queueDepth'] == 0
+
+  def test_hash_inline(self):
+    hasher = PasswordHasher(0, 1)
+    hashed, salt = hasher.hash('123456')
+
+    assert hasher.matches('123456', salt, hashed)
+
+  def test_hash_overloaded(self):
+    hasher = PasswordHasher(1, 0)
+    try:
+      hasher.hash('123456')
+      assert False
+    except ServiceOverloaded:
+      assert hasher.stats()['rejected'] == 1
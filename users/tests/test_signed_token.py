@@ -0,0 +1,153 @@
+from src.session import Session, engine
+from src.models.model import Base
+from src.models.user import User
+from src.main import app
+from src.commands.create_user import CreateUser
+from src.commands.generate_token import GenerateToken
+from src.commands.update_user import UpdateUser
+from src.signed_token import SignedTokens, InvalidSignedToken, signed_tokens
+from datetime import datetime, timedelta
+from uuid import uuid4
+import pytest
+
+class TestSignedTokens():
+  def setup_method(self):
+    self.tokens = SignedTokens('secret', 30, 120)
+    self.user_id = uuid4()
+    self.token_id = uuid4()
+
+  def issue(self, status='VERIFICADO', expire_at=None):
+    expire_at = expire_at or datetime.now() + timedelta(hours=1)
+    return self.tokens.issue(self.user_id, 'william@gmail.com', status, self.token_id, expire_at)
+
+  def test_verify_token(self):
+    user = self.tokens.verify(self.issue())
+
+    assert user['id'] == str(self.user_id)
+    assert user['email'] == 'william@gmail.com'
+    assert user['status'] == 'VERIFICADO'
+    assert self.tokens.stats()['verified'] == 1
+
+  def test_verify_tampered_token(self):
+    version, payload, signature = self.issue().split('.')
+    forged = SignedTokens('other', 30, 120).issue(uuid4(), 'mallory@gmail.com', 'VERIFICADO', uuid4(), datetime.now() + timedelta(hours=1))
+
+    with pytest.raises(InvalidSignedToken):
+      self.tokens.verify(f'{version}.{forged.split(".")[1]}.{signature}')
+    with pytest.raises(InvalidSignedToken):
+      self.tokens.verify(forged)
+    assert self.tokens.stats()['rejected'] == 2
+
+  def test_verify_expired_token(self):
+    with pytest.raises(InvalidSignedToken):
+      self.tokens.verify(self.issue(expire_at=datetime.now() - timedelta(seconds=1)))
+
+  def test_verify_revoked_token(self):
+    self.tokens.revoked = { self.tokens.token_id(self.token_id): int((datetime.now() + timedelta(hours=1)).timestamp()) }
+
+    with pytest.raises(InvalidSignedToken):
+      self.tokens.verify(self.issue())
+
+  def test_verify_unverified_user(self):
+    with pytest.raises(InvalidSignedToken):
+      self.tokens.verify(self.issue(status='POR_VERIFICAR'))
+
+  def test_applies_only_with_fresh_denylist(self):
+    token = self.issue()
+    self.tokens.start = lambda: None
+
+    assert self.tokens.applies('7b1f1a34-0c3a-4e0e-9a3f-6f1c5d1b2a11') == False
+    assert self.tokens.applies(token) == False
+    self.tokens.refreshed_at = 0
+    assert self.tokens.applies(token) == False
+
+  def test_disabled_without_key(self):
+    tokens = SignedTokens(None, 30, 120)
+
+    assert tokens.enabled == False
+    assert tokens.applies(self.issue()) == False
+
+class TestSignedTokenEndpoints():
+  @pytest.fixture(autouse=True)
+  def service_token(self, monkeypatch):
+    monkeypatch.setenv('USERS_SERVICE_TOKEN', 'service')
+
+  def setup_method(self):
+    Base.metadata.create_all(engine)
+    self.session = Session()
+    self.data = {
+      'username': 'William',
+      'password': '123456',
+      'email': 'william@gmail.com',
+      "dni": "123456",
+      "fullName": "william",
+      "phoneNumber": "300000000"
+    }
+    user = CreateUser(self.data).execute()
+    db_user = self.session.query(User).filter_by(id=user['id']).one()
+    db_user.status = 'VERIFICADO'
+    self.session.commit()
+
+  def test_generate_signed_token(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+
+    token = GenerateToken(self.data).execute()['token']
+
+    assert signed_tokens.is_signed(token)
+    with app.test_client() as test_client:
+      response = test_client.get('/users/me', headers={ 'Authorization': f'Bearer {token}' })
+      assert response.status_code == 200
+      assert response.json['email'] == 'william@gmail.com'
+
+  def test_new_token_revokes_previous(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+
+    first = GenerateToken(self.data).execute()['token']
+    GenerateToken(self.data).execute()
+
+    with app.test_client() as test_client:
+      response = test_client.get('/users/me', headers={ 'Authorization': f'Bearer {first}' })
+      assert response.status_code == 401
+
+      response = test_client.get('/users/tokens/revoked', headers={ 'Authorization': 'Bearer service' })
+      assert response.status_code == 200
+      assert signed_tokens.claims(first)['jti'] in [entry['jti'] for entry in response.json]
+
+  def test_revoked_tokens_need_service_token(self):
+    with app.test_client() as test_client:
+      response = test_client.get('/users/tokens/revoked')
+      assert response.status_code == 403
+
+      response = test_client.get('/users/tokens/revoked', headers={ 'Authorization': 'Bearer wrong' })
+      assert response.status_code == 401
+
+  def test_token_id_is_not_an_opaque_token(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+    token = GenerateToken(self.data).execute()['token']
+
+    with app.test_client() as test_client:
+      response = test_client.get('/users/me', headers={ 'Authorization': f'Bearer {signed_tokens.claims(token)["jti"]}' })
+      assert response.status_code == 401
+
+  def test_status_change_rotates_token(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+    generated = GenerateToken(self.data).execute()
+
+    UpdateUser(generated['id'], { 'status': 'NO_VERIFICADO' }).execute()
+
+    with app.test_client() as test_client:
+      response = test_client.get('/users/me', headers={ 'Authorization': f'Bearer {generated["token"]}' })
+      assert response.status_code == 401
+
+  def test_signed_token_rejected_when_disabled(self, monkeypatch):
+    monkeypatch.setattr(signed_tokens, 'key', b'secret')
+    token = GenerateToken(self.data).execute()['token']
+    monkeypatch.setattr(signed_tokens, 'key', None)
+
+    with app.test_client() as test_client:
+      response = test_client.get('/users/me', headers={ 'Authorization': f'Bearer {token}' })
+      assert response.status_code == 401
+
+  def teardown_method(self):
+    self.session.close()
+    Base.metadata.drop_all(bind=engine)
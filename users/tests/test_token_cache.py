@@ -0,0 +1,45 @@
+from src.token_cache import TokenCache
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+class TestTokenCache():
+  def setup_method(self):
+    self.cache = TokenCache(2, 60)
+    self.user = { 'id': str(uuid4()), 'status': 'VERIFICADO' }
+
+  def test_get_missing_token(self):
+    assert self.cache.get('missing') == None
+    assert self.cache.stats()['misses'] == 1
+
+  def test_get_cached_token(self):
+    self.cache.put('token', self.user, datetime.now() + timedelta(hours=1))
+
+    assert self.cache.get('token') == self.user
+    assert self.cache.stats()['hits'] == 1
+
+  def test_get_expired_token(self):
+    self.cache.put('token', self.user, datetime.now() - timedelta(seconds=1))
+
+    assert self.cache.get('token') == None
+    assert self.cache.stats()['size'] == 0
+
+  def test_evicts_least_recently_used(self):
+    expire_at = datetime.now() + timedelta(hours=1)
+    self.cache.put('first', self.user, expire_at)
+    self.cache.put('second', self.user, expire_at)
+    self.cache.get('first')
+    self.cache.put('third', self.user, expire_at)
+
+    assert self.cache.get('second') == None
+    assert self.cache.get('first') == self.user
+    assert self.cache.get('third') == self.user
+
+  def test_invalidate_user(self):
+    expire_at = datetime.now() + timedelta(hours=1)
+    other_user = { 'id': str(uuid4()), 'status': 'VERIFICADO' }
+    self.cache.put('first', self.user, expire_at)
+    self.cache.put('second', other_user, expire_at)
+    self.cache.invalidate_user(self.user['id'])
+
+    assert self.cache.get('first') == None
+    assert self.cache.get('second') == other_user
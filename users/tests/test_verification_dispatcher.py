@@ -0,0 +1,77 @@
+from src.verification_dispatcher import VerificationDispatcher
+from src.session import Session, engine
+from src.models.model import Base
+from src.models.user import User
+from src.models.verification_outbox import VerificationOutbox
+from httmock import HTTMock, all_requests, response
+from datetime import datetime
+import os
+import uuid
+
+@all_requests
+def mock_success_verify(url, request):
+  return response(201, { 'RUV': 'RUV-1234' }, {}, None, 5, request)
+
+@all_requests
+def mock_failed_verify(url, request):
+  return response(500, { 'msg': 'error' }, {}, None, 5, request)
+
+@all_requests
+def mock_malformed_verify(url, request):
+  return response(201, { 'msg': 'ok' }, {}, None, 5, request)
+
+class TestVerificationDispatcher():
+  def setup_method(self):
+    Base.metadata.create_all(engine)
+    self.session = Session()
+    os.environ.setdefault('NATIVE_PATH', 'http://localhost:3010')
+    os.environ.setdefault('SECRET_TOKEN', 'secret')
+    self.dispatcher = VerificationDispatcher(
+      batch_size=5, poll_interval=1, max_attempts=2, base_backoff=0, max_backoff=0
+    )
+
+    user = User('william', 'william@gmail.com', '300000000', '123456', 'william', '123456')
+    user.id = uuid.uuid4()
+    self.session.add(user)
+    self.session.add(VerificationOutbox(user.id, { 'userIdentifier': str(user.id) }))
+    self.session.commit()
+    self.user_id = user.id
+
+  def test_dispatch_success(self):
+    with HTTMock(mock_success_verify):
+      assert self.dispatcher.dispatch_batch() == 1
+
+    self.session.expire_all()
+    message = self.session.query(VerificationOutbox).filter_by(userId=self.user_id).one()
+    user = self.session.query(User).filter_by(id=self.user_id).one()
+    assert message.status == VerificationOutbox.STATUS['SENT']
+    assert user.RUV == 'RUV-1234'
+    assert self.dispatcher.stats()['sent'] == 1
+
+  def test_dispatch_retries_then_fails(self):
+    with HTTMock(mock_failed_verify):
+      assert self.dispatcher.dispatch_batch() == 1
+      self.session.expire_all()
+      message = self.session.query(VerificationOutbox).filter_by(userId=self.user_id).one()
+      assert message.status == VerificationOutbox.STATUS['PENDING']
+      assert message.attempts == 1
+
+      assert self.dispatcher.dispatch_batch() == 1
+      self.session.expire_all()
+      message = self.session.query(VerificationOutbox).filter_by(userId=self.user_id).one()
+      assert message.status == VerificationOutbox.STATUS['FAILED']
+
+    assert self.dispatcher.dispatch_batch() == 0
+
+  def test_dispatch_malformed_response_counts_attempt(self):
+    with HTTMock(mock_malformed_verify):
+      assert self.dispatcher.dispatch_batch() == 1
+
+    self.session.expire_all()
+    message = self.session.query(VerificationOutbox).filter_by(userId=self.user_id).one()
+    assert message.status == VerificationOutbox.STATUS['PENDING']
+    assert message.attempts == 1
+
+  def teardown_method(self):
+    self.session.close()
+    Base.metadata.drop_all(bind=engine)
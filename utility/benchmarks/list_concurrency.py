@@ -0,0 +1,188 @@
+"""
+Measures /utility/list throughput under many concurrent requests, comparing the async service (asyncpg
+engine, async handlers) with the previous synchronous one (psycopg2 engine, sync handlers on the thread pool
+and a blocking call to the users service), each served by uvicorn against a local users stand-in.
+
+Usage (from the utility folder, with the DB_* variables pointing to a disposable database):
+
+    pipenv run python -m benchmarks.list_concurrency --concurrency 500 --requests 5000 --ids 50 --auth-latency 0.02
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+import httpx
+import requests
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import UUID4
+from sqlalchemy import create_engine, delete, make_url, select, any_
+from sqlalchemy.orm import sessionmaker
+
+from src.constants import USERS_PATH
+from src.database import SQLALCHEMY_DATABASE_URL
+from src.models import Utility
+from src.utility.utils import UTILITY_COLUMNS, uuid_array
+
+sync_engine = create_engine(make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql"), pool_size=20,
+                            max_overflow=10)
+SyncSession = sessionmaker(bind=sync_engine)
+
+# The previous implementation, kept here as the baseline
+sync_app = FastAPI()
+
+
+@sync_app.post("/utility/list")
+def sync_list(offer_ids: List[UUID4], request: Request) -> StreamingResponse:
+    response = requests.get(USERS_PATH.rstrip('/') + "/users/me",
+                            headers={"Authorization": request.headers.get("Authorization", "")})
+    if response.status_code != 200:
+        raise HTTPException(status_code=401)
+
+    def stream():
+        sess = SyncSession()
+        try:
+            rows = sess.execute(
+                select(*UTILITY_COLUMNS)
+                .where(Utility.offer_id == any_(uuid_array("offer_ids", offer_ids)))
+                .order_by(Utility.utility.desc(), Utility.offer_id)
+            )
+            yield json.dumps([{
+                "offer_id": str(row.offer_id),
+                "post_id": str(row.post_id) if row.post_id else None,
+                "utility": row.utility,
+                "createdAt": row.createdAt.isoformat(),
+                "updateAt": row.updateAt.isoformat()
+            } for row in rows])
+        finally:
+            sess.close()
+
+    return StreamingResponse(stream(), media_type="application/json")
+
+
+def start_users_stub(latency: float):
+    class UsersHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = json.dumps({"id": str(uuid.uuid4())}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), UsersHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def seed(rows: int) -> list[uuid.UUID]:
+    with SyncSession() as sess:
+        sess.execute(delete(Utility))
+        now = datetime.now()
+        offer_ids = [uuid.uuid4() for _ in range(rows)]
+        sess.execute(Utility.__table__.insert(), [
+            {"offer_id": offer_id, "utility": float(i), "createdAt": now, "updateAt": now}
+            for i, offer_id in enumerate(offer_ids)
+        ])
+        sess.commit()
+    return offer_ids
+
+
+def serve(app: str, port: int, users_path: str) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning", "--backlog", "2048"],
+        env={**os.environ, "USERS_PATH": users_path}
+    )
+    for _ in range(100):
+        try:
+            httpx.post(f"http://127.0.0.1:{port}/utility/list", json=[], headers={"Authorization": "Bearer bench"})
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f"{app} did not start")
+
+
+async def load(port: int, bodies: list, concurrency: int) -> tuple[float, list[float], int]:
+    latencies = []
+    failures = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        async def one(body):
+            nonlocal failures
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/utility/list", json=body,
+                                                 headers={"Authorization": "Bearer bench"})
+                    if response.status_code != 200:
+                        failures += 1
+                except httpx.HTTPError:
+                    failures += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(body) for body in bodies))
+        return time.perf_counter() - start, latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--ids", type=int, default=50, help="offer ids per request")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--auth-latency", type=float, default=0.02, help="seconds the users service takes to answer")
+    args = parser.parse_args()
+
+    offer_ids = seed(args.rows)
+    bodies = [
+        [str(offer_ids[(i * args.ids + j) % len(offer_ids)]) for j in range(args.ids)]
+        for i in range(args.requests)
+    ]
+    users = start_users_stub(args.auth_latency)
+    users_path = f"http://127.0.0.1:{users.server_address[1]}"
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent, {args.ids} ids each, "
+          f"{args.auth_latency * 1000:.0f} ms users latency")
+    print(f"{'':>6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, app, port in [("sync", "benchmarks.list_concurrency:sync_app", 8101), ("async", "src.main:app", 8102)]:
+        server = serve(app, port, users_path)
+        try:
+            # Warm up the connection pools before measuring
+            asyncio.run(load(port, bodies[:args.concurrency], args.concurrency))
+            elapsed, latencies, failures = asyncio.run(load(port, bodies, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"{name:>6} {len(bodies) / elapsed:>8.0f} {quantiles[49] * 1000:>8.1f} {quantiles[98] * 1000:>8.1f} "
+              f"{failures:>7}")
+
+    users.shutdown()
+    with SyncSession() as sess:
+        sess.execute(delete(Utility))
+        sess.commit()
+
+
+if __name__ == "__main__":
+    main()
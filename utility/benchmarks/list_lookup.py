@@ -0,0 +1,100 @@
+"""
+Measures /utility/list lookups for growing offer-id sets, comparing the previous IN list with the bound array
+and the temporary table join that Utilities.iter_utilities switches between.
+
+Usage (from the utility folder, with the DB_* variables pointing to a disposable database):
+
+    pipenv run python -m benchmarks.list_lookup --sizes 10 100 1000 10000 100000 --rows 200000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, delete, make_url, select
+from sqlalchemy.orm import sessionmaker
+
+from src.database import SQLALCHEMY_DATABASE_URL
+from src.models import Utility
+from src.schemas import UtilitySchema
+from src.utility import utils
+from src.utility.utils import Utilities
+
+SyncSession = sessionmaker(bind=create_engine(make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql")))
+# The async engine's pooled connections belong to the loop that opened them, so every run shares one
+loop = asyncio.new_event_loop()
+
+
+def seed(rows: int) -> list[uuid.UUID]:
+    sess = SyncSession()
+    sess.execute(delete(Utility))
+    now = datetime.now()
+    offer_ids = [uuid.uuid4() for _ in range(rows)]
+    for start in range(0, rows, 10000):
+        sess.execute(Utility.__table__.insert(), [
+            {"offer_id": offer_id, "utility": float(i), "createdAt": now, "updateAt": now}
+            for i, offer_id in enumerate(offer_ids[start:start + 10000], start)
+        ])
+    sess.commit()
+    sess.close()
+    return offer_ids
+
+
+def in_list(offer_ids: list[uuid.UUID]) -> int:
+    """The previous implementation, one bound parameter per id and the whole list built before answering"""
+    sess = SyncSession()
+    try:
+        utilities = [
+            UtilitySchema.model_validate(util) for util in sess.execute(
+                select(Utility).where(Utility.offer_id.in_(offer_ids)).order_by(Utility.utility.desc())
+            ).scalars().all()
+        ]
+        return len(TypeAdapter(list[UtilitySchema]).dump_json(utilities))
+    finally:
+        sess.close()
+
+
+def streamed(offer_ids: list[uuid.UUID], threshold: int) -> int:
+    utils.LIST_TEMP_TABLE_THRESHOLD = threshold
+
+    async def consume():
+        return sum([len(piece) async for piece in await Utilities.stream_utilities(offer_ids)])
+    return loop.run_until_complete(consume())
+
+
+def timed(fn, *args, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    offer_ids = seed(max(args.rows, max(args.sizes)))
+    print(f"{'ids':>8} {'IN list':>10} {'ANY array':>10} {'temp table':>11}   (best of {args.repeat}, ms)")
+    for size in args.sizes:
+        # Half of the requested ids exist, like a post whose offers were partly deleted
+        requested = offer_ids[:size // 2] + [uuid.uuid4() for _ in range(size - size // 2)]
+        print(f"{size:>8} "
+              f"{timed(in_list, requested, repeat=args.repeat):>10.1f} "
+              f"{timed(streamed, requested, size, repeat=args.repeat):>10.1f} "
+              f"{timed(streamed, requested, 0, repeat=args.repeat):>11.1f}")
+
+    sess = SyncSession()
+    sess.execute(delete(Utility))
+    sess.commit()
+    sess.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,27 @@
 """ General configuration set-up file """
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI
+
+from src.constants import HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_TIMEOUT_SECONDS
+from src import models
+from src.database import engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(models.create_schema)
+    # Calls to the users, posts and offers services share this client, so connections are pooled and kept alive
+    app.requests_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=HTTP_TIMEOUT_SECONDS
+    )
+    yield
+    await app.requests_client.aclose()
+    # Pooled asyncpg connections belong to this event loop
+    await engine.dispose()
@@ -14,7 +14,27 @@ DB_PASSWORD = os.environ.get("DB_PASSWORD", "password")
 DB_HOST = os.environ.get("DB_HOST", "0.0.0.0")
 DB_PORT = os.environ.get("DB_PORT", "13001")
 DB_NAME = os.environ.get("DB_NAME", "db")
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
 USERS_PATH = os.environ.get("USERS_PATH", "http://localhost:3000")
+# Shared with the users service, enables offline verification of signed access tokens when set
+TOKEN_SIGNING_KEY = os.environ.get("TOKEN_SIGNING_KEY")
+TOKEN_DENYLIST_REFRESH_SECONDS = float(os.environ.get("TOKEN_DENYLIST_REFRESH_SECONDS", 30))
+TOKEN_DENYLIST_MAX_STALENESS = float(os.environ.get("TOKEN_DENYLIST_MAX_STALENESS", 120))
+USERS_SERVICE_TOKEN = os.environ.get("USERS_SERVICE_TOKEN")
+POSTS_PATH = os.environ.get("POSTS_PATH", "http://localhost:3002")
+OFFERS_PATH = os.environ.get("OFFERS_PATH", "http://localhost:3003")
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 10000))
+# Above this many offer ids, /utility/list joins against a temporary table instead of binding an array
+LIST_TEMP_TABLE_THRESHOLD = int(os.environ.get("LIST_TEMP_TABLE_THRESHOLD", 100000))
+TOP_K_DEFAULT = int(os.environ.get("TOP_K_DEFAULT", 10))
+TOP_K_MAX = int(os.environ.get("TOP_K_MAX", 100))
+LIST_STREAM_CHUNK_SIZE = int(os.environ.get("LIST_STREAM_CHUNK_SIZE", 1000))
+RECOMPUTE_CHUNK_SIZE = int(os.environ.get("RECOMPUTE_CHUNK_SIZE", 1000))
+RECOMPUTE_JOBS_KEPT = int(os.environ.get("RECOMPUTE_JOBS_KEPT", 100))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 200))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 50))
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 10))
 
 
 def datetime_to_str(date: datetime) -> str:
@@ -9,9 +9,17 @@ class UtilityNotFoundException(Exception):
     """The requested utility was not found"""
 
 
+class BatchTooLargeException(Exception):
+    """The batch holds more utilities than a single request may carry"""
+
+
 class InvalidRequestException(Exception):
     """The request body was empty or otherwise invalid"""
 
 
 class UnauthorizedUserException(Exception):
     """The provided credentials were valid, but were rejected due to lack of authorization or expiration"""
+
+
+class DatabaseUnavailableException(Exception):
+    """The database could not be reached, or did not answer in time"""
@@ -4,13 +4,10 @@ from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
-from src import models
-from src.database import engine
+from src.config import lifespan
 from src.utility.router import router as utility_router
 
-models.Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(utility_router, prefix="/utility", tags=["Utility"])
 
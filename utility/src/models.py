@@ -1,6 +1,7 @@
 """ SQLAlchemy models for all global entities """
 
-from sqlalchemy import Column, DateTime, UUID, Float
+from sqlalchemy import Column, DateTime, UUID, Float, Index, text
+from sqlalchemy.schema import CreateIndex
 
 from src.database import Base
 
@@ -9,7 +10,25 @@ class Utility(Base):
     __tablename__ = "utility"
 
     offer_id = Column(UUID, primary_key=True, index=True, nullable=False)
+    post_id = Column(UUID, nullable=True)
     utility = Column(Float, nullable=False)
 
     createdAt = Column(DateTime, nullable=False)
     updateAt = Column(DateTime, nullable=False)
+
+    # Lets GET /utility/top read the best offers of a post straight off the index, already in order
+    __table_args__ = (
+        Index("ix_utility_post_id_utility", post_id, utility.desc(), offer_id),
+    )
+
+
+def create_schema(connection):
+    """
+    Creates the tables, and adds the columns and indexes declared after the utility table was created to an
+    existing one, which create_all leaves out
+    """
+    Base.metadata.create_all(connection)
+    connection.execute(text("ALTER TABLE utility ADD COLUMN IF NOT EXISTS post_id UUID"))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
@@ -1,5 +1,6 @@
 """ Pydantic models for all global entities """
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, UUID4, Field
 
@@ -11,6 +12,7 @@ class UtilitySchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     offer_id: UUID4
+    post_id: Optional[UUID4] = None
     utility: float
 
     createdAt: datetime = Field(default_factory=datetime.now)
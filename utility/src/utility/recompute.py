@@ -0,0 +1,132 @@
+""" Background recomputation of utilities after a bag cost change """
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+
+import httpx
+import numpy as np
+from sqlalchemy import update, values, column, Float, UUID
+
+from src import database
+from src.constants import POSTS_PATH, OFFERS_PATH, RECOMPUTE_CHUNK_SIZE, RECOMPUTE_JOBS_KEPT
+from src.models import Utility
+from src.utility.schemas import RecomputeUtilitiesRequestSchema, RecomputeOfferSchema, RecomputeJobSchema, BagSize
+from src.utility.utils import get_utilities, SIZE_CODES, utc_now
+
+
+class RecomputeJob:
+    """
+    Rescores a set of offers with a new bag cost in one vectorized pass, then writes the scores back
+    in chunks of set-based UPDATE ... FROM (VALUES ...) statements, committing after each chunk
+    so progress can be followed while it runs.
+    """
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+    def __init__(self, data: RecomputeUtilitiesRequestSchema, bearer_token: str):
+        self.id = uuid.uuid4()
+        self.data = data
+        self.bearer_token = bearer_token
+        self.status = RecomputeJob.PENDING
+        self.total: Optional[int] = None
+        self.processed = 0
+        self.updated = 0
+        self.error: Optional[str] = None
+
+    async def run(self, client: httpx.AsyncClient):
+        self.status = RecomputeJob.RUNNING
+        try:
+            offers = self.data.offers
+            if offers is None:
+                offers = await fetch_route_offers(client, self.data.route_id, self.bearer_token)
+            self.total = len(offers)
+            await self.apply(offers)
+            self.status = RecomputeJob.DONE
+        except Exception as e:
+            logging.exception(f"Recompute job {self.id} failed: {e}")
+            self.error = str(e)
+            self.status = RecomputeJob.FAILED
+
+    async def apply(self, offers: List[RecomputeOfferSchema]):
+        scores = get_utilities(
+            np.fromiter((offer.offer for offer in offers), dtype=np.float64, count=len(offers)),
+            np.fromiter((SIZE_CODES[offer.size] for offer in offers), dtype=np.intp, count=len(offers)),
+            np.full(len(offers), float(self.data.bag_cost))
+        ).tolist()
+
+        async with database.SessionLocal() as sess:
+            for start in range(0, len(offers), RECOMPUTE_CHUNK_SIZE):
+                chunk = list(zip(offers[start:start + RECOMPUTE_CHUNK_SIZE], scores[start:start + RECOMPUTE_CHUNK_SIZE]))
+                recomputed = values(
+                    column("offer_id", UUID), column("utility", Float), name="recomputed"
+                ).data([(offer.offer_id, score) for offer, score in chunk])
+                result = await sess.execute(
+                    update(Utility)
+                    .where(Utility.offer_id == recomputed.c.offer_id)
+                    .values(utility=recomputed.c.utility, updateAt=utc_now())
+                )
+                await sess.commit()
+                self.processed += len(chunk)
+                self.updated += result.rowcount
+
+    def progress(self) -> RecomputeJobSchema:
+        return RecomputeJobSchema(
+            id=self.id,
+            status=self.status,
+            total=self.total,
+            processed=self.processed,
+            updated=self.updated,
+            error=self.error
+        )
+
+
+async def fetch_route_offers(
+        client: httpx.AsyncClient, route_id: uuid.UUID, bearer_token: str) -> List[RecomputeOfferSchema]:
+    """
+    Collects every offer made on the posts of a route from the Posts and Offers endpoints
+    """
+    offers = []
+    for post in await fetch_all(client, POSTS_PATH.rstrip("/") + "/posts", {"route": str(route_id)}, bearer_token):
+        for offer in await fetch_all(client, OFFERS_PATH.rstrip("/") + "/offers", {"post": post["id"]}, bearer_token):
+            offers.append(RecomputeOfferSchema(offer_id=offer["id"], offer=offer["offer"], size=BagSize(offer["size"])))
+    return offers
+
+
+async def fetch_all(client: httpx.AsyncClient, url: str, params: dict, bearer_token: str) -> list:
+    """Follows the X-Next-Cursor header of a keyset paginated listing until its last page"""
+    items = []
+    while True:
+        response = await client.get(url, params=params, headers={"Authorization": 'Bearer ' + bearer_token})
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} answered {response.status_code}")
+        items.extend(response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            return items
+        params = {**params, "cursor": next_cursor}
+
+
+class RecomputeJobs:
+    """Keeps the last RECOMPUTE_JOBS_KEPT jobs so their progress can be looked up"""
+
+    def __init__(self, kept: int):
+        self.kept = kept
+        self.jobs: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def add(self, job: RecomputeJob):
+        with self.lock:
+            self.jobs[str(job.id)] = job
+            while len(self.jobs) > self.kept:
+                self.jobs.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[RecomputeJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+
+
+recompute_jobs = RecomputeJobs(RECOMPUTE_JOBS_KEPT)
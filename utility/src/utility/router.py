@@ -1,26 +1,29 @@
 """ /users router """
 import json
 import logging
-from fastapi import APIRouter, HTTPException, Depends, Response, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Response, Request, Query, BackgroundTasks
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import UUID4
 from sqlalchemy import delete
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated, List
 
 from src.database import get_session
+from src.constants import MAX_BATCH_SIZE, TOP_K_DEFAULT, TOP_K_MAX
 from src.exceptions import UniqueConstraintViolatedException, InvalidRequestException, \
-    UtilityNotFoundException, UnauthorizedUserException
+    UtilityNotFoundException, UnauthorizedUserException, BatchTooLargeException, DatabaseUnavailableException
 from src.models import Utility
 from src.schemas import UtilitySchema
-from src.utility.schemas import CreateUtilityRequestSchema, UpdateUtilityRequestSchema
+from src.utility.recompute import RecomputeJob, recompute_jobs
+from src.utility.schemas import CreateUtilityRequestSchema, UpdateUtilityRequestSchema, \
+    CreateUtilityBatchResponseSchema, RecomputeUtilitiesRequestSchema, RecomputeJobSchema
 from src.utility.utils import Utilities
 
 router = APIRouter()
 
 
 @router.get("/ping")
-def ping():
+async def ping():
     """
     Returns "pong" whenever the endpoint is contacted.
     Functions as a health check
@@ -30,7 +33,7 @@ def ping():
 
 @router.post("/reset")
 async def reset(
-        session: Session = Depends(get_session),
+        session: AsyncSession = Depends(get_session),
 ):
     """
     Clears the utilities table
@@ -40,9 +43,8 @@ async def reset(
     try:
         statement = delete(Utility)
         print(statement)
-        with session:
-            session.execute(statement)
-            session.commit()
+        await session.execute(statement)
+        await session.commit()
     except Exception as e:
         logging.error(e)
         return JSONResponse(status_code=500, content={
@@ -51,17 +53,17 @@ async def reset(
 
 
 @router.post("/")
-def create_utility(
+async def create_utility(
         util_data: CreateUtilityRequestSchema, request: Request, response: Response,
-        sess: Annotated[Session, Depends(get_session)],
+        sess: Annotated[AsyncSession, Depends(get_session)],
 ) -> UtilitySchema:
     """
     Creates a utility with the given data.
     Offer_id must be unique
     """
-    authenticate(request)
+    await authenticate(request)
     try:
-        new_user = Utilities().create_utility(util_data, sess)
+        new_user = await Utilities().create_utility(util_data, sess)
         response.status_code = 201
         return new_user
     except UniqueConstraintViolatedException as e:
@@ -69,49 +71,113 @@ def create_utility(
         raise HTTPException(status_code=412, detail="A utility for that offer_id already exists")
 
 
+@router.post("/batch")
+async def create_utilities(
+        util_data: List[CreateUtilityRequestSchema], request: Request, response: Response,
+        sess: Annotated[AsyncSession, Depends(get_session)],
+) -> CreateUtilityBatchResponseSchema:
+    """
+    Creates or overwrites the utilities of many offers at once.
+    When an offer_id is repeated, its last entry is kept
+    """
+    await authenticate(request)
+    try:
+        count = await Utilities.create_utilities(util_data, sess)
+        response.status_code = 201
+        return CreateUtilityBatchResponseSchema(count=count)
+    except BatchTooLargeException:
+        raise HTTPException(status_code=413, detail=f"A batch can hold at most {MAX_BATCH_SIZE} utilities")
+
+
+@router.post("/recompute")
+async def recompute_utilities(
+        data: RecomputeUtilitiesRequestSchema, request: Request, response: Response,
+        background_tasks: BackgroundTasks) -> RecomputeJobSchema:
+    """
+    Starts recomputing the utilities of a route's offers, or of the given offers, with a new bag cost.
+    Answers right away with the job, whose progress is available at /utility/recompute/{job_id}
+    """
+    await authenticate(request)
+    job = RecomputeJob(data, request.headers.get('Authorization').split(" ")[1])
+    recompute_jobs.add(job)
+    background_tasks.add_task(job.run, request.app.requests_client)
+    response.status_code = 202
+    return job.progress()
+
+
+@router.get("/recompute/{job_id}")
+async def get_recompute_job(job_id: str, request: Request) -> RecomputeJobSchema:
+    """
+    Retrieves the progress of a recompute job
+    """
+    await authenticate(request)
+    job = recompute_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="El trabajo no fue encontrado")
+    return job.progress()
+
+
+@router.get("/top")
+async def get_top_utilities(
+        sess: Annotated[AsyncSession, Depends(get_session)],
+        request: Request,
+        post: UUID4,
+        k: Annotated[int, Query(ge=1, le=TOP_K_MAX)] = TOP_K_DEFAULT) -> List[UtilitySchema]:
+    """
+    Retrieves the k offers of a post with the highest utility, in descending order
+    """
+    await authenticate(request)
+
+    return await Utilities.get_top_utilities(post, k, sess)
+
+
 @router.get("/{offer_id}")
-def get_utility(
+async def get_utility(
         offer_id: str,
-        sess: Annotated[Session, Depends(get_session)],
+        sess: Annotated[AsyncSession, Depends(get_session)],
         request: Request) -> UtilitySchema:
     """
     Retrieves a utility with the given offer id.
     """
-    authenticate(request)
+    await authenticate(request)
 
     try:
-        return Utilities.get_utility(offer_id, sess)
+        return await Utilities.get_utility(offer_id, sess)
 
     except UtilityNotFoundException:
         raise HTTPException(status_code=404, detail="La utilidad no fue encontrado")
 
 
-@router.post("/list")
-def get_utilities(
+@router.post("/list", response_model=List[UtilitySchema])
+async def get_utilities(
         offer_ids: List[UUID4],
-        sess: Annotated[Session, Depends(get_session)],
-        request: Request) -> List[UtilitySchema]:
+        request: Request) -> StreamingResponse:
     """
-    Retrieves a list of utilitie with the given offer ids.
+    Retrieves a list of utilitie with the given offer ids, sorted by descending utility.
+    The list is streamed as it is read from the database
     """
-    authenticate(request)
+    await authenticate(request)
 
-    return Utilities.get_utilities(offer_ids, sess)
+    try:
+        body = await Utilities.stream_utilities(offer_ids)
+    except DatabaseUnavailableException:
+        raise HTTPException(status_code=503, detail="La base de datos no esta disponible")
+    return StreamingResponse(body, media_type="application/json")
 
 
 @router.patch("/{offer_id}")
-def update_utility(
+async def update_utility(
         offer_id: str, util_data: UpdateUtilityRequestSchema,
-        sess: Annotated[Session, Depends(get_session)],
+        sess: Annotated[AsyncSession, Depends(get_session)],
         request: Request) -> dict:
     """
     Updates a utility with the given data.
 
     """
-    authenticate(request)
+    await authenticate(request)
 
     try:
-        updated = Utilities.update_utility(offer_id, util_data, sess)
+        updated = await Utilities.update_utility(offer_id, util_data, sess)
         if updated:
             return {"msg": "la utilidad ha sido actualizada"}
         else:
@@ -124,21 +190,21 @@ def update_utility(
 
 
 @router.delete("/{offer_id}")
-def delete_utility(
+async def delete_utility(
         offer_id: str,
-        sess: Annotated[Session, Depends(get_session)],
+        sess: Annotated[AsyncSession, Depends(get_session)],
         request: Request) -> dict:
     """
     Deletes a utility with the given offer id.
     """
-    authenticate(request)
+    await authenticate(request)
 
     return {
-        "deleted_offer_id": Utilities.delete_utility(offer_id, sess)
+        "deleted_offer_id": await Utilities.delete_utility(offer_id, sess)
     }
 
 
-def authenticate(request: Request) -> str:
+async def authenticate(request: Request) -> str:
     """
     Checks if authorization token is present and valid, then calls users endpoint to
     verify whether credentials are still authorized
@@ -146,7 +212,7 @@ def authenticate(request: Request) -> str:
     if 'Authorization' in request.headers and 'Bearer ' in request.headers.get('Authorization'):
         bearer_token = request.headers.get('Authorization').split(" ")[1]
         try:
-            user_id = Utilities.authenticate_user(bearer_token)
+            user_id = await Utilities.authenticate_user(request.app.requests_client, bearer_token)
         except UnauthorizedUserException:
             raise HTTPException(status_code=401, detail="Unauthorized. Valid credentials were rejected.")
 
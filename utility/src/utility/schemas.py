@@ -1,7 +1,9 @@
 """ Pydantic schemas for request and response bodiess """
 import uuid
 from enum import Enum
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, model_validator
+from pydantic_core import PydanticCustomError
 
 
 class BagSize(Enum):
@@ -15,11 +17,56 @@ class CreateUtilityRequestSchema(BaseModel):
     Used when creating a utility
     """
     offer_id: uuid.UUID
+    post_id: Optional[uuid.UUID] = None
     offer: float
     size: BagSize
     bag_cost: int
 
 
+class CreateUtilityBatchResponseSchema(BaseModel):
+    """
+    Sent after scoring and storing a batch of utilities
+    """
+    count: int
+
+
+class RecomputeOfferSchema(BaseModel):
+    """
+    An offer whose utility has to be recomputed
+    """
+    offer_id: uuid.UUID
+    offer: float
+    size: BagSize
+
+
+class RecomputeUtilitiesRequestSchema(BaseModel):
+    """
+    Used when recomputing utilities after a bag cost change, either for every offer of a route
+    or for the given offers
+    """
+    bag_cost: int
+    route_id: Optional[uuid.UUID] = None
+    offers: Optional[List[RecomputeOfferSchema]] = None
+
+    @model_validator(mode="after")
+    def check_single_source(self):
+        if (self.route_id is None) == (self.offers is None):
+            raise PydanticCustomError("single_source", "Either route_id or offers must be given")
+        return self
+
+
+class RecomputeJobSchema(BaseModel):
+    """
+    Progress of a recompute job
+    """
+    id: uuid.UUID
+    status: str
+    total: Optional[int] = None
+    processed: int
+    updated: int
+    error: Optional[str] = None
+
+
 def check_uuid4(v: str) -> str:
     """Returns value error if str is not a valid UUID4"""
     uuid.UUID(v)
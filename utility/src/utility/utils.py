@@ -1,19 +1,36 @@
 """ Utils for users """
-import requests
+import json
+
+import httpx
+import numpy as np
 from datetime import datetime, timezone
 from pydantic import UUID4
-from sqlalchemy import select, delete
-from sqlalchemy.exc import IntegrityError, NoResultFound, DataError
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, delete, any_, cast, bindparam, func, text, Table, MetaData, Column, String, UUID, \
+    Float, Row, literal
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy.exc import IntegrityError, NoResultFound, DBAPIError, OperationalError, InterfaceError, \
+    TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, AsyncIterator, Optional
 
-from src.constants import USERS_PATH
-from src.exceptions import UniqueConstraintViolatedException, UtilityNotFoundException, UnauthorizedUserException
+from src import database
+from src.constants import USERS_PATH, MAX_BATCH_SIZE, LIST_TEMP_TABLE_THRESHOLD, LIST_STREAM_CHUNK_SIZE
+from src.exceptions import UniqueConstraintViolatedException, UtilityNotFoundException, UnauthorizedUserException, \
+    BatchTooLargeException, DatabaseUnavailableException
 from src.models import Utility
 from src.schemas import UtilitySchema
+from src.signed_token import signed_tokens, InvalidSignedToken
 from src.utility.schemas import CreateUtilityRequestSchema, BagSize, UpdateUtilityRequestSchema
 
 
+async def next_row(rows: AsyncIterator[Row]) -> Optional[Row]:
+    """Returns the next row of the iterator, or None once it is exhausted"""
+    try:
+        return await rows.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
 def get_utility(offer: float, size: BagSize, bag_cost: int) -> float:
     """Calculates utility score"""
     bag_occupation = 1.0
@@ -24,37 +41,115 @@ def get_utility(offer: float, size: BagSize, bag_cost: int) -> float:
     return offer - (bag_occupation * float(bag_cost))
 
 
+SIZE_CODES = {size: code for code, size in enumerate(BagSize)}
+# Bag occupation indexed by SIZE_CODES, must match get_utility
+BAG_OCCUPATION = np.array([
+    {BagSize.LARGE: 1.0, BagSize.MEDIUM: 0.5, BagSize.SMALL: 0.25}[size] for size in BagSize
+])
+
+
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime, the columns are timestamps without time zone"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def get_utilities(offers: np.ndarray, size_codes: np.ndarray, bag_costs: np.ndarray) -> np.ndarray:
+    """Calculates utility scores for whole arrays at once, sizes are given as SIZE_CODES"""
+    return offers - (BAG_OCCUPATION[size_codes] * bag_costs)
+
+
+# Session scoped table holding the offer ids of a large /utility/list request, dropped when its transaction ends
+requested_offers = Table(
+    "requested_offers",
+    MetaData(),
+    Column("offer_id", UUID, primary_key=True),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
+
+
+def uuid_array(name: str, values: list):
+    """Binds a list of ids as a single uuid[] parameter"""
+    return cast(bindparam(name, [str(v) if v is not None else None for v in values], ARRAY(String)), ARRAY(UUID))
+
+
+UTILITY_COLUMNS = (Utility.offer_id, Utility.post_id, Utility.utility, Utility.createdAt, Utility.updateAt)
+
+
 class Utilities:
 
     @staticmethod
-    def create_utility(data: CreateUtilityRequestSchema, session: Session) -> UtilitySchema:
+    async def create_utility(data: CreateUtilityRequestSchema, session: AsyncSession) -> UtilitySchema:
         """
         Insert a new utility into the Utilities table
         """
         new_utility = None
         utility_value = get_utility(data.offer, data.size, data.bag_cost)
-        current_time = datetime.now(timezone.utc)
+        current_time = utc_now()
         try:
             new_utility = Utility(
                 offer_id=data.offer_id,
+                post_id=data.post_id,
                 utility=utility_value,
                 createdAt=current_time,
                 updateAt=current_time
             )
 
             session.add(new_utility)
-            session.commit()
+            await session.commit()
         except IntegrityError as e:
             raise UniqueConstraintViolatedException(e)
         return new_utility
 
     @staticmethod
-    def update_utility(offer_id: str, data: UpdateUtilityRequestSchema, sess: Session) -> bool:
+    async def create_utilities(data: List[CreateUtilityRequestSchema], session: AsyncSession) -> int:
+        """
+        Scores a batch of utilities in one vectorized pass and upserts them with a single INSERT
+        Returns how many utilities were stored
+        """
+        if len(data) > MAX_BATCH_SIZE:
+            raise BatchTooLargeException()
+        # A row can only be touched once per INSERT ... ON CONFLICT, the last occurrence of an offer wins
+        latest = list({item.offer_id: item for item in data}.values())
+        if not latest:
+            return 0
+
+        scores = get_utilities(
+            np.fromiter((item.offer for item in latest), dtype=np.float64, count=len(latest)),
+            np.fromiter((SIZE_CODES[item.size] for item in latest), dtype=np.intp, count=len(latest)),
+            np.fromiter((item.bag_cost for item in latest), dtype=np.float64, count=len(latest))
+        )
+        current_time = utc_now()
+        # The rows travel as one array per column, asyncpg caps a statement at 32767 parameters
+        statement = insert(Utility).from_select(
+            ["offer_id", "post_id", "utility", "createdAt", "updateAt"],
+            select(
+                func.unnest(uuid_array("offer_ids", [item.offer_id for item in latest])),
+                func.unnest(uuid_array("post_ids", [item.post_id for item in latest])),
+                func.unnest(bindparam("utilities", scores.tolist(), ARRAY(Float))),
+                literal(current_time),
+                literal(current_time)
+            )
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Utility.offer_id],
+            set_={
+                "post_id": func.coalesce(statement.excluded.post_id, Utility.post_id),
+                "utility": statement.excluded.utility,
+                "updateAt": statement.excluded.updateAt
+            }
+        )
+        await session.execute(statement)
+        await session.commit()
+        return len(latest)
+
+    @staticmethod
+    async def update_utility(offer_id: str, data: UpdateUtilityRequestSchema, sess: AsyncSession) -> bool:
         """Updates utility value given a certain offer_id"""
         try:
-            retrieved_utility = sess.execute(
+            retrieved_utility = (await sess.execute(
                 select(Utility).where(Utility.offer_id == offer_id)
-            ).scalar_one()
+            )).scalar_one()
 
             updated = False
             utility_value = get_utility(data.offer, data.size, data.bag_cost)
@@ -63,14 +158,14 @@ class Utilities:
                 updated = True
 
             if updated:
-                retrieved_utility.updateAt = datetime.now(timezone.utc)
-                sess.commit()
+                retrieved_utility.updateAt = utc_now()
+                await sess.commit()
             return updated
-        except (NoResultFound, DataError, TypeError):
+        except (NoResultFound, DBAPIError, TypeError):
             raise UtilityNotFoundException()
 
     @staticmethod
-    def get_utility(offer_id: str, sess: Session) -> UtilitySchema:
+    async def get_utility(offer_id: str, sess: AsyncSession) -> UtilitySchema:
         """
         Retrieves utility from the database
         Args:
@@ -81,47 +176,144 @@ class Utilities:
             utility schema
         """
         try:
-            retrieved_utility: Utility = sess.execute(
+            retrieved_utility: Utility = (await sess.execute(
                 select(Utility).where(Utility.offer_id == offer_id)
-            ).scalar_one()
-        except NoResultFound:
+            )).scalar_one()
+        except (NoResultFound, DBAPIError):
             raise UtilityNotFoundException()
 
         return UtilitySchema(
             offer_id=retrieved_utility.offer_id,
+            post_id=retrieved_utility.post_id,
             utility=retrieved_utility.utility,
             createdAt=retrieved_utility.createdAt,
             updateAt=retrieved_utility.updateAt
         )
 
     @staticmethod
-    def get_utilities(offer_ids: List[UUID4], sess: Session) -> list[UtilitySchema]:
+    async def get_utilities(offer_ids: List[UUID4], sess: AsyncSession) -> list[UtilitySchema]:
         """
         Retrieves utilities from the database with the given offer ids.
 
         """
+        return [
+            UtilitySchema(
+                offer_id=util.offer_id,
+                post_id=util.post_id,
+                utility=util.utility,
+                createdAt=util.createdAt,
+                updateAt=util.updateAt)
+            async for util in Utilities.iter_utilities(offer_ids, sess)
+        ]
+
+    @staticmethod
+    async def get_top_utilities(post_id: UUID4, k: int, sess: AsyncSession) -> list[UtilitySchema]:
+        """
+        Retrieves the k best utilities of a post, a single range scan over ix_utility_post_id_utility
+        """
+        retrieved_utilities = (await sess.execute(
+            select(*UTILITY_COLUMNS)
+            .where(Utility.post_id == post_id)
+            .order_by(Utility.utility.desc(), Utility.offer_id)
+            .limit(k)
+        )).all()
+        return [
+            UtilitySchema(
+                offer_id=util.offer_id,
+                post_id=util.post_id,
+                utility=util.utility,
+                createdAt=util.createdAt,
+                updateAt=util.updateAt)
+            for util in retrieved_utilities
+        ]
+
+    @staticmethod
+    async def iter_utilities(offer_ids: List[UUID4], sess: AsyncSession) -> AsyncIterator[Row]:
+        """
+        Yields the utility rows of the given offer ids in descending order of utility, fetching them in chunks.
+        Small sets are matched against a bound array, large ones are loaded into a temporary table and joined,
+        so the statement size doesn't grow with the number of ids.
+        """
+        if len(offer_ids) <= LIST_TEMP_TABLE_THRESHOLD:
+            statement = select(*UTILITY_COLUMNS).where(Utility.offer_id == any_(uuid_array("offer_ids", offer_ids)))
+        else:
+            connection = await sess.connection()
+            await connection.run_sync(requested_offers.create, checkfirst=False)
+            # One statement and one array parameter, instead of a round trip per page of ids
+            await sess.execute(
+                requested_offers.insert().from_select(
+                    ["offer_id"],
+                    select(func.unnest(uuid_array("offer_ids", list(set(offer_ids)))))
+                )
+            )
+            # Temporary tables are never auto-analyzed, without statistics the planner can't pick a good join
+            await sess.execute(text("ANALYZE requested_offers"))
+            statement = select(*UTILITY_COLUMNS).join(requested_offers, requested_offers.c.offer_id == Utility.offer_id)
+
+        statement = statement.order_by(Utility.utility.desc(), Utility.offer_id)
+        try:
+            result = await sess.stream(statement.execution_options(yield_per=LIST_STREAM_CHUNK_SIZE))
+            # A driver round trip per chunk rather than per row
+            async for partition in result.partitions():
+                for row in partition:
+                    yield row
+        finally:
+            # Ends the transaction, dropping the temporary table
+            await sess.rollback()
+
+    @staticmethod
+    async def stream_utilities(offer_ids: List[UUID4]) -> AsyncIterator[str]:
+        """
+        Runs the query for the utilities of the given offer ids and returns the JSON array as an iterator of pieces.
+        It uses a session of its own, since the body is sent after the request handler has returned.
+        The first chunk of rows is read before returning, so an unreachable database or a failing query
+        still ends in an error status. A failure on a later chunk can only cut the body short, the 200 is already sent.
+        """
+        sess = database.SessionLocal()
+        rows = Utilities.iter_utilities(offer_ids, sess)
+        first = None
+        started = False
         try:
-            retrieved_utilities_raw = list(sess.execute(
-                select(Utility)
-                .where(Utility.offer_id.in_(offer_ids))
-                .order_by(Utility.utility.desc())
-            ).scalars().all())
-
-            retrieved_utilities = [
-                UtilitySchema(
-                    offer_id=util.offer_id,
-                    utility=util.utility,
-                    createdAt=util.createdAt,
-                    updateAt=util.updateAt)
-                for util in retrieved_utilities_raw
-            ]
-        except NoResultFound:
-            return []
-
-        return retrieved_utilities if retrieved_utilities else []
+            first = await next_row(rows)
+            started = True
+        except (OperationalError, InterfaceError, PoolTimeoutError, OSError) as e:
+            raise DatabaseUnavailableException() from e
+        finally:
+            if not started:
+                await rows.aclose()
+                await sess.close()
+        return Utilities.write_utilities(first, rows, sess)
+
+    @staticmethod
+    async def write_utilities(first: Row, rows: AsyncIterator[Row], sess: AsyncSession) -> AsyncIterator[str]:
+        """
+        Yields the JSON array of the utilities piece by piece, starting from the row already read
+        """
+        async with sess:
+            try:
+                yield "["
+                chunk = []
+                separator = ""
+                utility = first
+                while utility is not None:
+                    chunk.append(separator + json.dumps({
+                        "offer_id": str(utility.offer_id),
+                        "post_id": str(utility.post_id) if utility.post_id else None,
+                        "utility": utility.utility,
+                        "createdAt": utility.createdAt.isoformat(),
+                        "updateAt": utility.updateAt.isoformat()
+                    }))
+                    separator = ","
+                    if len(chunk) >= LIST_STREAM_CHUNK_SIZE:
+                        yield "".join(chunk)
+                        chunk = []
+                    utility = await next_row(rows)
+                yield "".join(chunk) + "]"
+            finally:
+                await rows.aclose()
 
     @staticmethod
-    def delete_utility(offer_id: str, sess: Session) -> str:
+    async def delete_utility(offer_id: str, sess: AsyncSession) -> str:
         """
         Deletes utility from the database
         Args:
@@ -132,16 +324,20 @@ class Utilities:
             utility schema
         """
         delete_statement = delete(Utility).where(Utility.offer_id == offer_id)
-        sess.execute(delete_statement)
-        sess.commit()
+        await sess.execute(delete_statement)
+        await sess.commit()
         return offer_id
 
     @staticmethod
-    def authenticate_user(bearer_token: str) -> str:
+    async def authenticate_user(client: httpx.AsyncClient, bearer_token: str) -> str:
+        if signed_tokens.applies(bearer_token):
+            try:
+                return signed_tokens.verify(bearer_token)["id"]
+            except InvalidSignedToken:
+                raise UnauthorizedUserException()
         headers = {"Authorization": 'Bearer ' + bearer_token}
         url = USERS_PATH.rstrip('/') + "/users/me"
-        print(url)
-        response = requests.get(url, headers=headers)
+        response = await client.get(url, headers=headers)
         if response.status_code == 200:
             user_data = response.json()
             user_id = user_data["id"]
@@ -2,7 +2,7 @@ import os
 import pytest
 from dotenv import find_dotenv, load_dotenv
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker
 from typing import Generator
 
@@ -16,27 +16,22 @@ def pytest_configure(config):
 
 
 @pytest.fixture(scope="function")
-def session(monkeypatch) -> Generator:
+def session() -> Generator:
     """
-    Sets up an alternate database connection, to a db_tests database.
-
-    Args:
-        monkeypatch: used to patch the SessionLocal variable in src.database
+    Sets up a synchronous connection to the test database, used to arrange and check the
+    rows the service reads and writes through its async engine.
 
     Returns:
         SQLAlchemy session to the test database
     """
-    from src import database
     from src.database import Base, SQLALCHEMY_DATABASE_URL
 
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
+        make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql"),
         isolation_level="READ UNCOMMITTED"
     )
     session_local = sessionmaker(autocommit=False, autoflush=True, bind=engine, expire_on_commit=False)
 
-    monkeypatch.setattr(database, "SessionLocal", session_local)
-
     Base.metadata.create_all(bind=engine)
     sess = session_local(expire_on_commit=False)
     # begin a non-ORM transaction
@@ -46,6 +41,7 @@ def session(monkeypatch) -> Generator:
 
     sess.rollback()
     sess.close()
+    engine.dispose()
 
 
 @pytest.fixture(scope="module")
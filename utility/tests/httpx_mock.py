@@ -0,0 +1,32 @@
+""" Lets the existing httmock handlers answer the app's shared httpx client """
+import httmock
+import httpx
+import requests
+
+from src.main import app
+
+
+class HTTMock(httmock.HTTMock):
+    """
+    Drop-in replacement for httmock.HTTMock. While active, app.requests_client is swapped for a client
+    whose transport hands every request to the same handlers, so the mocks keep working unchanged.
+    """
+
+    def __enter__(self):
+        super().__enter__()
+        self._real_client = app.requests_client
+        app.requests_client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        app.requests_client = self._real_client
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        prepared = requests.Request(
+            request.method, str(request.url), headers=dict(request.headers), data=request.content
+        ).prepare()
+        mocked = self.intercept(prepared)
+        if mocked is None:
+            raise httpx.ConnectError(f"No mock for {request.method} {request.url}", request=request)
+        return httpx.Response(mocked.status_code, headers=dict(mocked.headers), content=mocked.content)
@@ -22,3 +22,36 @@ def mock_failed_auth(url, request):
 @all_requests
 def mock_forbidden_auth(url, request):
     return response(403)
+
+
+RECOMPUTE_POST_IDS = ["5e1b3a0a-9a4b-4bd7-a2f6-2a33f3e8a0b1", "0c3b84d8-64f4-4b5e-9c1b-7f0b9b6fd2aa"]
+RECOMPUTE_OFFERS = {
+    RECOMPUTE_POST_IDS[0]: [
+        {"id": "a8a1f3a5-1c0b-4f7e-9d58-0b7e2f56f1c1", "offer": 200, "size": "LARGE"},
+        {"id": "b2f5c0f4-8d2e-4b0b-a0a7-3c8f3ad8f0d2", "offer": 90.5, "size": "SMALL"},
+    ],
+    RECOMPUTE_POST_IDS[1]: [
+        {"id": "c6d4e8b1-3f5a-4d8c-8b7e-5a2c1e9f0d33", "offer": 150, "size": "MEDIUM"},
+    ],
+}
+
+
+@all_requests
+def mock_recompute_route(url, request):
+    """Answers users, posts (one post per page) and offers for the recompute route tests"""
+    if url.path.startswith("/posts"):
+        cursor = dict(pair.split("=") for pair in url.query.split("&")).get("cursor")
+        if cursor is None:
+            return response(200, content=[{"id": RECOMPUTE_POST_IDS[0]}], headers={"X-Next-Cursor": "next"})
+        return response(200, content=[{"id": RECOMPUTE_POST_IDS[1]}])
+    if url.path.startswith("/offers"):
+        post_id = dict(pair.split("=") for pair in url.query.split("&"))["post"]
+        return response(200, content=RECOMPUTE_OFFERS[post_id])
+    return mock_success_auth(url, request)
+
+
+@all_requests
+def mock_recompute_posts_unavailable(url, request):
+    if url.path.startswith("/posts"):
+        return response(500)
+    return mock_success_auth(url, request)
@@ -0,0 +1,56 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from src.exceptions import UnauthorizedUserException
+from src.signed_token import signed_tokens
+from src.utility.utils import Utilities
+
+
+@pytest.fixture
+def signing(monkeypatch):
+    monkeypatch.setattr(signed_tokens, "key", b"secret")
+    monkeypatch.setattr(signed_tokens, "start", lambda: None)
+    monkeypatch.setattr(signed_tokens, "refreshed_at", time.monotonic())
+    monkeypatch.setattr(signed_tokens, "revoked", {})
+
+
+def authenticate(bearer_token: str) -> str:
+    """Authenticates against a users service that rejects every call, only offline verification can succeed"""
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(401))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await Utilities.authenticate_user(client, bearer_token)
+
+    return asyncio.run(run())
+
+
+def test_signed_token_is_verified_offline(signing):
+    user_id = uuid4()
+    token = signed_tokens.issue(user_id, "user@example.com", "VERIFICADO", uuid4(),
+                                datetime.now() + timedelta(hours=1))
+
+    assert authenticate(token) == str(user_id)
+
+
+def test_revoked_signed_token_is_rejected(signing, monkeypatch):
+    token_id = uuid4()
+    monkeypatch.setattr(signed_tokens, "revoked", {signed_tokens.token_id(token_id): 0})
+    token = signed_tokens.issue(uuid4(), "user@example.com", "VERIFICADO", token_id,
+                                datetime.now() + timedelta(hours=1))
+
+    with pytest.raises(UnauthorizedUserException):
+        authenticate(token)
+
+
+def test_tampered_signed_token_is_rejected(signing):
+    token = signed_tokens.issue(uuid4(), "user@example.com", "VERIFICADO", uuid4(),
+                                datetime.now() + timedelta(hours=1))
+    version, payload, _ = token.split(".")
+
+    with pytest.raises(UnauthorizedUserException):
+        authenticate(f"{version}.{payload}.forged")
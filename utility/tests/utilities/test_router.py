@@ -1,12 +1,16 @@
 import datetime
 import uuid
 from fastapi.testclient import TestClient
-from httmock import HTTMock
-from sqlalchemy import delete, select, func
+from tests.httpx_mock import HTTMock
+from sqlalchemy import delete, select, func, inspect, text
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import OperationalError
 
-from src.models import Utility
-from tests.mocks import mock_success_auth, mock_forbidden_auth
+from src.models import Utility, create_schema
+from src.utility.schemas import BagSize
+from src.utility.utils import get_utility
+from tests.mocks import mock_success_auth, mock_forbidden_auth, mock_recompute_route, \
+    mock_recompute_posts_unavailable, RECOMPUTE_OFFERS
 
 BASE_ROUTE = "/utility/"
 BASE_AUTH_TOKEN = "Bearer 3d91ee00503447c58e1787a90beaa265"
@@ -44,6 +48,29 @@ def test_create_utility(
         assert retrieved_utility.utility == 400.5 - (0.5 * 60)
 
 
+def test_create_utility_with_post(
+        client: TestClient, session: Session
+):
+    """Checks that POST /utility stores the post the offer belongs to"""
+    session.execute(
+        delete(Utility)
+    )
+    session.commit()
+    payload = {
+        "offer_id": "3d747856-5ddb-467e-b9f4-2c7e2ef19245",
+        "post_id": "68158796-9594-4b4f-a184-8df97379e912",
+        "offer": 400.5,
+        "size": "MEDIUM",
+        "bag_cost": 60
+    }
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE, json=payload, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 201
+        assert response.json()["post_id"] == payload["post_id"]
+
+
 def test_create_utility_no_credentials(
         client: TestClient, session: Session
 ):
@@ -395,6 +422,331 @@ def test_get_utilities(
         assert response_body[3]["offer_id"] == str(mock_utility_4.offer_id)
 
 
+def test_get_utilities_temp_table(
+        client: TestClient, session: Session, monkeypatch
+):
+    """
+    GIVEN I send more offer_ids than the array threshold
+    I EXPECT the same filtered list, in descending order by utility score, through the temporary table join
+    """
+    monkeypatch.setattr("src.utility.utils.LIST_TEMP_TABLE_THRESHOLD", 2)
+    monkeypatch.setattr("src.utility.utils.LIST_STREAM_CHUNK_SIZE", 2)
+    session.execute(
+        delete(Utility)
+    )
+    utilities = [
+        Utility(
+            offer_id=uuid.uuid4(),
+            utility=score,
+            createdAt=datetime.datetime.now(),
+            updateAt=datetime.datetime.now()
+        )
+        for score in [250, 126.90, 7200.5, 12.33, 99]
+    ]
+    session.add_all(utilities)
+    session.commit()
+
+    requested = [str(util.offer_id) for util in utilities[:4]] + [str(uuid.uuid4()), str(utilities[0].offer_id)]
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE + "list", json=requested, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 200
+
+        response_body: list = response.json()
+        assert [elem["offer_id"] for elem in response_body] == [
+            str(utilities[2].offer_id), str(utilities[0].offer_id),
+            str(utilities[1].offer_id), str(utilities[3].offer_id)
+        ]
+
+
+def test_get_utilities_database_unavailable(
+        client: TestClient, monkeypatch
+):
+    """
+    GIVEN the database can't be reached when the list is requested
+    I EXPECT a 503 response instead of a truncated list
+    """
+    async def unreachable(offer_ids, sess):
+        raise OperationalError("SELECT", {}, ConnectionRefusedError())
+        yield
+
+    monkeypatch.setattr("src.utility.utils.Utilities.iter_utilities", unreachable)
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE + "list", json=[str(uuid.uuid4())], headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 503
+
+
+def test_create_schema_upgrades_existing_table(
+        session: Session
+):
+    """
+    GIVEN a utility table created before post_id and its index were declared
+    I EXPECT the startup schema step to add both
+    """
+    connection = session.connection()
+    connection.execute(text("DROP INDEX ix_utility_post_id_utility"))
+    connection.execute(text("ALTER TABLE utility DROP COLUMN post_id"))
+
+    create_schema(connection)
+
+    inspector = inspect(connection)
+    assert "post_id" in [column["name"] for column in inspector.get_columns("utility")]
+    assert "ix_utility_post_id_utility" in [index["name"] for index in inspector.get_indexes("utility")]
+
+
+def test_get_top_utilities(
+        client: TestClient, session: Session
+):
+    """
+    GIVEN I send a valid token, a post id and k
+    I EXPECT a 200 response with the k utilities of that post with the highest score, in descending order
+    """
+    session.execute(
+        delete(Utility)
+    )
+    post_id = uuid.uuid4()
+    utilities = [
+        Utility(
+            offer_id=uuid.uuid4(),
+            post_id=post_id,
+            utility=score,
+            createdAt=datetime.datetime.now(),
+            updateAt=datetime.datetime.now()
+        )
+        for score in [250, 126.90, 7200.5, 12.33]
+    ]
+    other_post_utility = Utility(
+        offer_id=uuid.uuid4(),
+        post_id=uuid.uuid4(),
+        utility=9999,
+        createdAt=datetime.datetime.now(),
+        updateAt=datetime.datetime.now()
+    )
+    session.add_all(utilities + [other_post_utility])
+    session.commit()
+
+    with HTTMock(mock_success_auth):
+        response = client.get(BASE_ROUTE + "top", params={"post": str(post_id), "k": 2}, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 200
+        response_body: list = response.json()
+        assert [elem["offer_id"] for elem in response_body] == [
+            str(utilities[2].offer_id), str(utilities[0].offer_id)
+        ]
+        assert all(elem["post_id"] == str(post_id) for elem in response_body)
+
+        response = client.get(BASE_ROUTE + "top", params={"post": str(post_id), "k": 0}, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 400
+
+
+def test_create_utilities_batch(
+        client: TestClient, session: Session
+):
+    """
+    GIVEN I send a batch of offers, one of them already scored and one of them repeated
+    I EXPECT a 201 response, every utility stored, the existing one overwritten and the last repeated entry kept
+    """
+    session.execute(
+        delete(Utility)
+    )
+    existing_utility = Utility(
+        offer_id=uuid.uuid4(),
+        utility=1.0,
+        createdAt=datetime.datetime.now(),
+        updateAt=datetime.datetime.now()
+    )
+    session.add(existing_utility)
+    session.commit()
+
+    repeated_id = str(uuid.uuid4())
+    payload = [
+        {"offer_id": str(existing_utility.offer_id), "offer": 400.5, "size": "MEDIUM", "bag_cost": 60},
+        {"offer_id": str(uuid.uuid4()), "offer": 120, "size": "LARGE", "bag_cost": 33},
+        {"offer_id": str(uuid.uuid4()), "offer": 75.25, "size": "SMALL", "bag_cost": 41},
+        {"offer_id": repeated_id, "offer": 10, "size": "SMALL", "bag_cost": 10},
+        {"offer_id": repeated_id, "offer": 90, "size": "LARGE", "bag_cost": 10},
+    ]
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE + "batch", json=payload, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 201
+        assert response.json()["count"] == 4
+
+    session.expire_all()
+    stored = {
+        str(util.offer_id): util.utility
+        for util in session.execute(select(Utility)).scalars().all()
+    }
+    assert len(stored) == 4
+    for item in payload[:3] + payload[4:]:
+        assert stored[item["offer_id"]] == get_utility(item["offer"], BagSize(item["size"]), item["bag_cost"])
+
+
+def test_create_utilities_batch_too_large(
+        client: TestClient, session: Session, monkeypatch
+):
+    """
+    GIVEN I send a batch bigger than the allowed size
+    I EXPECT a 413 response
+    """
+    monkeypatch.setattr("src.utility.utils.MAX_BATCH_SIZE", 1)
+    payload = [
+        {"offer_id": str(uuid.uuid4()), "offer": 120, "size": "LARGE", "bag_cost": 33},
+        {"offer_id": str(uuid.uuid4()), "offer": 75.25, "size": "SMALL", "bag_cost": 41},
+    ]
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE + "batch", json=payload, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 413
+
+
+def test_recompute_utilities(
+        client: TestClient, session: Session, monkeypatch
+):
+    """
+    GIVEN utilities for some offers and a new bag cost
+    I EXPECT a 202 with the job, and every listed utility rescored in chunks
+    """
+    monkeypatch.setattr("src.utility.recompute.RECOMPUTE_CHUNK_SIZE", 2)
+    session.execute(
+        delete(Utility)
+    )
+    utilities = [
+        Utility(
+            offer_id=uuid.uuid4(),
+            utility=0,
+            createdAt=datetime.datetime.now(),
+            updateAt=datetime.datetime.now()
+        )
+        for _ in range(3)
+    ]
+    session.add_all(utilities)
+    session.commit()
+
+    payload = {
+        "bag_cost": 40,
+        "offers": [
+            {"offer_id": str(utilities[0].offer_id), "offer": 100, "size": "LARGE"},
+            {"offer_id": str(utilities[1].offer_id), "offer": 80.5, "size": "MEDIUM"},
+            {"offer_id": str(utilities[2].offer_id), "offer": 20, "size": "SMALL"},
+            {"offer_id": str(uuid.uuid4()), "offer": 20, "size": "SMALL"},
+        ]
+    }
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE + "recompute", json=payload, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        response = client.get(BASE_ROUTE + "recompute/" + job_id, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 200
+        assert response.json() == {
+            "id": job_id, "status": "DONE", "total": 4, "processed": 4, "updated": 3, "error": None
+        }
+
+    session.expire_all()
+    scores = {util.offer_id: util.utility for util in session.execute(select(Utility)).scalars()}
+    assert scores[utilities[0].offer_id] == get_utility(100, BagSize.LARGE, 40)
+    assert scores[utilities[1].offer_id] == get_utility(80.5, BagSize.MEDIUM, 40)
+    assert scores[utilities[2].offer_id] == get_utility(20, BagSize.SMALL, 40)
+
+
+def test_recompute_utilities_route(
+        client: TestClient, session: Session
+):
+    """
+    GIVEN a route id and a new bag cost
+    I EXPECT the utilities of every offer on the route's posts to be rescored
+    """
+    session.execute(
+        delete(Utility)
+    )
+    offers = [offer for post_offers in RECOMPUTE_OFFERS.values() for offer in post_offers]
+    session.add_all([
+        Utility(
+            offer_id=uuid.UUID(offer["id"]),
+            utility=0,
+            createdAt=datetime.datetime.now(),
+            updateAt=datetime.datetime.now()
+        )
+        for offer in offers
+    ])
+    session.commit()
+
+    with HTTMock(mock_recompute_route):
+        response = client.post(BASE_ROUTE + "recompute", json={
+            "bag_cost": 30, "route_id": str(uuid.uuid4())
+        }, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 202
+
+        response = client.get(BASE_ROUTE + "recompute/" + response.json()["id"], headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.json()["status"] == "DONE"
+        assert response.json()["updated"] == len(offers)
+
+    session.expire_all()
+    scores = {str(util.offer_id): util.utility for util in session.execute(select(Utility)).scalars()}
+    for offer in offers:
+        assert scores[offer["id"]] == get_utility(offer["offer"], BagSize(offer["size"]), 30)
+
+
+def test_recompute_utilities_downstream_failure(
+        client: TestClient
+):
+    """
+    GIVEN the posts service fails while collecting a route's offers
+    I EXPECT the job to end as FAILED with the error
+    """
+    with HTTMock(mock_recompute_posts_unavailable):
+        response = client.post(BASE_ROUTE + "recompute", json={
+            "bag_cost": 30, "route_id": str(uuid.uuid4())
+        }, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 202
+
+        response = client.get(BASE_ROUTE + "recompute/" + response.json()["id"], headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.json()["status"] == "FAILED"
+        assert "500" in response.json()["error"]
+
+
+def test_recompute_utilities_validation_error(
+        client: TestClient
+):
+    """
+    GIVEN both a route id and a list of offers
+    I EXPECT a 400
+    """
+    with HTTMock(mock_success_auth):
+        response = client.post(BASE_ROUTE + "recompute", json={
+            "bag_cost": 30, "route_id": str(uuid.uuid4()), "offers": []
+        }, headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 400
+
+        response = client.get(BASE_ROUTE + "recompute/" + str(uuid.uuid4()), headers={
+            "Authorization": BASE_AUTH_TOKEN
+        })
+        assert response.status_code == 404
+
+
 def test_ping(client: TestClient):
     response = client.get("/utility/ping")
     assert response.status_code == 200